@@ -0,0 +1,3 @@
+"""
+Benchmarks del Sistema de Órdenes del Día
+"""
@@ -0,0 +1,154 @@
+"""
+Prueba de concurrencia: varios procesos leen el historial mientras uno escribe
+
+Simula varias secretarias con la misma base abierta. Los lectores repiten la
+carga del historial y el escritor guarda reuniones como lo hace la interfaz.
+Falla si alguna operación termina con "database is locked".
+
+Uso:
+    python -m benchmarks.concurrencia --lectores 4 --segundos 10
+    python -m benchmarks.concurrencia --modo-diario DELETE   # comparar con el diario clásico
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from benchmarks.datos_sinteticos import generar_base
+from models.database import Database
+from models.instrumentacion import HistogramaLatencia
+from utils.exportador import texto_temas_reunion
+
+
+def _abrir(ruta: str, modo_diario: str) -> Database:
+    # Silenciar el "[OK] Tablas creadas" de cada proceso
+    with open(os.devnull, 'w') as nulo:
+        salida, sys.stdout = sys.stdout, nulo
+        try:
+            return Database(ruta, modo_diario=modo_diario)
+        finally:
+            sys.stdout = salida
+
+
+def _lector(ruta: str, modo_diario: str, fin: float, resultados) -> None:
+    db = _abrir(ruta, modo_diario)
+    histograma = HistogramaLatencia()
+    operaciones = errores = 0
+
+    while time.time() < fin:
+        inicio = time.perf_counter()
+        try:
+            for reunion in db.obtener_reuniones()[:50]:
+                texto_temas_reunion(db, reunion['id'])
+            operaciones += 1
+            histograma.registrar(time.perf_counter() - inicio)
+        except sqlite3.OperationalError:
+            errores += 1
+
+    resultados.put({
+        'rol': 'lector',
+        'operaciones': operaciones,
+        'errores': errores,
+        'p50_ms': histograma.percentil(50) * 1000,
+        'p99_ms': histograma.percentil(99) * 1000,
+        'max_ms': histograma.maximo * 1000,
+    })
+
+
+def _escritor(ruta: str, modo_diario: str, fin: float, resultados) -> None:
+    db = _abrir(ruta, modo_diario)
+    histograma = HistogramaLatencia()
+    operaciones = errores = 0
+    temas = [t['id'] for t in db.obtener_temas()[:8]]
+
+    while time.time() < fin:
+        inicio = time.perf_counter()
+        try:
+            reunion_id = db.agregar_reunion("viernes 23 de enero de 2026", "17 hs.",
+                                            "Calle 8 Nº 486 – La Plata", "", "presencial")
+            for numero, tema_id in enumerate(temas, 1):
+                db.agregar_tema_orden_dia(reunion_id, tema_id, numero)
+            operaciones += 1
+            histograma.registrar(time.perf_counter() - inicio)
+        except sqlite3.OperationalError:
+            errores += 1
+
+    resultados.put({
+        'rol': 'escritor',
+        'operaciones': operaciones,
+        'errores': errores,
+        'p50_ms': histograma.percentil(50) * 1000,
+        'p99_ms': histograma.percentil(99) * 1000,
+        'max_ms': histograma.maximo * 1000,
+    })
+
+
+def ejecutar(lectores: int, segundos: float, modo_diario: str, reuniones: int) -> Dict:
+    """Corre un escritor y N lectores contra una base sintética nueva"""
+    directorio = tempfile.mkdtemp(prefix="orden_dia_concurrencia_")
+    try:
+        ruta = os.path.join(directorio, "concurrencia.db")
+        generar_base(ruta, reuniones=reuniones)
+        _abrir(ruta, modo_diario)
+
+        resultados = multiprocessing.Queue()
+        fin = time.time() + segundos
+        procesos = [multiprocessing.Process(target=_escritor, args=(ruta, modo_diario, fin, resultados))]
+        procesos += [multiprocessing.Process(target=_lector, args=(ruta, modo_diario, fin, resultados))
+                     for _ in range(lectores)]
+
+        for p in procesos:
+            p.start()
+        filas = [resultados.get() for _ in procesos]
+        for p in procesos:
+            p.join()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    return {
+        'modo_diario': modo_diario,
+        'lectores': lectores,
+        'segundos': segundos,
+        'procesos': filas,
+        'errores': sum(f['errores'] for f in filas),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Lectores y escritor concurrentes sobre la misma base")
+    parser.add_argument('--lectores', type=int, default=4)
+    parser.add_argument('--segundos', type=float, default=5.0)
+    parser.add_argument('--reuniones', type=int, default=500)
+    parser.add_argument('--modo-diario', default='WAL')
+    parser.add_argument('--json', default=None, help="Guardar el resultado en este archivo")
+    args = parser.parse_args(argv)
+
+    resultado = ejecutar(args.lectores, args.segundos, args.modo_diario.upper(), args.reuniones)
+
+    print(f"Modo de diario: {resultado['modo_diario']}, {args.lectores} lectores, {args.segundos:.0f} s\n")
+    print(f"{'Rol':<10} {'Ops':>6} {'Errores':>8} {'p50 ms':>9} {'p99 ms':>9} {'máx ms':>9}")
+    for f in sorted(resultado['procesos'], key=lambda f: f['rol'] != 'escritor'):
+        print(f"{f['rol']:<10} {f['operaciones']:>6} {f['errores']:>8} "
+              f"{f['p50_ms']:>9.1f} {f['p99_ms']:>9.1f} {f['max_ms']:>9.1f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+    if resultado['errores']:
+        print(f"\n[ERROR] {resultado['errores']} operaciones fallaron con la base bloqueada")
+        return 1
+
+    print("\n[OK] Sin errores de bloqueo")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Generador de bases de datos sintéticas para benchmarks
+
+Crea una base de prueba con N delegados, temas y reuniones. Los temas se
+reutilizan con una distribución sesgada (pocos temas aparecen en muchas
+reuniones, como en la práctica) y los textos imitan órdenes del día reales.
+
+Uso:
+    python -m benchmarks.datos_sinteticos bench.db --temas 2000 --reuniones 5000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Dict, List
+
+from models.database import Database
+
+
+TITULOS = ['Dr.', 'Dr.', 'Dr.', 'Dra.', 'Dra.']
+NOMBRES = ['JULIO', 'JORGE', 'MAURICIO', 'RUBEN', 'HORACIO', 'TOMAS', 'GUSTAVO',
+           'ROSA ANA', 'MARIA LAURA', 'SILVIA', 'CLAUDIA', 'PABLO', 'MARTIN',
+           'ANALIA', 'GRACIELA', 'DIEGO', 'FERNANDO', 'VERONICA', 'CARLOS', 'LUCIA']
+APELLIDOS = ['MORENO', 'AGUGLIARO', 'ESKINAZI', 'TUCCI', 'DUNOGENT', 'LUSARDI',
+             'CARDUS', 'GUANELLA', 'ARTURI', 'DE FINO', 'GONZALEZ', 'RODRIGUEZ',
+             'FERNANDEZ', 'LOPEZ', 'MARTINEZ', 'PEREZ', 'GOMEZ', 'SANCHEZ',
+             'ROMERO', 'SOSA', 'ALVAREZ', 'TORRES', 'RUIZ', 'RAMIREZ', 'BENITEZ']
+DISTRITOS = ['I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X']
+
+ACCIONES = ['Consideración de', 'Informe de', 'Tratamiento de', 'Aprobación de',
+            'Lectura y aprobación de', 'Análisis de', 'Ratificación de',
+            'Designación de', 'Presentación de', 'Resolución sobre']
+OBJETOS = ['el acta de la reunión anterior', 'el presupuesto anual',
+           'la Comisión de Ética', 'la Tesorería', 'la Mesa Directiva',
+           'el Tribunal de Disciplina', 'la Caja de Previsión', 'los aranceles mínimos',
+           'la matriculación de profesionales extranjeros', 'el convenio con IOMA',
+           'la Comisión de Jóvenes Médicos', 'el reglamento de especialidades',
+           'la recertificación profesional', 'el padrón electoral',
+           'la memoria y balance', 'la reforma del estatuto', 'el seguro de mala praxis',
+           'la jornada de residentes', 'la actualización de la cuota colegial',
+           'el informe de Asesoría Letrada']
+CATEGORIAS = ['Administrativo', 'Tesorería', 'Ética', 'Legal', 'Institucional',
+              'Matrícula', 'Previsión', 'Capacitación', '']
+LUGARES = ['Calle 8 Nº 486 – La Plata', 'Sede Distrito I – La Plata',
+           'Sede Distrito III – Morón', 'Sede Distrito IV – San Martín',
+           'Sede Distrito IX – Mar del Plata', 'Sede Distrito X – Bahía Blanca']
+
+DIAS = ['lunes', 'martes', 'miércoles', 'jueves', 'viernes', 'sábado', 'domingo']
+MESES = ['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto',
+         'septiembre', 'octubre', 'noviembre', 'diciembre']
+
+
+def fecha_en_texto(fecha: datetime) -> str:
+    """Formato usado por la interfaz: 'viernes 23 de enero de 2026'"""
+    return f"{DIAS[fecha.weekday()]} {fecha.day} de {MESES[fecha.month - 1]} de {fecha.year}"
+
+
+def descripcion_tema(rnd: random.Random, numero: int) -> str:
+    """Texto de tema con la forma habitual de un orden del día"""
+    texto = f"{rnd.choice(ACCIONES)} {rnd.choice(OBJETOS)}"
+    if rnd.random() < 0.4:
+        texto += f" (Expte. Nº {numero:05d}/{rnd.randint(18, 26)})"
+    if rnd.random() < 0.2:
+        texto += f". Nota del Distrito {rnd.choice(DISTRITOS)} solicitando su tratamiento"
+    return texto
+
+
+def generar_base(ruta: str, delegados: int = 60, temas: int = 500,
+                 reuniones: int = 1000, temas_por_reunion: int = 8,
+                 sesgo: float = 1.1, semilla: int = 42) -> Dict[str, int]:
+    """
+    Crea (o reemplaza) una base sintética en la ruta indicada
+
+    Args:
+        sesgo: Exponente de la distribución de reutilización de temas
+               (0 = uniforme; valores mayores concentran el uso en pocos temas)
+
+    Returns:
+        Cantidad de filas insertadas por tabla
+    """
+    if os.path.exists(ruta):
+        os.remove(ruta)
+
+    rnd = random.Random(semilla)
+    Database(ruta)  # Crea el esquema actual
+
+    conn = sqlite3.connect(ruta)
+    cursor = conn.cursor()
+
+    # Delegados: el primero de cada distrito es titular
+    filas_delegados = []
+    for i in range(delegados):
+        filas_delegados.append((
+            rnd.choice(TITULOS),
+            rnd.choice(NOMBRES),
+            f"{rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}" if i >= len(APELLIDOS) else APELLIDOS[i],
+            DISTRITOS[i % len(DISTRITOS)],
+            1 if i < len(DISTRITOS) else 0,
+            i + 1
+        ))
+    cursor.executemany(
+        "INSERT INTO delegados (titulo, nombre, apellido, distrito, titular, posicion) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        filas_delegados
+    )
+
+    # Temas
+    inicio = datetime(2010, 1, 1)
+    cursor.executemany(
+        "INSERT INTO temas (descripcion, categoria, fecha_creacion) VALUES (?, ?, ?)",
+        [(descripcion_tema(rnd, i), rnd.choice(CATEGORIAS),
+          (inicio + timedelta(days=rnd.randint(0, 5000))).strftime('%Y-%m-%d %H:%M:%S'))
+         for i in range(1, temas + 1)]
+    )
+    ids_temas = [row[0] for row in cursor.execute("SELECT id FROM temas ORDER BY id")]
+    pesos_acumulados = list(accumulate(1 / (rango ** sesgo) for rango in range(1, len(ids_temas) + 1)))
+
+    # Reuniones, quincenales hacia atrás desde hoy
+    hoy = datetime.now().replace(hour=17, minute=0, second=0, microsecond=0)
+    cantidad_orden = 0
+    ids_delegados = [row[0] for row in cursor.execute("SELECT id FROM delegados ORDER BY id")]
+
+    for n in range(reuniones):
+        fecha = hoy - timedelta(days=14 * (reuniones - n))
+        cursor.execute(
+            "INSERT INTO reuniones (fecha, hora, lugar, sede, tipo, fecha_creacion) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (fecha_en_texto(fecha), f"{rnd.choice([10, 11, 17, 18])} hs.",
+             rnd.choice(LUGARES), "", rnd.choice(['presencial', 'presencial', 'virtual']),
+             fecha.strftime('%Y-%m-%d %H:%M:%S'))
+        )
+        reunion_id = cursor.lastrowid
+
+        cantidad = max(1, min(len(ids_temas), int(rnd.gauss(temas_por_reunion, 2))))
+        elegidos: List[int] = []
+        while len(elegidos) < cantidad:
+            tema_id = rnd.choices(ids_temas, cum_weights=pesos_acumulados)[0]
+            if tema_id not in elegidos:
+                elegidos.append(tema_id)
+
+        cursor.executemany(
+            "INSERT INTO orden_dia (reunion_id, tema_id, numero_orden) VALUES (?, ?, ?)",
+            [(reunion_id, tema_id, i) for i, tema_id in enumerate(elegidos, 1)]
+        )
+        cantidad_orden += len(elegidos)
+
+        if len(ids_delegados) >= 2:
+            presidente, secretario = rnd.sample(ids_delegados[:len(DISTRITOS)], 2)
+            cursor.executemany(
+                "INSERT INTO firmas (reunion_id, cargo, delegado_id) VALUES (?, ?, ?)",
+                [(reunion_id, 'Presidente', presidente), (reunion_id, 'Secretario General', secretario)]
+            )
+
+    conn.commit()
+    conn.close()
+
+    return {
+        'delegados': delegados,
+        'temas': temas,
+        'reuniones': reuniones,
+        'orden_dia': cantidad_orden,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Genera una base de datos sintética")
+    parser.add_argument('ruta', help="Archivo de base de datos a crear (se reemplaza)")
+    parser.add_argument('--delegados', type=int, default=60)
+    parser.add_argument('--temas', type=int, default=500)
+    parser.add_argument('--reuniones', type=int, default=1000)
+    parser.add_argument('--temas-por-reunion', type=int, default=8)
+    parser.add_argument('--sesgo', type=float, default=1.1)
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    filas = generar_base(args.ruta, args.delegados, args.temas, args.reuniones,
+                         args.temas_por_reunion, args.sesgo, args.semilla)
+    print(f"[OK] Base generada en {args.ruta}: " +
+          ", ".join(f"{tabla}={cantidad}" for tabla, cantidad in filas.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
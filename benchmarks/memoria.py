@@ -0,0 +1,121 @@
+"""
+Benchmark de memoria por fila: dicts vs registros con __slots__ vs tuplas
+
+Mide con tracemalloc la memoria retenida por el resultado de las consultas
+masivas (historial, temas, orden del día de todas las reuniones) y el tiempo
+de construcción de cada representación.
+
+Uso:
+    python -m benchmarks.memoria --reuniones 5000 --json memoria.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+from benchmarks.datos_sinteticos import generar_base
+from models.database import Database
+from models.registros import ItemOrden, Reunion, Tema
+
+
+CONSULTAS = {
+    'reuniones': ("SELECT r.id, r.fecha, r.hora, r.lugar, r.tipo, COUNT(od.id) "
+                  "FROM reuniones r LEFT JOIN orden_dia od ON r.id = od.reunion_id "
+                  "GROUP BY r.id ORDER BY r.fecha DESC", Reunion),
+    'temas': ("SELECT id, descripcion, categoria, activo FROM temas ORDER BY descripcion", Tema),
+    'orden_dia': ("SELECT t.id, t.descripcion, t.categoria, od.numero_orden "
+                  "FROM orden_dia od JOIN temas t ON od.tema_id = t.id "
+                  "ORDER BY od.reunion_id, od.numero_orden", ItemOrden),
+}
+
+
+def medir_memoria(construir: Callable[[], list]) -> Dict:
+    """Memoria retenida por el resultado y pico durante su construcción"""
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = construir()
+    duracion = time.perf_counter() - inicio
+    retenida, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    filas = len(resultado)
+    del resultado
+    return {
+        'filas': filas,
+        'retenida_kb': retenida / 1024,
+        'pico_kb': pico / 1024,
+        'bytes_por_fila': retenida / filas if filas else 0,
+        'tiempo_ms': duracion * 1000,
+    }
+
+
+def comparar_representaciones(ruta: str) -> Dict[str, Dict[str, Dict]]:
+    """Mide cada consulta con las tres representaciones de fila"""
+    conn = sqlite3.connect(ruta)
+    resultados = {}
+
+    for nombre, (sql, registro) in CONSULTAS.items():
+        campos = registro.__slots__
+
+        def como_dicts():
+            return [dict(zip(campos, fila)) for fila in conn.execute(sql).fetchall()]
+
+        def como_registros():
+            cursor = conn.cursor()
+            cursor.row_factory = registro.fabrica
+            return cursor.execute(sql).fetchall()
+
+        def como_tuplas():
+            return conn.execute(sql).fetchall()
+
+        resultados[nombre] = {
+            'dicts': medir_memoria(como_dicts),
+            'registros': medir_memoria(como_registros),
+            'tuplas': medir_memoria(como_tuplas),
+        }
+
+    conn.close()
+    return resultados
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Memoria por fila de las consultas masivas")
+    parser.add_argument('--reuniones', type=int, default=5000)
+    parser.add_argument('--temas', type=int, default=2000)
+    parser.add_argument('--json', default=None, help="Guardar el resultado en este archivo")
+    args = parser.parse_args(argv)
+
+    directorio = tempfile.mkdtemp(prefix="orden_dia_memoria_")
+    try:
+        ruta = os.path.join(directorio, "memoria.db")
+        generar_base(ruta, temas=args.temas, reuniones=args.reuniones)
+        Database(ruta)
+        resultados = comparar_representaciones(ruta)
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    print(f"\n{'Consulta':<12} {'Forma':<10} {'Filas':>8} {'Retenida KB':>12} "
+          f"{'Bytes/fila':>11} {'Tiempo ms':>10}")
+    for nombre, formas in resultados.items():
+        for forma, r in formas.items():
+            print(f"{nombre:<12} {forma:<10} {r['filas']:>8} {r['retenida_kb']:>12.0f} "
+                  f"{r['bytes_por_fila']:>11.0f} {r['tiempo_ms']:>10.1f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+Benchmark de tiempo de importación al inicio (python -X importtime)
+
+Importa el módulo de entrada en un proceso limpio, mide el tiempo acumulado
+y verifica que las librerías pesadas de documentos no se carguen al iniciar.
+
+Uso:
+    python -m benchmarks.startup_importtime
+    python -m benchmarks.startup_importtime --json base.json
+    python -m benchmarks.startup_importtime --base base.json --tolerancia 0.2
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+# Paquetes que solo deben importarse al generar o exportar documentos
+MODULOS_DIFERIDOS = ['reportlab', 'docx', 'openpyxl']
+
+RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir_importacion(modulo: str) -> List[Tuple[str, int, int]]:
+    """
+    Importa el módulo en un subproceso con -X importtime
+
+    Returns:
+        Lista de tuplas (modulo, propio_us, acumulado_us)
+    """
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=RAIZ_PROYECTO,
+        capture_output=True,
+        text=True
+    )
+
+    if resultado.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {modulo}:\n{resultado.stderr[-2000:]}")
+
+    filas = []
+    for linea in resultado.stderr.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        partes = linea[len('import time:'):].split('|')
+        if len(partes) != 3:
+            continue
+        filas.append((partes[2].strip(), int(partes[0]), int(partes[1])))
+    return filas
+
+
+def analizar(modulo: str, repeticiones: int) -> Dict:
+    """Ejecuta varias mediciones y resume los resultados"""
+    totales = []
+    ultima = []
+    for _ in range(repeticiones):
+        ultima = medir_importacion(modulo)
+        total = next((acum for nombre, _, acum in reversed(ultima) if nombre == modulo), 0)
+        totales.append(total)
+
+    nombres = {nombre for nombre, _, _ in ultima}
+    diferidos_cargados = sorted(
+        m for m in MODULOS_DIFERIDOS
+        if any(n == m or n.startswith(m + '.') for n in nombres)
+    )
+
+    mas_pesados = sorted(ultima, key=lambda f: f[1], reverse=True)[:15]
+
+    return {
+        'modulo': modulo,
+        'repeticiones': repeticiones,
+        'mediana_ms': statistics.median(totales) / 1000,
+        'minimo_ms': min(totales) / 1000,
+        'modulos_importados': len(nombres),
+        'diferidos_cargados': diferidos_cargados,
+        'mas_pesados': [
+            {'modulo': nombre, 'propio_ms': propio / 1000, 'acumulado_ms': acum / 1000}
+            for nombre, propio, acum in mas_pesados
+        ],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de importación al inicio")
+    parser.add_argument('--modulo', default='main', help="Módulo de entrada a importar")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--presupuesto-ms', type=float, default=None,
+                        help="Falla si la mediana supera este tiempo")
+    parser.add_argument('--base', default=None,
+                        help="JSON de una corrida anterior para comparar")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="Aumento relativo permitido respecto de --base")
+    parser.add_argument('--json', default=None, help="Guardar el resultado en este archivo")
+    args = parser.parse_args(argv)
+
+    resultado = analizar(args.modulo, args.repeticiones)
+
+    print(f"Módulo: {resultado['modulo']}")
+    print(f"Mediana: {resultado['mediana_ms']:.1f} ms  (mínimo {resultado['minimo_ms']:.1f} ms, "
+          f"{resultado['repeticiones']} corridas, {resultado['modulos_importados']} módulos)")
+    print("\nMódulos más costosos (tiempo propio):")
+    for fila in resultado['mas_pesados']:
+        print(f"  {fila['propio_ms']:8.1f} ms  {fila['modulo']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+
+    errores = []
+    if resultado['diferidos_cargados']:
+        errores.append("Se importan al inicio: " + ", ".join(resultado['diferidos_cargados']))
+
+    if args.presupuesto_ms is not None and resultado['mediana_ms'] > args.presupuesto_ms:
+        errores.append(f"La mediana {resultado['mediana_ms']:.1f} ms supera el presupuesto "
+                       f"de {args.presupuesto_ms:.1f} ms")
+
+    if args.base:
+        with open(args.base, encoding='utf-8') as f:
+            base = json.load(f)
+        limite = base['mediana_ms'] * (1 + args.tolerancia)
+        print(f"\nBase: {base['mediana_ms']:.1f} ms (límite {limite:.1f} ms)")
+        if resultado['mediana_ms'] > limite:
+            errores.append(f"Regresión: {resultado['mediana_ms']:.1f} ms > {limite:.1f} ms")
+
+    if errores:
+        print("\n[ERROR] " + "\n[ERROR] ".join(errores))
+        return 1
+
+    print("\n[OK] Sin regresiones de importación")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
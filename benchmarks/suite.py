@@ -0,0 +1,261 @@
+"""
+Suite de benchmarks de los caminos principales de la aplicación
+
+Genera una base sintética, mide cada operación varias veces y guarda los
+resultados en JSON para comparar entre commits.
+
+Uso:
+    python -m benchmarks.suite --reuniones 2000 --json resultados.json
+    python -m benchmarks.suite --base resultados.json --tolerancia 0.2
+    python -m benchmarks.suite --solo obtener_reuniones carga_historial
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.datos_sinteticos import generar_base, fecha_en_texto
+from models.database import Database
+from utils.backends import backend_disponible
+from utils.document_generator import DocumentGenerator
+from utils import exportador
+
+
+RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Caso:
+    """Operación a medir; 'requiere' lista los backends opcionales necesarios"""
+
+    def __init__(self, nombre: str, funcion: Callable[[], object],
+                 requiere: tuple = (), repeticiones: Optional[int] = None):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.requiere = requiere
+        self.repeticiones = repeticiones
+
+
+def medir(funcion: Callable[[], object], repeticiones: int, calentamiento: int = 1) -> Dict:
+    """Ejecuta la función y resume los tiempos en milisegundos"""
+    for _ in range(calentamiento):
+        funcion()
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+    return {
+        'repeticiones': repeticiones,
+        'mediana_ms': statistics.median(tiempos),
+        'minimo_ms': min(tiempos),
+        'maximo_ms': max(tiempos),
+        'media_ms': statistics.mean(tiempos),
+    }
+
+
+def _commit_actual() -> Optional[str]:
+    try:
+        resultado = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ_PROYECTO,
+                                   capture_output=True, text=True, timeout=10)
+        return resultado.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _datos_reunion(db: Database, cantidad_temas: int) -> Dict:
+    """Datos con la misma forma que MainController._recopilar_datos_reunion"""
+    titulares = db.obtener_delegados(solo_titulares=True)
+    temas = db.obtener_temas()[:cantidad_temas]
+    nombres = [f"{d['titulo']} {d['nombre']} {d['apellido']}" for d in titulares]
+
+    return {
+        'fecha': fecha_en_texto(datetime.now()),
+        'hora': "17 hs.",
+        'lugar': "Calle 8 Nº 486 – La Plata",
+        'sede': "",
+        'tipo': "presencial",
+        'plataforma': "",
+        'delegados': [{
+            'titulo': d['titulo'],
+            'nombre': d['nombre'],
+            'apellido': d['apellido'],
+            'distrito': d['distrito']
+        } for d in titulares],
+        'orden_dia': [{
+            'tema_id': t['id'],
+            'numero_orden': i,
+            'descripcion': t['descripcion']
+        } for i, t in enumerate(temas, 1)],
+        'presidente': nombres[0] if nombres else "",
+        'secretario': nombres[1] if len(nombres) > 1 else "",
+        'presidente_id': titulares[0]['id'] if titulares else None,
+        'secretario_id': titulares[1]['id'] if len(titulares) > 1 else None,
+        'texto_encabezado': "ORDEN DEL DÍA",
+        'subtitulo_encabezado': "",
+        'imagen_logo': None,
+    }
+
+
+def crear_casos(db: Database, db_escritura: Database, directorio: str,
+                cantidad_temas: int, db_cache: Optional[Database] = None) -> List[Caso]:
+    """
+    Arma la lista de operaciones a medir sobre la base generada
+
+    `db` no usa la caché de lectura: cada repetición mide la consulta. Los
+    casos '_en_cache' usan `db_cache` (con la caché como en la interfaz).
+    """
+    # Importado aquí para no cargar tkinter si solo se generan datos
+    from main import MainController
+
+    generador = DocumentGenerator.__new__(DocumentGenerator)
+    generador.output_dir = directorio
+    datos = _datos_reunion(db, cantidad_temas)
+
+    # _guardar_reunion solo usa self.db, refresca el historial (se mide aparte) y
+    # descarta el borrador de la interfaz
+    controlador = SimpleNamespace(db=db_escritura, _actualizar_historial=lambda: None,
+                                  _descartar_borrador=lambda: None)
+
+    excel_temas = os.path.join(directorio, "temas.xlsx")
+    excel_historial = os.path.join(directorio, "historial.xlsx")
+
+    def carga_historial():
+        for reunion in db.obtener_reuniones():
+            exportador.texto_temas_reunion(db, reunion['id'])
+
+    def importar_excel():
+        if not os.path.exists(excel_temas):
+            exportador.exportar_temas_excel(db, excel_temas)
+        exportador.importar_temas_excel(db_escritura, excel_temas)
+
+    return [
+        Caso('obtener_reuniones', db.obtener_reuniones),
+        Caso('buscar_reuniones_tema', lambda: db.buscar_reuniones("Tesorería")),
+        Caso('buscar_reuniones_fecha', lambda: db.buscar_reuniones("enero")),
+        Caso('carga_historial', carga_historial, repeticiones=3),
+        Caso('obtener_temas', db.obtener_temas),
+        Caso('obtener_temas_en_cache', (db_cache or db).obtener_temas),
+        Caso('guardar_reunion', lambda: MainController._guardar_reunion(controlador, datos)),
+        Caso('generar_pdf', lambda: generador.generar_pdf(datos), requiere=('pdf',)),
+        Caso('generar_docx', lambda: generador.generar_docx(datos), requiere=('docx',)),
+        Caso('exportar_temas_excel', lambda: exportador.exportar_temas_excel(db, excel_temas),
+             requiere=('excel',), repeticiones=3),
+        Caso('exportar_historial_excel',
+             lambda: exportador.exportar_historial_excel(db, excel_historial),
+             requiere=('excel',), repeticiones=3),
+        Caso('importar_temas_excel', importar_excel, requiere=('excel',), repeticiones=3),
+    ]
+
+
+def ejecutar(args) -> Dict:
+    """Genera los datos, corre los casos y devuelve el resultado completo"""
+    directorio = tempfile.mkdtemp(prefix="orden_dia_bench_")
+    try:
+        ruta = os.path.join(directorio, "bench.db")
+        filas = generar_base(ruta, args.delegados, args.temas, args.reuniones,
+                             args.temas_por_reunion, semilla=args.semilla)
+
+        # Las operaciones de escritura usan una copia para no alterar las lecturas
+        ruta_escritura = os.path.join(directorio, "bench_escritura.db")
+        shutil.copyfile(ruta, ruta_escritura)
+
+        # Sin caché: después de la primera repetición la caché respondería
+        # todas las demás y ocultaría cualquier regresión de la consulta
+        db = Database(ruta, cache_ttl=0)
+        db_cache = Database(ruta)
+        db_escritura = Database(ruta_escritura)
+
+        resultados = {}
+        for caso in crear_casos(db, db_escritura, directorio, args.temas_por_reunion, db_cache):
+            if args.solo and caso.nombre not in args.solo:
+                continue
+            faltantes = [b for b in caso.requiere if not backend_disponible(b)]
+            if faltantes:
+                print(f"  {caso.nombre:<28} omitido (falta backend: {', '.join(faltantes)})")
+                resultados[caso.nombre] = {'omitido': True, 'faltan': faltantes}
+                continue
+
+            repeticiones = caso.repeticiones or args.repeticiones
+            resultados[caso.nombre] = medir(caso.funcion, min(repeticiones, args.repeticiones))
+            r = resultados[caso.nombre]
+            print(f"  {caso.nombre:<28} {r['mediana_ms']:10.2f} ms  "
+                  f"(mín {r['minimo_ms']:.2f}, máx {r['maximo_ms']:.2f})")
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    return {
+        'commit': _commit_actual(),
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'datos': filas,
+        'resultados': resultados,
+    }
+
+
+def comparar(resultado: Dict, base: Dict, tolerancia: float) -> List[str]:
+    """Compara medianas contra una corrida anterior; devuelve las regresiones"""
+    regresiones = []
+    print(f"\nComparación con {base.get('commit') or 'base'}:")
+    for nombre, actual in resultado['resultados'].items():
+        anterior = base.get('resultados', {}).get(nombre)
+        if not anterior or actual.get('omitido') or anterior.get('omitido'):
+            continue
+        relacion = actual['mediana_ms'] / anterior['mediana_ms'] if anterior['mediana_ms'] else 1.0
+        marca = ""
+        if relacion > 1 + tolerancia:
+            marca = "  <-- regresión"
+            regresiones.append(f"{nombre}: {anterior['mediana_ms']:.2f} ms -> {actual['mediana_ms']:.2f} ms")
+        print(f"  {nombre:<28} x{relacion:5.2f}{marca}")
+    return regresiones
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de la aplicación")
+    parser.add_argument('--delegados', type=int, default=60)
+    parser.add_argument('--temas', type=int, default=500)
+    parser.add_argument('--reuniones', type=int, default=1000)
+    parser.add_argument('--temas-por-reunion', type=int, default=8)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--repeticiones', type=int, default=10)
+    parser.add_argument('--solo', nargs='*', default=None, help="Nombres de casos a correr")
+    parser.add_argument('--json', default=None, help="Guardar el resultado en este archivo")
+    parser.add_argument('--base', default=None, help="JSON de una corrida anterior para comparar")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="Aumento relativo permitido respecto de --base")
+    args = parser.parse_args(argv)
+
+    print(f"Benchmarks con {args.reuniones} reuniones, {args.temas} temas, "
+          f"{args.delegados} delegados\n")
+    resultado = ejecutar(args)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+        print(f"\n[OK] Resultados guardados en {args.json}")
+
+    if args.base:
+        with open(args.base, encoding='utf-8') as f:
+            base = json.load(f)
+        regresiones = comparar(resultado, base, args.tolerancia)
+        if regresiones:
+            print("\n[ERROR] " + "\n[ERROR] ".join(regresiones))
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""
+Herramientas de línea de comandos
+Sistema de Órdenes del Día - Colegio de Médicos
+
+Uso:
+    python cli.py consultas [--db orden_dia.db] [--repeticiones 3] [--json informe.json]
+    python cli.py exportar historial historial.xlsx
+    python cli.py exportar historial historial.csv
+    python cli.py exportar temas temas.xlsx
+    python cli.py archivar --meses 24            # o --antes-de 2024-01-01
+    python cli.py respaldo [--directorio respaldos] [--conservar 10]
+    python cli.py respaldo --verificar respaldos/orden_dia_20260101_120000_000000.db
+    python cli.py regenerar 125 --formato pdf [--version 1] [--salida reunion_125.pdf]
+    python cli.py lote auditoria_2025.zip --anio 2025 [--formato pdf] [--procesos 4]
+    python cli.py servir [--host 127.0.0.1] [--puerto 8765] [--procesos 2] [--limite 32]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from models.database import Database, MESES_ARCHIVO_POR_DEFECTO, fecha_corte_archivo
+from utils import exportacion_lote, exportador, respaldo, servicio_http
+from utils.document_generator import DocumentGenerator
+
+
+def _cargar_como_interfaz(db: Database):
+    """Reproduce las lecturas que hace la interfaz al iniciar y refrescar pestañas"""
+    # Tab reunión: tabla de delegados y combos de firmas
+    db.obtener_delegados(solo_titulares=True)
+    db.obtener_delegados(solo_titulares=True)
+
+    # Tab temas
+    for tema in db.obtener_temas(solo_activos=True):
+        db.obtener_estadisticas_tema(tema['id'])
+
+    # Tab delegados
+    db.obtener_delegados(solo_activos=True, solo_titulares=False)
+
+    # Tab historial
+    for reunion in db.obtener_reuniones():
+        for tema in db.obtener_temas_reunion(reunion['id']):
+            db.obtener_estadisticas_tema(tema['id'])
+
+
+def comando_consultas(args) -> int:
+    """Ejecuta la carga de la interfaz y muestra las estadísticas por sentencia"""
+    db = Database(args.db, instrumentar=True)
+    db.registro_consultas.reiniciar()
+
+    for _ in range(args.repeticiones):
+        _cargar_como_interfaz(db)
+
+    print(db.registro_consultas.formatear_informe(limite=args.limite))
+    print()
+    print(db.cache.formatear_estadisticas())
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'consultas': db.informe_consultas(),
+                'cache': db.cache.estadisticas(),
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n[OK] Informe guardado en {args.json}")
+
+    return 0
+
+
+def comando_exportar(args) -> int:
+    """Exporta temas o historial leyendo la base de a lotes"""
+    db = Database(args.db)
+    extension = os.path.splitext(args.archivo)[1].lower()
+
+    if args.que == 'historial' and extension == '.csv':
+        cantidad = exportador.exportar_historial_csv(db, args.archivo)
+    elif args.que == 'historial' and extension == '.xlsx':
+        cantidad = exportador.exportar_historial_excel(db, args.archivo)
+    elif args.que == 'temas' and extension == '.xlsx':
+        cantidad = exportador.exportar_temas_excel(db, args.archivo)
+    else:
+        print(f"[ERROR] Formato no soportado para {args.que}: {extension or '(sin extensión)'}")
+        return 2
+
+    print(f"[OK] Se exportaron {cantidad} {args.que if args.que == 'temas' else 'reuniones'} a {args.archivo}")
+    return 0
+
+
+def comando_archivar(args) -> int:
+    """Mueve las reuniones viejas a la base de archivo"""
+    db = Database(args.db, ruta_archivo=args.archivo)
+    corte = args.antes_de or fecha_corte_archivo(args.meses)
+    db.archivar_reuniones(corte)
+    return 0
+
+
+def comando_respaldo(args) -> int:
+    """Respalda la base en caliente o verifica un respaldo existente"""
+    if args.verificar:
+        errores = respaldo.verificar_respaldo(args.verificar)
+        if errores:
+            print(f"[ERROR] {args.verificar}: " + "; ".join(errores))
+            return 1
+        print(f"[OK] {args.verificar}: integridad verificada")
+        return 0
+
+    db = Database(args.db)
+    for r in respaldo.crear_respaldo(db, args.directorio, args.conservar):
+        print(f"[OK] {r['archivo']}: {r['paginas']} páginas en {r['segundos']:.2f} s, "
+              f"integridad {r['integridad']}")
+    return 0
+
+
+def comando_regenerar(args) -> int:
+    """Vuelve a generar el documento de una reunión desde su instantánea"""
+    db = Database(args.db)
+    generador = DocumentGenerator()
+    try:
+        contenido = generador.regenerar(db, args.reunion_id, args.formato, args.version)
+    except LookupError as e:
+        print(f"[ERROR] {e}")
+        return 1
+
+    salida = args.salida or os.path.join(generador.output_dir,
+                                         f"REUNION_{args.reunion_id}.{args.formato}")
+    with open(salida, 'wb') as f:
+        f.write(contenido)
+    print(f"[OK] Documento regenerado en {salida}")
+    return 0
+
+
+def comando_lote(args) -> int:
+    """Regenera todos los documentos de un período en un zip, en varios procesos"""
+    db = Database(args.db)
+    desde, hasta = args.desde, args.hasta
+    if args.anio:
+        desde, hasta = f"{args.anio}-01-01", f"{args.anio + 1}-01-01"
+
+    ultimo = [0.0]
+
+    def progreso(procesadas, total):
+        # Una línea por segundo como mucho
+        ahora = time.perf_counter()
+        if procesadas == total or ahora - ultimo[0] >= 1:
+            ultimo[0] = ahora
+            print(f"  {procesadas}/{total} reuniones", flush=True)
+
+    informe = exportacion_lote.exportar_archivo(
+        db, args.destino, args.formato, desde, hasta,
+        procesos=args.procesos, en_vuelo=args.en_vuelo, progreso=progreso
+    )
+    print(exportacion_lote.formatear_informe(informe))
+    if not informe['completo']:
+        print(f"[ERROR] Exportación incompleta: vuelva a ejecutar para completar {args.destino}")
+        return 1
+    print(f"[OK] Documentos exportados en {args.destino}")
+    return 0
+
+
+def comando_servir(args) -> int:
+    """Atiende consultas y genera documentos por HTTP hasta Ctrl+C"""
+    db = Database(args.db)
+    servicio = servicio_http.ServicioHTTP(db, procesos=args.procesos,
+                                          limite_solicitudes=args.limite)
+    servicio.servir(args.host, args.puerto)
+    return 0
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Sistema de Órdenes del Día - herramientas")
+    parser.add_argument('--db', default="orden_dia.db", help="Archivo de base de datos")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    p_consultas = subparsers.add_parser(
+        'consultas',
+        help="Informe de latencia por sentencia SQL al cargar la interfaz"
+    )
+    p_consultas.add_argument('--repeticiones', type=int, default=3)
+    p_consultas.add_argument('--limite', type=int, default=20,
+                             help="Cantidad máxima de sentencias a mostrar")
+    p_consultas.add_argument('--json', default=None, help="Guardar el informe en JSON")
+    p_consultas.set_defaults(funcion=comando_consultas)
+
+    p_exportar = subparsers.add_parser('exportar', help="Exportar temas o historial a Excel/CSV")
+    p_exportar.add_argument('que', choices=['historial', 'temas'])
+    p_exportar.add_argument('archivo', help="Archivo de salida (.xlsx; historial también .csv)")
+    p_exportar.set_defaults(funcion=comando_exportar)
+
+    p_archivar = subparsers.add_parser(
+        'archivar',
+        help="Mover las reuniones viejas (con su orden del día y firmas) al archivo"
+    )
+    corte = p_archivar.add_mutually_exclusive_group()
+    corte.add_argument('--meses', type=int, default=MESES_ARCHIVO_POR_DEFECTO,
+                       help="Archivar las reuniones creadas hace más de N meses")
+    corte.add_argument('--antes-de', default=None, metavar='AAAA-MM-DD',
+                       help="Archivar las reuniones creadas antes de esta fecha")
+    p_archivar.add_argument('--archivo', default=None,
+                            help="Base de archivo (por defecto <base>_archivo.db)")
+    p_archivar.set_defaults(funcion=comando_archivar)
+
+    p_respaldo = subparsers.add_parser(
+        'respaldo',
+        help="Respaldar la base sin cerrar la aplicación (rota los respaldos viejos)"
+    )
+    p_respaldo.add_argument('--directorio', default=None,
+                            help="Carpeta de respaldos (por defecto, 'respaldos' junto a la base)")
+    p_respaldo.add_argument('--conservar', type=int, default=respaldo.RESPALDOS_A_CONSERVAR,
+                            help="Cantidad de respaldos a conservar")
+    p_respaldo.add_argument('--verificar', default=None, metavar='ARCHIVO',
+                            help="Solo verificar la integridad de un respaldo")
+    p_respaldo.set_defaults(funcion=comando_respaldo)
+
+    p_regenerar = subparsers.add_parser(
+        'regenerar',
+        help="Regenerar el PDF/DOCX de una reunión con los datos guardados al generarla"
+    )
+    p_regenerar.add_argument('reunion_id', type=int)
+    p_regenerar.add_argument('--formato', choices=['pdf', 'docx'], default='pdf')
+    p_regenerar.add_argument('--version', type=int, default=None,
+                             help="Versión de la instantánea (por defecto la última)")
+    p_regenerar.add_argument('--salida', default=None, help="Archivo de salida")
+    p_regenerar.set_defaults(funcion=comando_regenerar)
+
+    p_lote = subparsers.add_parser(
+        'lote',
+        help="Regenerar los documentos de todas las reuniones de un período en un zip"
+    )
+    p_lote.add_argument('destino', help="Archivo .zip (si existe, se completa)")
+    periodo = p_lote.add_mutually_exclusive_group()
+    periodo.add_argument('--anio', type=int, default=None, help="Reuniones de ese año")
+    periodo.add_argument('--desde', default=None, metavar='AAAA-MM-DD')
+    p_lote.add_argument('--hasta', default=None, metavar='AAAA-MM-DD', help="Fecha excluida")
+    p_lote.add_argument('--formato', choices=['pdf', 'docx'], default='pdf')
+    p_lote.add_argument('--procesos', type=int, default=None,
+                        help="Procesos de trabajo (por defecto, uno por núcleo)")
+    p_lote.add_argument('--en-vuelo', type=int, default=None,
+                        help="Documentos en memoria como máximo (por defecto, 2 por proceso)")
+    p_lote.set_defaults(funcion=comando_lote)
+
+    p_servir = subparsers.add_parser(
+        'servir',
+        help="Servicio HTTP local con el historial, los temas y la generación de documentos"
+    )
+    p_servir.add_argument('--host', default=servicio_http.HOST_POR_DEFECTO)
+    p_servir.add_argument('--puerto', type=int, default=servicio_http.PUERTO_POR_DEFECTO)
+    p_servir.add_argument('--procesos', type=int, default=None,
+                          help="Procesos para generar documentos (por defecto, uno por núcleo)")
+    p_servir.add_argument('--limite', type=int, default=servicio_http.LIMITE_SOLICITUDES,
+                          help="Solicitudes simultáneas antes de responder 503")
+    p_servir.set_defaults(funcion=comando_servir)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = crear_parser().parse_args(argv)
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
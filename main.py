@@ -3,23 +3,101 @@ Controlador Principal
 Conecta el modelo con las vistas y maneja la lógica de negocio
 """
 
-from models.database import Database
+from models.database import Database, MESES_ARCHIVO_POR_DEFECTO, fecha_corte_archivo
+from models.database_asincrona import DatabaseAsincrona
+from models.orden_del_dia import OrdenDelDia, CAMBIAR
 from views.main_view import VentanaPrincipal
+from views.enlace_orden import EnlaceListboxOrden
 from views.dialogs import (DialogoTema, DialogoDelegado, DialogoSeleccionTema,
+                           DialogoSeleccionPlantilla, VentanaVistaPreviaPDF,
                            VentanaVistaPrevia, VentanaHistorialTema)
 from utils.document_generator import DocumentGenerator
-from tkinter import messagebox, END
+from utils.backends import obtener_backend, backend_disponible
+from utils.exportador import (exportar_temas_excel, exportar_historial_excel,
+                               importar_temas_excel, iterar_historial, texto_temas_reunion)
+from utils.vista_previa import RenderizadorPaginas
+from utils.profiling import Perfilador, ENV_PERFIL, ENV_OVERLAY
+from utils.busqueda import coincide, refina, texto_buscable
+from utils.respaldo import crear_respaldo, respaldo_pendiente
+from tkinter import messagebox, END, TclError
 import os
+import threading
+import time
+import sys
+
+
+# Cada cuánto se revisa si terminó una consulta en segundo plano
+INTERVALO_REVISION_MS = 15
+
+# Espera desde la última tecla antes de buscar en el historial
+RETARDO_BUSQUEDA_MS = 250
+
+# Temas sugeridos que se muestran en el tab de reunión
+CANTIDAD_SUGERENCIAS = 8
+
+# Espera desde el último cambio en la pestaña de reunión antes de guardar el borrador
+RETARDO_BORRADOR_MS = 1000
+
+# Espera desde el último cambio antes de volver a armar la vista previa del PDF
+RETARDO_VISTA_PREVIA_MS = 400
+
+# Campos del borrador: entradas de texto y variables de la vista
+CAMPOS_ENTRADA_BORRADOR = {
+    'fecha': 'entry_fecha',
+    'hora': 'entry_hora',
+    'lugar': 'entry_lugar',
+    'sede': 'entry_sede',
+}
+VARIABLES_BORRADOR = {
+    'tipo': 'tipo_reunion',
+    'plataforma': 'plataforma',
+    'texto_encabezado': 'texto_encabezado',
+    'subtitulo_encabezado': 'subtitulo_encabezado',
+    'tamaño_titulo': 'tamaño_titulo',
+    'fuente_titulo': 'fuente_titulo',
+    'negrita_titulo': 'negrita_titulo',
+    'negrita_subtitulo': 'negrita_subtitulo',
+    'ancho_logo': 'tamaño_logo_ancho',
+    'alto_logo': 'tamaño_logo_alto',
+    'ancho_logo_docx': 'tamaño_logo_docx',
+}
 
 
 class MainController:
     """Controlador principal de la aplicación"""
     
     def __init__(self):
-        # Inicializar modelo
-        self.db = Database()
+        # Perfilado opcional (ORDEN_DIA_PERFIL=1)
+        self.perfilador = Perfilador.desde_entorno()
+        if self.perfilador:
+            self.perfilador.iniciar()
+            self.perfilador.abrir_span("MainController.__init__")
+        
+        # Inicializar modelo (con estadísticas SQL si se está perfilando)
+        self.db = Database(instrumentar=True if self.perfilador else None)
+        if self.perfilador:
+            self.perfilador.instrumentar(self.db, "Database", solo_publicos=True,
+                                         excluir=('get_connection', 'agregar_observador_sql'))
+            self.db.agregar_observador_sql(self.perfilador.registrar_consulta)
         self.db.cargar_datos_iniciales()
         
+        # Hilo de la base para las consultas que no deben congelar la ventana
+        self.db_async = DatabaseAsincrona(self.db)
+        self.db_async.perfilador = self.perfilador
+        self._pedidos = {}  # canal -> (generación, Future) del último pedido
+        
+        # Búsqueda en vivo del historial
+        self._busqueda_programada = None  # id de after() pendiente
+        self._borrador_programado = None  # id de after() del guardado del borrador
+        self._borrador_guardado = {}  # Último valor escrito de cada campo del borrador
+        self._borrador_descartado = None  # Pantalla al guardar la reunión (ya no es borrador)
+        self.ventana_previa = None  # VentanaVistaPreviaPDF abierta
+        self._vista_previa_programada = None
+        self.renderizador = None  # RenderizadorPaginas, creado con la primera vista previa
+        self.hilo_vista_previa = None
+        self._consulta_historial = None  # (término, incluir_archivo) mostrado o pedido
+        self._resultado_historial = None  # (término, incluir_archivo, filas) leído de la base
+        
         # Inicializar vista
         self.view = VentanaPrincipal()
         
@@ -27,7 +105,23 @@ class MainController:
         self.doc_generator = DocumentGenerator()
         
         # Variables de estado
-        self.orden_actual = []  # Lista de temas en el orden del día
+        self.orden_actual = OrdenDelDia()  # Temas del orden del día
+        self.enlace_orden = EnlaceListboxOrden(self.view.listbox_orden, self.orden_actual)
+        self.orden_actual.suscribir(self._al_cambiar_orden)
+        self.ids_firmas = []  # IDs de delegados en el orden de los combos de firmas
+        self.ids_sugerencias = []  # IDs de temas en el orden de la lista de sugeridos
+        self._respaldo_en_curso = False
+        
+        # Las acciones deben envolverse antes de conectarlas a los botones
+        if self.perfilador:
+            self.perfilador.instrumentar(self, "MainController",
+                                         excluir=('run', '_mostrar_latencia_accion', '_revisar_pedido', '_busqueda_al_escribir',
+                                                  '_revisar_respaldo', '_programar_respaldo',
+                                                  '_programar_borrador', '_al_cambiar_reunion',
+                                                  '_programar_vista_previa'))
+            if self.perfilador.mostrar_overlay:
+                self.view.mostrar_overlay_perfil()
+                self.perfilador.al_terminar_accion = self._mostrar_latencia_accion
         
         # Conectar eventos
         self._conectar_eventos()
@@ -35,6 +129,12 @@ class MainController:
         # Cargar datos iniciales
         self._cargar_datos_iniciales()
         
+        # Respaldo automático si el último es más viejo que el intervalo
+        self._programar_respaldo()
+        
+        if self.perfilador:
+            self.perfilador.cerrar_span()
+        
         print("[OK] Controlador inicializado correctamente")
     
     def _conectar_eventos(self):
@@ -45,6 +145,11 @@ class MainController:
         self.view.btn_subir.config(command=self._subir_tema)
         self.view.btn_bajar.config(command=self._bajar_tema)
         self.view.btn_eliminar.config(command=self._eliminar_tema_orden)
+        self.view.btn_agregar_sugerido.config(command=self._agregar_tema_sugerido)
+        self.view.btn_cargar_plantilla.config(command=self._cargar_plantilla)
+        self.view.btn_guardar_plantilla.config(command=self._guardar_plantilla)
+        self.view.btn_clonar_anterior.config(command=self._clonar_reunion_anterior)
+        self.view.listbox_sugerencias.bind('<Double-Button-1>', self._agregar_tema_sugerido)
         self.view.btn_editar_delegado.config(command=self._editar_delegado_reunion)
         self.view.btn_subir_delegado.config(command=self._subir_delegado)
         self.view.btn_bajar_delegado.config(command=self._bajar_delegado)
@@ -72,9 +177,26 @@ class MainController:
         self.view.btn_actualizar_historial.config(command=self._actualizar_historial)
         self.view.btn_buscar_historial.config(command=self._buscar_historial)
         self.view.btn_limpiar_busqueda.config(command=self._limpiar_busqueda_historial)
+        self.view.entry_buscar_historial.bind('<KeyRelease>', self._busqueda_al_escribir)
         self.view.btn_exportar_historial_excel.config(command=self._exportar_historial_excel)
         self.view.btn_exportar_historial_pdf.config(command=self._exportar_historial_pdf)
         self.view.btn_borrar_historial.config(command=self._borrar_reuniones_seleccionadas)
+        self.view.btn_archivar_historial.config(command=self._archivar_reuniones)
+        self.view.btn_respaldo.config(command=self._crear_respaldo)
+        self.view.check_incluir_archivo.config(command=self._refrescar_historial)
+        
+        # === BORRADOR Y VISTA PREVIA ===
+        for entrada in CAMPOS_ENTRADA_BORRADOR.values():
+            getattr(self.view, entrada).bind('<KeyRelease>', self._al_cambiar_reunion, add='+')
+        for variable in VARIABLES_BORRADOR.values():
+            getattr(self.view, variable).trace_add('write', lambda *_: self._al_cambiar_reunion())
+        for combo in (self.view.combo_presidente, self.view.combo_secretario):
+            combo.bind('<<ComboboxSelected>>', self._al_cambiar_reunion, add='+')
+        self.view.bind('<<LogoCambiado>>', self._al_cambiar_reunion)
+        self.view.protocol("WM_DELETE_WINDOW", self._al_cerrar)
+        
+        # === DIAGNÓSTICO ===
+        self.view.bind('<F12>', self._mostrar_informe_consultas)
     
     def _cargar_datos_iniciales(self):
         """Carga datos iniciales en las vistas"""
@@ -83,6 +205,8 @@ class MainController:
         self._actualizar_lista_temas()
         self._actualizar_lista_delegados()
         self._actualizar_historial()
+        self._restaurar_borrador()
+        self._actualizar_sugerencias()
     
     def _actualizar_delegados_reunion(self):
         """Actualiza la tabla de delegados en el tab de reunión"""
@@ -100,9 +224,12 @@ class MainController:
     
     def _actualizar_combos_firmas(self):
         """Actualiza los combobox de firmas"""
-        delegados = self.db.obtener_delegados(solo_titulares=True)
-        nombres = [f"{d['titulo']} {d['nombre']} {d['apellido']}" for d in delegados]
+        opciones = self.db.opciones_delegados(solo_titulares=True)
+        nombres = [texto for texto, _ in opciones]
+        delegados = [d for _, d in opciones]
         
+        # Los combos muestran nombres; la firma se resuelve por el ID en la misma posición
+        self.ids_firmas = [d['id'] for d in delegados]
         self.view.combo_presidente.config(values=nombres)
         self.view.combo_secretario.config(values=nombres)
         
@@ -113,7 +240,7 @@ class MainController:
                 self.view.combo_secretario.current(i)
     
     def _agregar_tema_orden(self):
-        """Muestra diálogo para agregar tema al orden del día"""
+        """Muestra diálogo para agregar uno o más temas al orden del día"""
         temas = self.db.obtener_temas()
         
         if not temas:
@@ -127,87 +254,237 @@ class MainController:
         self.view.wait_window(dialogo)
         
         if dialogo.resultado:
-            tema_id = int(dialogo.resultado)
-            tema = self.db.obtener_tema(tema_id)
-            
-            numero_orden = len(self.orden_actual) + 1
-            self.orden_actual.append({
-                'tema_id': tema_id,
-                'numero_orden': numero_orden,
-                'descripcion': tema['descripcion']
-            })
-            
-            self._actualizar_listbox_orden()
+            # Un solo IN (...) para todos los temas elegidos
+            self._cargar_en_orden(self.db.obtener_temas_por_ids(dialogo.resultado),
+                                  reemplazar=False)
     
     def _subir_tema(self):
-        """Sube el tema seleccionado en el orden"""
-        seleccion = self.view.listbox_orden.curselection()
+        """Sube los temas seleccionados en el orden"""
+        seleccion = self.enlace_orden.seleccion()
         
         if not seleccion:
             messagebox.showwarning("Advertencia", "Seleccione un tema para subir")
             return
         
-        indice = seleccion[0]
+        self.enlace_orden.seleccionar(self.orden_actual.subir(seleccion))
+    
+    def _bajar_tema(self):
+        """Baja los temas seleccionados en el orden"""
+        seleccion = self.enlace_orden.seleccion()
         
-        if indice == 0:
+        if not seleccion:
+            messagebox.showwarning("Advertencia", "Seleccione un tema para bajar")
             return
         
-        self.orden_actual[indice], self.orden_actual[indice-1] = \
-            self.orden_actual[indice-1], self.orden_actual[indice]
+        self.enlace_orden.seleccionar(self.orden_actual.bajar(seleccion))
+    
+    def _eliminar_tema_orden(self):
+        """Elimina los temas seleccionados del orden del día"""
+        seleccion = self.enlace_orden.seleccion()
         
-        for i, tema in enumerate(self.orden_actual):
-            tema['numero_orden'] = i + 1
+        if not seleccion:
+            messagebox.showwarning("Advertencia", "Seleccione un tema para eliminar")
+            return
         
-        self._actualizar_listbox_orden()
-        self.view.listbox_orden.selection_clear(0, 'end')
-        self.view.listbox_orden.selection_set(indice-1)
+        self.orden_actual.eliminar(seleccion)
     
-    def _bajar_tema(self):
-        """Baja el tema seleccionado en el orden"""
-        seleccion = self.view.listbox_orden.curselection()
-        
+    def _al_cambiar_orden(self, evento, inicio, cantidad):
+        """El listbox se actualiza solo (EnlaceListboxOrden); aquí, lo que depende del orden"""
+        # Reordenar no cambia qué temas hay: las sugerencias siguen valiendo
+        if evento != CAMBIAR:
+            self._actualizar_sugerencias()
+        self._al_cambiar_reunion()
+    
+    def _actualizar_sugerencias(self):
+        """Muestra los temas que suelen acompañar a los del orden actual"""
+        sugerencias = self.db.sugerir_temas(self.orden_actual.tema_ids(),
+                                            limite=CANTIDAD_SUGERENCIAS)
+        self.ids_sugerencias = [tema['id'] for tema, _ in sugerencias]
+        self.view.listbox_sugerencias.delete(0, 'end')
+        for tema, _ in sugerencias:
+            self.view.listbox_sugerencias.insert('end', tema['descripcion'])
+    
+    def _agregar_tema_sugerido(self, event=None):
+        """Agrega al orden del día el tema sugerido seleccionado"""
+        seleccion = self.view.listbox_sugerencias.curselection()
         if not seleccion:
-            messagebox.showwarning("Advertencia", "Seleccione un tema para bajar")
+            messagebox.showwarning("Advertencia", "Seleccione un tema sugerido para agregar")
             return
         
-        indice = seleccion[0]
+        self.orden_actual.agregar([self.db.obtener_tema(self.ids_sugerencias[seleccion[0]])])
+    
+    def _cargar_en_orden(self, items, reemplazar=True):
+        """Pone los temas dados (con 'id' y 'descripcion') en el orden del día"""
+        if reemplazar:
+            self.orden_actual.reemplazar(items)
+        else:
+            self.orden_actual.agregar(items)
+    
+    def _preguntar_reemplazo(self):
+        """
+        Si ya hay temas en el orden, pregunta si reemplazarlos
         
-        if indice == len(self.orden_actual) - 1:
+        Returns:
+            True (reemplazar), False (agregar al final) o None (cancelar)
+        """
+        if not self.orden_actual:
+            return True
+        return messagebox.askyesnocancel(
+            "Orden del día",
+            "El orden del día ya tiene temas.\n\n"
+            "Sí: reemplazarlos\nNo: agregar al final"
+        )
+    
+    def _cargar_plantilla(self):
+        """Carga una plantilla guardada en el orden del día"""
+        plantillas = self.db.obtener_plantillas()
+        if not plantillas:
+            messagebox.showinfo(
+                "Información",
+                "No hay plantillas guardadas.\nArme un orden del día y use 'Guardar como Plantilla'."
+            )
             return
         
-        self.orden_actual[indice], self.orden_actual[indice+1] = \
-            self.orden_actual[indice+1], self.orden_actual[indice]
+        dialogo = DialogoSeleccionPlantilla(self.view, plantillas)
+        self.view.wait_window(dialogo)
+        if not dialogo.resultado:
+            return
         
-        for i, tema in enumerate(self.orden_actual):
-            tema['numero_orden'] = i + 1
+        if dialogo.accion == 'eliminar':
+            nombre = next(p['nombre'] for p in plantillas if p['id'] == dialogo.resultado)
+            if messagebox.askyesno("Confirmar", f"¿Eliminar la plantilla '{nombre}'?"):
+                self.db.eliminar_plantilla(dialogo.resultado)
+            return
         
-        self._actualizar_listbox_orden()
-        self.view.listbox_orden.selection_clear(0, 'end')
-        self.view.listbox_orden.selection_set(indice+1)
+        reemplazar = self._preguntar_reemplazo()
+        if reemplazar is None:
+            return
+        self._cargar_en_orden(self.db.obtener_temas_plantilla(dialogo.resultado), reemplazar)
     
-    def _eliminar_tema_orden(self):
-        """Elimina el tema seleccionado del orden del día"""
-        seleccion = self.view.listbox_orden.curselection()
+    def _guardar_plantilla(self):
+        """Guarda el orden del día actual como plantilla"""
+        if not self.orden_actual:
+            messagebox.showwarning("Advertencia", "El orden del día está vacío")
+            return
         
-        if not seleccion:
-            messagebox.showwarning("Advertencia", "Seleccione un tema para eliminar")
+        from tkinter import simpledialog
+        nombre = simpledialog.askstring("Guardar Plantilla", "Nombre de la plantilla:",
+                                        parent=self.view)
+        if not nombre or not nombre.strip():
             return
+        nombre = nombre.strip()
         
-        indice = seleccion[0]
-        self.orden_actual.pop(indice)
+        if any(p['nombre'] == nombre for p in self.db.obtener_plantillas()):
+            if not messagebox.askyesno("Confirmar", f"La plantilla '{nombre}' ya existe.\n¿Reemplazarla?"):
+                return
         
-        for i, tema in enumerate(self.orden_actual):
-            tema['numero_orden'] = i + 1
+        self.db.guardar_plantilla(nombre, self.orden_actual.tema_ids())
+        messagebox.showinfo("Éxito", f"Plantilla '{nombre}' guardada")
+    
+    def _clonar_reunion_anterior(self):
+        """Copia en el orden del día los temas de la última reunión guardada"""
+        reunion_id = self.db.id_ultima_reunion()
+        if reunion_id is None:
+            messagebox.showinfo("Información", "No hay reuniones guardadas")
+            return
         
-        self._actualizar_listbox_orden()
+        reemplazar = self._preguntar_reemplazo()
+        if reemplazar is None:
+            return
+        self._cargar_en_orden(self.db.obtener_temas_reunion(reunion_id), reemplazar)
+    
+    # === BORRADOR DE LA REUNIÓN ===
     
-    def _actualizar_listbox_orden(self):
-        """Actualiza el listbox del orden del día"""
-        self.view.listbox_orden.delete(0, 'end')
+    def _estado_borrador(self):
+        """Valores actuales de la pestaña de reunión, en la forma en que se guardan"""
+        estado = {campo: getattr(self.view, entrada).get()
+                  for campo, entrada in CAMPOS_ENTRADA_BORRADOR.items()}
+        for campo, variable in VARIABLES_BORRADOR.items():
+            try:
+                estado[campo] = getattr(self.view, variable).get()
+            except TclError:
+                pass  # Número a medio escribir en un Spinbox: se guarda cuando sea válido
+        estado['presidente'] = self.view.combo_presidente.get()
+        estado['secretario'] = self.view.combo_secretario.get()
+        estado['imagen_logo'] = self.view.imagen_path
+        estado['orden_dia'] = [[t['tema_id'], t['descripcion']] for t in self.orden_actual]
+        return estado
+    
+    def _al_cambiar_reunion(self, event=None):
+        """Cualquier cambio en la pestaña de reunión: borrador y vista previa"""
+        self._programar_borrador()
+        self._programar_vista_previa()
+    
+    def _programar_borrador(self, event=None):
+        """Programa el guardado del borrador; cada cambio reinicia la espera"""
+        if self._borrador_programado is not None:
+            self.view.after_cancel(self._borrador_programado)
+        self._borrador_programado = self.view.after(RETARDO_BORRADOR_MS, self._guardar_borrador)
+    
+    def _guardar_borrador(self):
+        """Escribe en el hilo de la base solo los campos que cambiaron desde la última vez"""
+        self._borrador_programado = None
+        estado = self._estado_borrador()
+        if self._borrador_descartado is not None:
+            # Reunión recién guardada: solo vuelve a ser borrador si se la modifica
+            if estado == self._borrador_descartado:
+                return
+            self._borrador_descartado = None
+        cambios = {campo: valor for campo, valor in estado.items()
+                   if self._borrador_guardado.get(campo) != valor}
+        if not cambios:
+            return
+        self._borrador_guardado.update(cambios)
+        self.db_async.guardar_borrador(cambios)
+    
+    def _restaurar_borrador(self):
+        """Vuelve a cargar la reunión que se estaba preparando al cerrar la aplicación"""
+        borrador = self.db.obtener_borrador()
+        if not borrador:
+            return
         
-        for tema in self.orden_actual:
-            texto = f"{tema['numero_orden']}.- {tema['descripcion']}"
-            self.view.listbox_orden.insert('end', texto)
+        for campo, entrada in CAMPOS_ENTRADA_BORRADOR.items():
+            if campo in borrador:
+                widget = getattr(self.view, entrada)
+                widget.delete(0, 'end')
+                widget.insert(0, borrador[campo])
+        for campo, variable in VARIABLES_BORRADOR.items():
+            if campo in borrador:
+                getattr(self.view, variable).set(borrador[campo])
+        self.view.combo_tipo.event_generate('<<ComboboxSelected>>')
+        
+        # Las firmas solo si el delegado sigue entre los titulares
+        for campo, combo in (('presidente', self.view.combo_presidente),
+                             ('secretario', self.view.combo_secretario)):
+            if borrador.get(campo) in combo['values']:
+                combo.set(borrador[campo])
+        
+        if borrador.get('imagen_logo') and os.path.exists(borrador['imagen_logo']):
+            self.view.usar_logo(borrador['imagen_logo'])
+        
+        if 'orden_dia' in borrador:
+            self.orden_actual.reemplazar({'tema_id': tema_id, 'descripcion': descripcion}
+                                         for tema_id, descripcion in borrador['orden_dia'])
+        
+        self._borrador_guardado = self._estado_borrador()
+        print("[OK] Borrador de la reunión restaurado")
+    
+    def _descartar_borrador(self):
+        """La reunión ya se guardó: se borra el borrador para no restaurarla al iniciar"""
+        if self._borrador_programado is not None:
+            self.view.after_cancel(self._borrador_programado)
+            self._borrador_programado = None
+        # Con el primer cambio posterior el borrador se vuelve a escribir completo
+        self._borrador_descartado = self._estado_borrador()
+        self._borrador_guardado = {}
+        self.db_async.limpiar_borrador()
+    
+    def _al_cerrar(self):
+        """Guarda el borrador pendiente antes de cerrar la ventana"""
+        if self._borrador_programado is not None:
+            self.view.after_cancel(self._borrador_programado)
+            self._guardar_borrador()
+        self.view.destroy()
     
     def _editar_delegado_reunion(self):
         """Edita el delegado seleccionado"""
@@ -220,8 +497,7 @@ class MainController:
         item = seleccion[0]
         delegado_id = int(self.view.tree_delegados.item(item, 'tags')[0])
         
-        delegados = self.db.obtener_delegados(solo_activos=False)
-        delegado = next((d for d in delegados if d['id'] == delegado_id), None)
+        delegado = self.db.obtener_delegado(delegado_id)
         
         if not delegado:
             return
@@ -246,63 +522,31 @@ class MainController:
     
     def _subir_delegado(self):
         """Sube el delegado seleccionado en la lista"""
-        seleccion = self.view.tree_delegados.selection()
-        
-        if not seleccion:
-            messagebox.showwarning("Advertencia", "Seleccione un delegado para subir")
-            return
-        
-        # Obtener lista actual de delegados del treeview
-        items = list(self.view.tree_delegados.get_children())
-        indice_actual = items.index(seleccion[0])
-        
-        if indice_actual == 0:
-            return  # Ya está al principio
-        
-        # Intercambiar con el anterior
-        item_actual = seleccion[0]
-        item_anterior = items[indice_actual - 1]
-        
-        # Obtener valores
-        valores_actual = self.view.tree_delegados.item(item_actual, 'values')
-        valores_anterior = self.view.tree_delegados.item(item_anterior, 'values')
-        
-        # Intercambiar en el treeview
-        self.view.tree_delegados.item(item_anterior, values=valores_actual)
-        self.view.tree_delegados.item(item_actual, values=valores_anterior)
-        
-        # Seleccionar el que se movió
-        self.view.tree_delegados.selection_set(item_anterior)
+        self._mover_delegado(-1, "Seleccione un delegado para subir")
     
     def _bajar_delegado(self):
         """Baja el delegado seleccionado en la lista"""
-        seleccion = self.view.tree_delegados.selection()
+        self._mover_delegado(1, "Seleccione un delegado para bajar")
+    
+    def _mover_delegado(self, paso, aviso):
+        """Mueve la fila en la tabla y guarda el nuevo orden de los titulares"""
+        tree = self.view.tree_delegados
+        seleccion = tree.selection()
         
         if not seleccion:
-            messagebox.showwarning("Advertencia", "Seleccione un delegado para bajar")
+            messagebox.showwarning("Advertencia", aviso)
             return
         
-        # Obtener lista actual de delegados del treeview
-        items = list(self.view.tree_delegados.get_children())
-        indice_actual = items.index(seleccion[0])
-        
-        if indice_actual == len(items) - 1:
-            return  # Ya está al final
+        items = list(tree.get_children())
+        indice = items.index(seleccion[0]) + paso
+        if not 0 <= indice < len(items):
+            return  # Ya está en el extremo
         
-        # Intercambiar con el siguiente
-        item_actual = seleccion[0]
-        item_siguiente = items[indice_actual + 1]
+        # La fila se mueve con su ID (tags), no solo con los valores visibles
+        tree.move(seleccion[0], '', indice)
+        tree.see(seleccion[0])
         
-        # Obtener valores
-        valores_actual = self.view.tree_delegados.item(item_actual, 'values')
-        valores_siguiente = self.view.tree_delegados.item(item_siguiente, 'values')
-        
-        # Intercambiar en el treeview
-        self.view.tree_delegados.item(item_siguiente, values=valores_actual)
-        self.view.tree_delegados.item(item_actual, values=valores_siguiente)
-        
-        # Seleccionar el que se movió
-        self.view.tree_delegados.selection_set(item_siguiente)
+        self.db.reordenar_delegados([int(tree.item(item, 'tags')[0]) for item in tree.get_children()])
     
     def _mostrar_vista_previa(self):
         """Muestra vista previa del documento"""
@@ -310,10 +554,56 @@ class MainController:
             messagebox.showwarning("Advertencia", "Agregue al menos un tema al orden del día")
             return
         
-        datos = self._recopilar_datos_reunion()
-        contenido = self.doc_generator.generar_texto_vista_previa(datos)
+        if not (backend_disponible('rasterizador') and backend_disponible('pdf')):
+            # Sin pdfium: aproximación en texto
+            datos = self._recopilar_datos_reunion()
+            contenido = self.doc_generator.generar_texto_vista_previa(datos)
+            VentanaVistaPrevia(self.view, contenido)
+            return
+        
+        if self.renderizador is None:
+            self.renderizador = RenderizadorPaginas(self.doc_generator,
+                                                    dpi=self.view.winfo_fpixels('1i'))
+            # pdfium no admite varios hilos: la vista previa tiene uno propio
+            self.hilo_vista_previa = DatabaseAsincrona(self.renderizador, nombre="vista-previa")
+            self.hilo_vista_previa.perfilador = self.perfilador
         
-        VentanaVistaPrevia(self.view, contenido)
+        if self.ventana_previa is not None and self.ventana_previa.winfo_exists():
+            self.ventana_previa.lift()
+        else:
+            self.ventana_previa = VentanaVistaPreviaPDF(self.view)
+        self._renderizar_vista_previa()
+    
+    # === VISTA PREVIA DEL PDF ===
+    
+    def _programar_vista_previa(self):
+        """Si la vista previa está abierta, la actualiza tras una pausa en los cambios"""
+        if self.ventana_previa is None or not self.ventana_previa.winfo_exists():
+            return
+        if self._vista_previa_programada is not None:
+            self.view.after_cancel(self._vista_previa_programada)
+        self._vista_previa_programada = self.view.after(RETARDO_VISTA_PREVIA_MS,
+                                                        self._renderizar_vista_previa)
+    
+    def _renderizar_vista_previa(self):
+        """Arma y rasteriza el PDF en el hilo de la vista previa"""
+        self._vista_previa_programada = None
+        if self.ventana_previa is None or not self.ventana_previa.winfo_exists():
+            return
+        self.ventana_previa.mostrar_estado("Actualizando...")
+        self._en_segundo_plano('vista previa', self.renderizador.renderizar,
+                               self._mostrar_paginas_previa, self._recopilar_datos_reunion(),
+                               hilo=self.hilo_vista_previa)
+    
+    def _mostrar_paginas_previa(self, resultado):
+        """Muestra las páginas; la ventana recrea solo las imágenes que cambiaron"""
+        if self.ventana_previa is None or not self.ventana_previa.winfo_exists():
+            return
+        redibujadas = self.ventana_previa.mostrar_paginas(resultado['paginas'])
+        self.ventana_previa.mostrar_estado(
+            f"{len(resultado['paginas'])} página(s) · {redibujadas} actualizada(s) · "
+            f"{resultado['segundos'] * 1000:.0f} ms"
+        )
     
     def _generar_pdf(self):
         """Genera el documento PDF"""
@@ -323,6 +613,7 @@ class MainController:
         
         try:
             datos = self._recopilar_datos_reunion()
+            self._leer_logo(datos)
             archivo = self.doc_generator.generar_pdf(datos)
             
             self._guardar_reunion(datos)
@@ -345,6 +636,7 @@ class MainController:
         
         try:
             datos = self._recopilar_datos_reunion()
+            self._leer_logo(datos)
             archivo = self.doc_generator.generar_docx(datos)
             
             self._guardar_reunion(datos)
@@ -369,9 +661,11 @@ class MainController:
             'tipo': self.view.combo_tipo.get(),
             'plataforma': self.view.plataforma.get() or '',  # Plataforma para reuniones virtuales
             'delegados': [],
-            'orden_dia': self.orden_actual,
+            'orden_dia': self.orden_actual.como_lista(),
             'presidente': self.view.combo_presidente.get(),
             'secretario': self.view.combo_secretario.get(),
+            'presidente_id': None,
+            'secretario_id': None,
             'texto_encabezado': self.view.texto_encabezado.get(),
             'subtitulo_encabezado': self.view.subtitulo_encabezado.get(),
             'tamaño_titulo': self.view.tamaño_titulo.get(),
@@ -384,6 +678,16 @@ class MainController:
             'ancho_logo_docx': self.view.tamaño_logo_docx.get()
         }
         
+        # Firmas: nombre sin desambiguar para el documento e ID para guardar
+        for cargo, combo in (('presidente', self.view.combo_presidente),
+                             ('secretario', self.view.combo_secretario)):
+            indice = combo.current()
+            if 0 <= indice < len(self.ids_firmas):
+                delegado = self.db.obtener_delegado(self.ids_firmas[indice])
+                if delegado:
+                    datos[cargo] = delegado.nombre_completo
+                    datos[f'{cargo}_id'] = delegado.id
+        
         for item in self.view.tree_delegados.get_children():
             values = self.view.tree_delegados.item(item, 'values')
             datos['delegados'].append({
@@ -395,6 +699,22 @@ class MainController:
         
         return datos
     
+    def _leer_logo(self, datos):
+        """
+        Lee el archivo del logo una sola vez en datos['logo_bytes']
+        
+        El documento y la instantánea usan esos mismos bytes, aunque el archivo
+        cambie o desaparezca entre la generación y el guardado.
+        """
+        datos['logo_bytes'] = None
+        ruta = datos.get('imagen_logo')
+        if ruta and os.path.exists(ruta):
+            try:
+                with open(ruta, 'rb') as f:
+                    datos['logo_bytes'] = f.read()
+            except OSError as e:
+                print(f"[ERROR] No se pudo leer el logo {ruta}: {e}")
+    
     def _guardar_reunion(self, datos):
         """Guarda la reunión en la base de datos"""
         reunion_id = self.db.agregar_reunion(
@@ -412,39 +732,47 @@ class MainController:
                 tema['numero_orden']
             )
         
-        delegados = self.db.obtener_delegados()
-        presidente_id = None
-        secretario_id = None
-        
-        for d in delegados:
-            nombre_completo = f"{d['titulo']} {d['nombre']} {d['apellido']}"
-            if nombre_completo == datos['presidente']:
-                presidente_id = d['id']
-            if nombre_completo == datos['secretario']:
-                secretario_id = d['id']
+        # Firmas: ID elegido en los combos, o búsqueda por nombre si no viene
+        presidente_id = datos.get('presidente_id') or self.db.id_delegado_por_nombre(datos['presidente'])
+        secretario_id = datos.get('secretario_id') or self.db.id_delegado_por_nombre(datos['secretario'])
         
         if presidente_id and secretario_id:
             self.db.guardar_firmas(reunion_id, presidente_id, secretario_id)
         
+        # Datos completos (encabezado, fuentes, logo, textos de los temas) para
+        # poder regenerar el documento tal cual, aunque después cambien
+        self.db.guardar_instantanea(reunion_id, datos)
+        
+        # Co-ocurrencias y frecuencias de las sugerencias, sin recorrer el historial
+        self.db.registrar_reunion_en_sugerencias(reunion_id)
+        
+        self._descartar_borrador()
         self._actualizar_historial()
     
     def _actualizar_lista_temas(self):
-        """Actualiza la lista de temas"""
-        for item in self.view.tree_temas.get_children():
-            self.view.tree_temas.delete(item)
-        
-        temas = self.db.obtener_temas(solo_activos=True)
-        for tema in temas:
+        """Actualiza la lista de temas (las consultas corren en el hilo de la base)"""
+        self._en_segundo_plano('temas', self._filas_temas, self._mostrar_filas_temas)
+    
+    def _filas_temas(self):
+        """Arma las filas de la tabla de temas; se ejecuta en el hilo de la base"""
+        filas = []
+        for tema in self.db.obtener_temas(solo_activos=True):
             stats = self.db.obtener_estadisticas_tema(tema['id'])
             estado = "Activo" if tema['activo'] else "Inactivo"
-            
-            self.view.tree_temas.insert('', 'end', values=(
+            filas.append((tema['id'], (
                 tema['id'],
                 tema['descripcion'],
                 tema['categoria'] or '-',
                 stats['cantidad_usos'],
                 estado
-            ), tags=(tema['id'],))
+            )))
+        return filas
+    
+    def _mostrar_filas_temas(self, filas):
+        """Reemplaza el contenido de la tabla de temas"""
+        self.view.tree_temas.delete(*self.view.tree_temas.get_children())
+        for tema_id, valores in filas:
+            self.view.tree_temas.insert('', 'end', values=valores, tags=(tema_id,))
     
     def _nuevo_tema(self):
         """Crea un nuevo tema"""
@@ -479,21 +807,29 @@ class MainController:
             messagebox.showinfo("Éxito", "Tema modificado correctamente")
     
     def _eliminar_tema(self):
-        """Elimina el tema seleccionado"""
+        """Elimina los temas seleccionados"""
         seleccion = self.view.tree_temas.selection()
         
         if not seleccion:
-            messagebox.showwarning("Advertencia", "Seleccione un tema para eliminar")
+            messagebox.showwarning("Advertencia", "Seleccione al menos un tema para eliminar")
             return
         
-        if not messagebox.askyesno("Confirmar", "¿Está seguro de eliminar este tema?"):
+        cantidad = len(seleccion)
+        if not messagebox.askyesno("Confirmar eliminación", f"¿Está seguro de eliminar {cantidad} tema(s)?"):
             return
         
-        item = seleccion[0]
-        tema_id = int(self.view.tree_temas.item(item, 'tags')[0])
-        self.db.eliminar_tema(tema_id)
+        tema_ids = [int(self.view.tree_temas.item(item, 'tags')[0]) for item in seleccion]
+        # Una sola transacción para toda la selección
+        resultados = self.db.eliminar_temas(tema_ids)
+        borrados = sum(1 for ok in resultados.values() if ok)
+        errores = len(resultados) - borrados
+        
         self._actualizar_lista_temas()
-        messagebox.showinfo("Éxito", "Tema eliminado correctamente")
+        
+        if errores == 0:
+            messagebox.showinfo("Éxito", f"Se eliminaron {borrados} tema(s) correctamente")
+        else:
+            messagebox.showwarning("Eliminación Parcial", f"Se eliminaron {borrados} tema(s). {errores} no pudieron ser eliminados.")
     
     def _ver_historial_tema(self):
         """Muestra el historial del tema seleccionado"""
@@ -512,11 +848,16 @@ class MainController:
         VentanaHistorialTema(self.view, tema, historial, stats)
     
     def _actualizar_lista_delegados(self):
-        """Actualiza la lista de delegados"""
-        for item in self.view.tree_delegados_lista.get_children():
-            self.view.tree_delegados_lista.delete(item)
-        
-        delegados = self.db.obtener_delegados(solo_activos=True, solo_titulares=False)
+        """Actualiza la lista de delegados (la consulta corre en el hilo de la base)"""
+        self._en_segundo_plano(
+            'delegados',
+            lambda: self.db.obtener_delegados(solo_activos=True, solo_titulares=False),
+            self._mostrar_delegados
+        )
+    
+    def _mostrar_delegados(self, delegados):
+        """Reemplaza el contenido de la tabla de delegados"""
+        self.view.tree_delegados_lista.delete(*self.view.tree_delegados_lista.get_children())
         for delegado in delegados:
             tipo = "Titular" if delegado['titular'] else "Suplente"
             
@@ -559,8 +900,7 @@ class MainController:
         item = seleccion[0]
         delegado_id = int(self.view.tree_delegados_lista.item(item, 'values')[0])
         
-        delegados = self.db.obtener_delegados(solo_activos=False)
-        delegado = next((d for d in delegados if d['id'] == delegado_id), None)
+        delegado = self.db.obtener_delegado(delegado_id)
         
         if not delegado:
             return
@@ -612,7 +952,6 @@ class MainController:
     def _cargar_temas_desde_excel(self):
         """Importa temas desde un archivo Excel"""
         from tkinter import filedialog
-        import openpyxl
         
         archivo = filedialog.askopenfilename(
             title="Seleccionar archivo Excel",
@@ -623,26 +962,7 @@ class MainController:
             return
         
         try:
-            wb = openpyxl.load_workbook(archivo)
-            ws = wb.active
-            
-            contador = 0
-            errores = []
-            
-            # Asumir que la primera fila es encabezado
-            for fila in ws.iter_rows(min_row=2, values_only=True):
-                if not fila[0]:  # Si la primera columna está vacía, saltar
-                    continue
-                
-                descripcion = str(fila[0]).strip() if fila[0] else ""
-                categoria = str(fila[1]).strip() if len(fila) > 1 and fila[1] else ""
-                
-                if descripcion:
-                    try:
-                        self.db.agregar_tema(descripcion, categoria)
-                        contador += 1
-                    except Exception as e:
-                        errores.append(f"Error en fila: {descripcion} - {str(e)}")
+            contador, errores = importar_temas_excel(self.db, archivo)
             
             self._actualizar_lista_temas()
             
@@ -658,8 +978,6 @@ class MainController:
     def _exportar_temas_excel(self):
         """Exporta los temas a un archivo Excel"""
         from tkinter import filedialog
-        import openpyxl
-        from openpyxl.styles import Font, PatternFill, Alignment
         from datetime import datetime
         
         archivo = filedialog.asksaveasfilename(
@@ -673,43 +991,8 @@ class MainController:
             return
         
         try:
-            temas = self.db.obtener_temas()
-            
-            # Crear workbook
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Temas"
-            
-            # Encabezados
-            encabezados = ["Descripción", "Categoría", "Veces Usado", "Estado"]
-            ws.append(encabezados)
-            
-            # Formatear encabezados
-            header_fill = PatternFill(start_color="2E7D32", end_color="2E7D32", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            # Datos
-            for tema in temas:
-                ws.append([
-                    tema['descripcion'],
-                    tema['categoria'] or "",
-                    tema['veces_usado'],
-                    "Activo" if tema['activo'] else "Inactivo"
-                ])
-            
-            # Ajustar anchos de columna
-            ws.column_dimensions['A'].width = 50
-            ws.column_dimensions['B'].width = 20
-            ws.column_dimensions['C'].width = 15
-            ws.column_dimensions['D'].width = 15
-            
-            wb.save(archivo)
-            messagebox.showinfo("Exportación Exitosa", f"Se exportaron {len(temas)} temas a:\n{archivo}")
+            cantidad = exportar_temas_excel(self.db, archivo)
+            messagebox.showinfo("Exportación Exitosa", f"Se exportaron {cantidad} temas a:\n{archivo}")
         
         except Exception as e:
             messagebox.showerror("Error", f"Error al exportar a Excel: {str(e)}")
@@ -718,12 +1001,6 @@ class MainController:
         """Exporta los temas a un archivo PDF"""
         from tkinter import filedialog
         from datetime import datetime
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import cm
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT
-        from reportlab.lib import colors
         
         archivo = filedialog.asksaveasfilename(
             title="Guardar archivo PDF",
@@ -736,61 +1013,61 @@ class MainController:
             return
         
         try:
-            temas = self.db.obtener_temas()
+            pdf = obtener_backend('pdf')
             
             # Crear documento PDF
-            doc = SimpleDocTemplate(
+            doc = pdf.SimpleDocTemplate(
                 archivo,
-                pagesize=A4,
-                rightMargin=1.5*cm,
-                leftMargin=1.5*cm,
-                topMargin=1.5*cm,
-                bottomMargin=1.5*cm
+                pagesize=pdf.A4,
+                rightMargin=1.5*pdf.cm,
+                leftMargin=1.5*pdf.cm,
+                topMargin=1.5*pdf.cm,
+                bottomMargin=1.5*pdf.cm
             )
             
             story = []
-            styles = getSampleStyleSheet()
+            styles = pdf.getSampleStyleSheet()
             
             # Título
-            title_style = ParagraphStyle(
+            title_style = pdf.ParagraphStyle(
                 'CustomTitle',
                 parent=styles['Heading1'],
                 fontSize=16,
-                textColor=colors.black,
+                textColor=pdf.colors.black,
                 spaceAfter=20,
-                alignment=TA_CENTER,
+                alignment=pdf.TA_CENTER,
                 fontName='Helvetica-Bold'
             )
-            story.append(Paragraph("LISTADO DE TEMAS", title_style))
-            story.append(Spacer(1, 0.5*cm))
+            story.append(pdf.Paragraph("LISTADO DE TEMAS", title_style))
+            story.append(pdf.Spacer(1, 0.5*pdf.cm))
             
             # Tabla de temas
             datos_tabla = [["Descripción", "Categoría", "Usos", "Estado"]]
-            for tema in temas:
+            for tema in self.db.iterar_temas():
                 datos_tabla.append([
                     tema['descripcion'],
                     tema['categoria'] or "",
-                    str(tema['veces_usado']),
+                    str(self.db.obtener_estadisticas_tema(tema['id'])['cantidad_usos']),
                     "Activo" if tema['activo'] else "Inactivo"
                 ])
             
-            tabla = Table(datos_tabla, colWidths=[9*cm, 3*cm, 1.5*cm, 2*cm])
-            tabla.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            tabla = pdf.Table(datos_tabla, colWidths=[9*pdf.cm, 3*pdf.cm, 1.5*pdf.cm, 2*pdf.cm])
+            tabla.setStyle(pdf.TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), pdf.colors.HexColor('#2E7D32')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), pdf.colors.whitesmoke),
                 ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
                 ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
                 ('FONTSIZE', (0, 0), (-1, 0), 10),
                 ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('BACKGROUND', (0, 1), (-1, -1), pdf.colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, pdf.colors.black),
                 ('FONTSIZE', (0, 1), (-1, -1), 9),
             ]))
             
             story.append(tabla)
             
             doc.build(story)
-            messagebox.showinfo("Exportación Exitosa", f"Se exportaron {len(temas)} temas a:\n{archivo}")
+            messagebox.showinfo("Exportación Exitosa", f"Se exportaron {len(datos_tabla) - 1} temas a:\n{archivo}")
         
         except Exception as e:
             messagebox.showerror("Error", f"Error al exportar a PDF: {str(e)}")
@@ -816,46 +1093,95 @@ class MainController:
         """Actualiza el historial de reuniones"""
         self._actualizar_lista_historial()
     
+    def _refrescar_historial(self):
+        """Recarga el historial conservando la búsqueda actual"""
+        termino = self.view.entry_buscar_historial.get().strip()
+        self._actualizar_lista_historial(termino or None)
+    
     def _actualizar_lista_historial(self, termino_busqueda: str = None):
-        """Actualiza la tabla de historial"""
-        # Limpiar tabla
-        for item in self.view.tree_historial.get_children():
-            self.view.tree_historial.delete(item)
-        
-        # Obtener reuniones
+        """Actualiza la tabla de historial (las consultas corren en el hilo de la base)"""
+        # Las reuniones archivadas solo se leen si está marcado "Incluir archivo"
+        incluir_archivo = self.view.var_incluir_archivo.get()
+        termino = termino_busqueda or ""
+        self._consulta_historial = (termino, incluir_archivo)
+        inicio = time.perf_counter()
+        self._en_segundo_plano(
+            'historial', self._filas_historial,
+            lambda filas: self._mostrar_filas_historial(filas, termino, incluir_archivo, inicio),
+            termino_busqueda, incluir_archivo
+        )
+    
+    def _filas_historial(self, termino_busqueda, incluir_archivo):
+        """
+        Arma las filas del historial; se ejecuta en el hilo de la base
+        
+        Cada fila lleva, además de los valores de la tabla, el texto en el que
+        busca el LIKE (fecha y descripciones de los temas) para poder refinar
+        la búsqueda en memoria.
+        """
         if termino_busqueda:
-            reuniones = self.db.buscar_reuniones(termino_busqueda)
+            reuniones = self.db.buscar_reuniones(termino_busqueda, incluir_archivo=incluir_archivo)
         else:
-            reuniones = self.db.obtener_reuniones()
+            reuniones = self.db.obtener_reuniones(incluir_archivo=incluir_archivo)
         
-        # Agregar a tabla
+        filas = []
+        usos = {}  # Contador de uso por tema, compartido entre todas las reuniones
         for reunion in reuniones:
-            # Obtener temas de la reunión
-            temas = self.db.obtener_temas_reunion(reunion['id'])
-            
-            # Construir texto con temas y sus contadores de uso
-            temas_con_usos = []
-            for t in temas:
-                stats = self.db.obtener_estadisticas_tema(t['id'])
-                cantidad_usos = stats['cantidad_usos']
-                temas_con_usos.append(f"{t['numero_orden']}. {t['descripcion']} ({cantidad_usos})")
-            
-            temas_texto = ", ".join(temas_con_usos)
-            
-            self.view.tree_historial.insert('', 'end', values=(
+            temas = self.db.obtener_temas_reunion(reunion['id'], incluir_archivo=incluir_archivo)
+            # Texto con temas y sus contadores de uso
+            filas.append(((
                 reunion['id'],
                 reunion['fecha'],
                 reunion['hora'],
                 reunion['lugar'],
                 reunion['tipo'],
-                temas_texto if temas_texto else "Sin temas"
-            ))
+                texto_temas_reunion(self.db, reunion['id'], incluir_archivo, temas, usos)
+            ), texto_buscable(reunion['fecha'], *(t['descripcion'] for t in temas))))
+        return filas
+    
+    def _mostrar_filas_historial(self, filas, termino, incluir_archivo, inicio, desde_memoria=False):
+        """Reemplaza el contenido de la tabla de historial y muestra cantidad y tiempo"""
+        if not desde_memoria:
+            # Base para refinar en memoria las búsquedas que contienen a este término
+            self._resultado_historial = (termino, incluir_archivo, filas)
+        
+        self.view.tree_historial.delete(*self.view.tree_historial.get_children())
+        for valores, _ in filas:
+            self.view.tree_historial.insert('', 'end', values=valores)
+        
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+        origen = " (filtrado en memoria)" if desde_memoria else ""
+        self.view.label_resultados_historial.config(
+            text=f"{len(filas)} reunión(es) en {duracion_ms:.0f} ms{origen}")
+    
+    def _busqueda_al_escribir(self, event=None):
+        """Programa la búsqueda en vivo; cada tecla reinicia la espera"""
+        if self._busqueda_programada is not None:
+            self.view.after_cancel(self._busqueda_programada)
+        self._busqueda_programada = self.view.after(RETARDO_BUSQUEDA_MS, self._busqueda_en_vivo)
+    
+    def _busqueda_en_vivo(self):
+        """Busca con el texto actual, filtrando en memoria el último resultado si se puede"""
+        self._busqueda_programada = None
+        termino = self.view.entry_buscar_historial.get().strip()
+        incluir_archivo = self.view.var_incluir_archivo.get()
+        if (termino, incluir_archivo) == self._consulta_historial:
+            return  # Teclas que no cambian el texto (flechas, Shift, ...)
+        
+        base = self._resultado_historial
+        if base and base[1] == incluir_archivo and refina(base[0], termino):
+            inicio = time.perf_counter()
+            filas = [fila for fila in base[2] if coincide(termino, fila[1])]
+            # Un pedido a la base todavía en curso quedaría desactualizado
+            self._descartar_pedido('historial')
+            self._consulta_historial = (termino, incluir_archivo)
+            self._mostrar_filas_historial(filas, termino, incluir_archivo, inicio, desde_memoria=True)
+        else:
+            self._actualizar_lista_historial(termino or None)
     
     def _exportar_historial_excel(self):
         """Exporta el historial a Excel"""
         from tkinter import filedialog
-        import openpyxl
-        from openpyxl.styles import Font, PatternFill, Alignment
         from datetime import datetime
         
         archivo = filedialog.asksaveasfilename(
@@ -869,59 +1195,8 @@ class MainController:
             return
         
         try:
-            reuniones = self.db.obtener_reuniones()
-            
-            # Crear workbook
-            wb = openpyxl.Workbook()
-            ws = wb.active
-            ws.title = "Historial"
-            
-            # Encabezados
-            encabezados = ["ID", "Fecha", "Hora", "Lugar", "Tipo", "Temas"]
-            ws.append(encabezados)
-            
-            # Formatear encabezados
-            header_fill = PatternFill(start_color="2E7D32", end_color="2E7D32", fill_type="solid")
-            header_font = Font(bold=True, color="FFFFFF")
-            
-            for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-            
-            # Datos
-            for reunion in reuniones:
-                # Obtener temas de la reunión
-                temas = self.db.obtener_temas_reunion(reunion['id'])
-                
-                # Construir texto con temas y sus contadores de uso
-                temas_con_usos = []
-                for t in temas:
-                    stats = self.db.obtener_estadisticas_tema(t['id'])
-                    cantidad_usos = stats['cantidad_usos']
-                    temas_con_usos.append(f"{t['numero_orden']}. {t['descripcion']} ({cantidad_usos})")
-                
-                temas_texto = ", ".join(temas_con_usos)
-                
-                ws.append([
-                    reunion['id'],
-                    reunion['fecha'],
-                    reunion['hora'],
-                    reunion['lugar'],
-                    reunion['tipo'],
-                    temas_texto if temas_texto else "Sin temas"
-                ])
-            
-            # Ajustar anchos de columna
-            ws.column_dimensions['A'].width = 8
-            ws.column_dimensions['B'].width = 15
-            ws.column_dimensions['C'].width = 12
-            ws.column_dimensions['D'].width = 30
-            ws.column_dimensions['E'].width = 15
-            ws.column_dimensions['F'].width = 50
-            
-            wb.save(archivo)
-            messagebox.showinfo("Exportación Exitosa", f"Se exportaron {len(reuniones)} reuniones a:\n{archivo}")
+            cantidad = exportar_historial_excel(self.db, archivo)
+            messagebox.showinfo("Exportación Exitosa", f"Se exportaron {cantidad} reuniones a:\n{archivo}")
         
         except Exception as e:
             messagebox.showerror("Error", f"Error al exportar a Excel: {str(e)}")
@@ -930,12 +1205,6 @@ class MainController:
         """Exporta el historial a PDF"""
         from tkinter import filedialog
         from datetime import datetime
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import cm
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib.enums import TA_CENTER, TA_LEFT
-        from reportlab.lib import colors
         
         archivo = filedialog.asksaveasfilename(
             title="Guardar archivo PDF",
@@ -948,69 +1217,51 @@ class MainController:
             return
         
         try:
-            reuniones = self.db.obtener_reuniones()
+            pdf = obtener_backend('pdf')
             
             # Crear documento PDF
-            doc = SimpleDocTemplate(
+            doc = pdf.SimpleDocTemplate(
                 archivo,
-                pagesize=A4,
-                rightMargin=1.5*cm,
-                leftMargin=1.5*cm,
-                topMargin=1.5*cm,
-                bottomMargin=1.5*cm
+                pagesize=pdf.A4,
+                rightMargin=1.5*pdf.cm,
+                leftMargin=1.5*pdf.cm,
+                topMargin=1.5*pdf.cm,
+                bottomMargin=1.5*pdf.cm
             )
             
             story = []
-            styles = getSampleStyleSheet()
+            styles = pdf.getSampleStyleSheet()
             
             # Título
-            title_style = ParagraphStyle(
+            title_style = pdf.ParagraphStyle(
                 'CustomTitle',
                 parent=styles['Heading1'],
                 fontSize=16,
-                textColor=colors.black,
+                textColor=pdf.colors.black,
                 spaceAfter=20,
-                alignment=TA_CENTER,
+                alignment=pdf.TA_CENTER,
                 fontName='Helvetica-Bold'
             )
-            story.append(Paragraph("HISTORIAL DE REUNIONES", title_style))
-            story.append(Spacer(1, 0.5*cm))
+            story.append(pdf.Paragraph("HISTORIAL DE REUNIONES", title_style))
+            story.append(pdf.Spacer(1, 0.5*pdf.cm))
             
             # Tabla de reuniones
             datos_tabla = [["ID", "Fecha", "Hora", "Lugar", "Tipo", "Temas"]]
-            for reunion in reuniones:
-                # Obtener temas de la reunión
-                temas = self.db.obtener_temas_reunion(reunion['id'])
-                
-                # Construir texto con temas y sus contadores de uso
-                temas_con_usos = []
-                for t in temas:
-                    stats = self.db.obtener_estadisticas_tema(t['id'])
-                    cantidad_usos = stats['cantidad_usos']
-                    temas_con_usos.append(f"{t['numero_orden']}. {t['descripcion']} ({cantidad_usos})")
-                
-                temas_texto = ", ".join(temas_con_usos)
-                
-                datos_tabla.append([
-                    str(reunion['id']),
-                    reunion['fecha'],
-                    reunion['hora'],
-                    reunion['lugar'],
-                    reunion['tipo'],
-                    temas_texto if temas_texto else "Sin temas"
-                ])
+            # Texto con temas y sus contadores de uso, leídos de a lotes
+            for reunion_id, fecha, hora, lugar, tipo, temas_texto in iterar_historial(self.db):
+                datos_tabla.append([str(reunion_id), fecha, hora, lugar, tipo, temas_texto])
             
-            tabla = Table(datos_tabla, colWidths=[1*cm, 2*cm, 1.5*cm, 3.5*cm, 2*cm, 5.5*cm])
-            tabla.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E7D32')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            tabla = pdf.Table(datos_tabla, colWidths=[1*pdf.cm, 2*pdf.cm, 1.5*pdf.cm, 3.5*pdf.cm, 2*pdf.cm, 5.5*pdf.cm])
+            tabla.setStyle(pdf.TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), pdf.colors.HexColor('#2E7D32')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), pdf.colors.whitesmoke),
                 ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
                 ('VALIGN', (0, 0), (-1, -1), 'TOP'),
                 ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
                 ('FONTSIZE', (0, 0), (-1, 0), 10),
                 ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('BACKGROUND', (0, 1), (-1, -1), pdf.colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, pdf.colors.black),
                 ('FONTSIZE', (0, 1), (-1, -1), 9),
                 ('WORDWRAP', 'CJK'),
             ]))
@@ -1018,11 +1269,42 @@ class MainController:
             story.append(tabla)
             
             doc.build(story)
-            messagebox.showinfo("Exportación Exitosa", f"Se exportaron {len(reuniones)} reuniones a:\n{archivo}")
+            messagebox.showinfo("Exportación Exitosa", f"Se exportaron {len(datos_tabla) - 1} reuniones a:\n{archivo}")
         
         except Exception as e:
             messagebox.showerror("Error", f"Error al exportar a PDF: {str(e)}")
     
+    def _archivar_reuniones(self):
+        """Mueve al archivo las reuniones más antiguas que el corte elegido"""
+        from tkinter import simpledialog
+        
+        meses = simpledialog.askinteger(
+            "Archivar reuniones",
+            "Archivar las reuniones creadas hace más de (meses):",
+            initialvalue=MESES_ARCHIVO_POR_DEFECTO,
+            minvalue=1,
+            parent=self.view
+        )
+        if not meses:
+            return
+        
+        corte = fecha_corte_archivo(meses)
+        if not messagebox.askyesno(
+            "Confirmar archivo",
+            f"Las reuniones creadas antes del {corte} se moverán a:\n{self.db.ruta_archivo}\n\n"
+            "Seguirán disponibles marcando \"Incluir archivo\"."
+        ):
+            return
+        
+        try:
+            cantidad = self.db.archivar_reuniones(corte)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al archivar reuniones: {str(e)}")
+            return
+        
+        self._actualizar_historial()
+        messagebox.showinfo("Archivo", f"Se archivaron {cantidad} reunión(es)")
+    
     def _borrar_reuniones_seleccionadas(self):
         """Borra las reuniones seleccionadas del historial"""
         # Obtener items seleccionados
@@ -1049,19 +1331,11 @@ class MainController:
             reunion_id = int(self.view.tree_historial.item(item, 'values')[0])
             reuniones_a_borrar.append(reunion_id)
         
-        # Borrar cada reunión
-        borradas = 0
-        errores = 0
-        
-        for reunion_id in reuniones_a_borrar:
-            try:
-                if self.db.eliminar_reunion(reunion_id):
-                    borradas += 1
-                else:
-                    errores += 1
-            except Exception as e:
-                print(f"Error al borrar reunión {reunion_id}: {e}")
-                errores += 1
+        # Borrar todas las reuniones en una sola transacción
+        resultados = self.db.eliminar_reuniones(
+            reuniones_a_borrar, incluir_archivo=self.view.var_incluir_archivo.get())
+        borradas = sum(1 for ok in resultados.values() if ok)
+        errores = len(resultados) - borradas
         
         # Actualizar la lista
         self._actualizar_historial()
@@ -1075,14 +1349,150 @@ class MainController:
                 f"Se eliminaron {borradas} reunión(es)\n{errores} no pudieron ser eliminadas"
             )
     
+    # ==================== CONSULTAS EN SEGUNDO PLANO ====================
+    
+    def _en_segundo_plano(self, canal: str, funcion, al_terminar, *args, hilo=None, **kwargs):
+        """
+        Ejecuta funcion(*args, **kwargs) en el hilo de la base y aplica el
+        resultado con al_terminar(resultado) en el hilo de Tk
+        
+        Cada canal (una tabla de la interfaz) muestra solo su pedido más
+        reciente: si llega otro antes de terminar, el anterior se cancela o,
+        si ya empezó, su resultado se descarta. Con `hilo` (otra DatabaseAsincrona)
+        el trabajo corre en ese hilo en lugar del de la base.
+        
+        Al perfilar, al_terminar cuenta como parte de la acción que hizo el pedido.
+        """
+        if self.perfilador:
+            al_terminar = self.perfilador.continuar(self.perfilador.capturar(), al_terminar,
+                                                    "[resultado]")
+        
+        anterior = self._pedidos.get(canal)
+        if anterior is not None:
+            anterior[1].cancel()
+        
+        generacion = (anterior[0] + 1) if anterior else 1
+        futuro = (hilo or self.db_async).enviar(funcion, *args, **kwargs)
+        self._pedidos[canal] = (generacion, futuro)
+        self.view.after(INTERVALO_REVISION_MS, self._revisar_pedido, canal, generacion, al_terminar)
+    
+    def _descartar_pedido(self, canal: str):
+        """Cancela el último pedido del canal o hace que se ignore su resultado"""
+        anterior = self._pedidos.get(canal)
+        if anterior is not None:
+            anterior[1].cancel()
+            self._pedidos[canal] = (anterior[0] + 1, anterior[1])
+    
+    def _revisar_pedido(self, canal, generacion, al_terminar):
+        """Aplica el resultado del pedido si terminó y sigue siendo el último del canal"""
+        actual, futuro = self._pedidos[canal]
+        if actual != generacion:
+            return  # Reemplazado por un pedido más nuevo
+        if not futuro.done():
+            self.view.after(INTERVALO_REVISION_MS, self._revisar_pedido, canal, generacion, al_terminar)
+            return
+        
+        try:
+            resultado = futuro.result()
+        except Exception as e:
+            print(f"[ERROR] Error consultando {canal}: {e}")
+            messagebox.showerror("Error", f"Error al cargar {canal}: {str(e)}")
+            return
+        al_terminar(resultado)
+    
+    # ==================== RESPALDOS ====================
+    
+    def _crear_respaldo(self, automatico: bool = False):
+        """Respalda la base en un hilo; la copia es por pasos y no bloquea a la interfaz"""
+        if self._respaldo_en_curso:
+            if not automatico:
+                messagebox.showinfo("Respaldo", "Ya hay un respaldo en curso")
+            return
+        self._respaldo_en_curso = True
+        
+        estado = {}
+        
+        def respaldar():
+            try:
+                estado['resultados'] = crear_respaldo(self.db)
+            except Exception as e:
+                estado['error'] = e
+        
+        hilo = threading.Thread(target=respaldar, name="respaldo", daemon=True)
+        hilo.start()
+        self.view.after(200, self._revisar_respaldo, hilo, estado, automatico)
+    
+    def _revisar_respaldo(self, hilo, estado, automatico):
+        """Espera al hilo del respaldo sin bloquear el bucle de Tk"""
+        if hilo.is_alive():
+            self.view.after(200, self._revisar_respaldo, hilo, estado, automatico)
+            return
+        self._respaldo_en_curso = False
+        
+        if 'error' in estado:
+            print(f"[ERROR] Error al crear el respaldo: {estado['error']}")
+            if not automatico:
+                messagebox.showerror("Error", f"Error al crear el respaldo: {estado['error']}")
+            return
+        
+        archivos = [r['archivo'] for r in estado['resultados']]
+        print(f"[OK] Respaldo verificado: {', '.join(archivos)}")
+        if not automatico:
+            messagebox.showinfo("Respaldo", "Respaldo creado y verificado:\n" + "\n".join(archivos))
+    
+    def _programar_respaldo(self):
+        """Respaldo automático: revisa cada hora si pasó el intervalo (ORDEN_DIA_RESPALDO_HORAS)"""
+        if respaldo_pendiente(self.db):
+            self._crear_respaldo(automatico=True)
+        self.view.after(3600 * 1000, self._programar_respaldo)
+    
+    def _mostrar_informe_consultas(self, event=None):
+        """Muestra las estadísticas de consultas SQL (tecla F12)"""
+        if self.db.registro_consultas is None:
+            self.db.activar_instrumentacion()
+            messagebox.showinfo(
+                "Informe de Consultas",
+                "Se activó el registro de consultas SQL.\n"
+                "Realice las acciones a medir y presione F12 nuevamente."
+            )
+            return
+        
+        contenido = (self.db.formatear_informe_consultas() + "\n\n"
+                     + self.db.cache.formatear_estadisticas())
+        VentanaVistaPrevia(self.view, contenido, titulo="Informe de Consultas SQL")
+    
+    def _mostrar_latencia_accion(self, resumen):
+        """Muestra en la ventana la latencia de la última acción perfilada"""
+        nombre = resumen['accion'].split('.')[-1]
+        self.view.actualizar_overlay_perfil(
+            f"⏱ {nombre}: {resumen['duracion_ms']:.0f} ms "
+            f"({resumen['segundo_plano_ms']:.0f} en segundo plano) · {resumen['consultas']} consultas"
+        )
+    
     def run(self):
         """Ejecuta la aplicación"""
         print("[DEBUG] Iniciando mainloop...")
         self.view.mainloop()
         print("[DEBUG] Mainloop finalizado")
+        self.db_async.cerrar()
+        if self.hilo_vista_previa is not None:
+            self.hilo_vista_previa.cerrar()
+        
+        if self.perfilador:
+            archivos = self.perfilador.volcar(extra={
+                'consultas_sql': self.db.informe_consultas(),
+                'cache': self.db.cache.estadisticas(),
+            })
+            print(f"[OK] Perfil guardado en: {', '.join(archivos.values())}")
 
 
 if __name__ == "__main__":
+    # Perfilado opcional: --perfil y --perfil-overlay
+    if '--perfil' in sys.argv or '--perfil-overlay' in sys.argv:
+        os.environ[ENV_PERFIL] = '1'
+    if '--perfil-overlay' in sys.argv:
+        os.environ[ENV_OVERLAY] = '1'
+    
     try:
         print("[DEBUG] Creando MainController...")
         app = MainController()
@@ -2,5 +2,7 @@
 Módulo de modelos
 """
 from .database import Database
+from .database_asincrona import DatabaseAsincrona
+from .orden_del_dia import OrdenDelDia
 
-__all__ = ['Database']
\ No newline at end of file
+__all__ = ['Database', 'DatabaseAsincrona', 'OrdenDelDia']
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+Caché de lectura para consultas frecuentes (delegados, temas)
+
+Las escrituras del propio proceso invalidan la tabla afectada. Los cambios
+hechos por otro equipo sobre la misma base se ven al vencer el TTL.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from .registros import Registro
+
+
+class EstadisticaCache:
+    """Contadores de una tabla"""
+
+    __slots__ = ('aciertos', 'fallos', 'invalidaciones')
+
+    def __init__(self):
+        self.aciertos = 0
+        self.fallos = 0
+        self.invalidaciones = 0
+
+
+def _congelar(valor: Any):
+    """Congela los registros de un valor cacheado (sueltos o en listas, tuplas y dicts)"""
+    if isinstance(valor, Registro):
+        valor.congelar()
+    elif isinstance(valor, (list, tuple)):
+        for elemento in valor:
+            _congelar(elemento)
+    elif isinstance(valor, dict):
+        for elemento in valor.values():
+            _congelar(elemento)
+
+
+class CacheLectura:
+    """
+    Caché read-through por tabla y argumentos de la consulta
+
+    Cada tabla lleva un número de generación: una carga que empezó antes de una
+    invalidación no guarda su resultado, así no se reintroducen datos viejos.
+    """
+
+    def __init__(self, ttl: float = 10.0):
+        """
+        Args:
+            ttl: Segundos de validez de cada entrada (0 desactiva la caché)
+        """
+        self.ttl = ttl
+        self._entradas: Dict[Tuple[str, Hashable], Tuple[float, Any]] = {}
+        self._generaciones: Dict[str, int] = {}
+        self._estadisticas: Dict[str, EstadisticaCache] = {}
+        self._lock = threading.Lock()
+
+    def _estadistica(self, tabla: str) -> EstadisticaCache:
+        estadistica = self._estadisticas.get(tabla)
+        if estadistica is None:
+            estadistica = self._estadisticas[tabla] = EstadisticaCache()
+        return estadistica
+
+    def obtener(self, tabla: str, clave: Hashable, cargar: Callable[[], Any]) -> Any:
+        """
+        Devuelve el valor cacheado o lo carga con `cargar()`
+
+        Las listas se devuelven como copia para que el llamador pueda
+        modificarlas sin alterar la caché. Los registros, en cambio, son los
+        mismos para todos los llamadores y se entregan congelados: asignarles
+        un campo da TypeError (para cambiarlo, armar uno nuevo).
+        """
+        if self.ttl <= 0:
+            return cargar()
+
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._entradas.get((tabla, clave))
+            estadistica = self._estadistica(tabla)
+            if entrada is not None and entrada[0] > ahora:
+                estadistica.aciertos += 1
+                valor = entrada[1]
+                return list(valor) if isinstance(valor, list) else valor
+            estadistica.fallos += 1
+            generacion = self._generaciones.get(tabla, 0)
+
+        valor = cargar()
+        _congelar(valor)
+
+        with self._lock:
+            if self._generaciones.get(tabla, 0) == generacion:
+                self._entradas[(tabla, clave)] = (ahora + self.ttl, valor)
+        return list(valor) if isinstance(valor, list) else valor
+
+    def invalidar(self, *tablas: str):
+        """Descarta todas las entradas de las tablas indicadas"""
+        with self._lock:
+            for tabla in tablas:
+                self._generaciones[tabla] = self._generaciones.get(tabla, 0) + 1
+                self._estadistica(tabla).invalidaciones += 1
+                for clave in [c for c in self._entradas if c[0] == tabla]:
+                    del self._entradas[clave]
+
+    def limpiar(self):
+        """Descarta todas las entradas"""
+        with self._lock:
+            tablas = {c[0] for c in self._entradas}
+        self.invalidar(*tablas)
+
+    def estadisticas(self) -> Dict[str, Dict[str, int]]:
+        """Aciertos, fallos e invalidaciones por tabla"""
+        with self._lock:
+            return {
+                tabla: {
+                    'aciertos': e.aciertos,
+                    'fallos': e.fallos,
+                    'invalidaciones': e.invalidaciones,
+                    'entradas': sum(1 for c in self._entradas if c[0] == tabla),
+                }
+                for tabla, e in self._estadisticas.items()
+            }
+
+    def formatear_estadisticas(self) -> str:
+        """Resumen en texto plano"""
+        estadisticas = self.estadisticas()
+        if not estadisticas:
+            return "Caché de lectura: sin uso."
+        lineas = [f"Caché de lectura (TTL {self.ttl:g} s)",
+                  f"{'Tabla':<12} {'Aciertos':>9} {'Fallos':>7} {'Invalid.':>9} {'Entradas':>9}"]
+        for tabla, e in sorted(estadisticas.items()):
+            lineas.append(f"{tabla:<12} {e['aciertos']:>9} {e['fallos']:>7} "
+                          f"{e['invalidaciones']:>9} {e['entradas']:>9}")
+        return "\n".join(lineas)
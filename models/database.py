@@ -3,20 +3,329 @@ Modelo de Base de Datos
 Sistema de Órdenes del Día - Colegio de Médicos
 """
 
+import hashlib
+import json
+import os
+import re
 import sqlite3
-from typing import List, Dict, Optional
+import zlib
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+from .cache import CacheLectura
+from .instrumentacion import ConexionInstrumentada, RegistroConsultas
+from .registros import Delegado, ItemOrden, Registro, Reunion, Tema
+
+
+# Variable de entorno para registrar estadísticas de todas las consultas
+ENV_INSTRUMENTAR = 'ORDEN_DIA_INSTRUMENTAR'
+
+# Modo de diario de la base. WAL permite leer mientras otro proceso escribe,
+# pero necesita memoria compartida entre procesos: si la base está en una
+# carpeta de red (SMB/NFS) usar ORDEN_DIA_MODO_DIARIO=DELETE.
+ENV_MODO_DIARIO = 'ORDEN_DIA_MODO_DIARIO'
+MODO_DIARIO_POR_DEFECTO = 'WAL'
+
+# Pragmas que se aplican a cada conexión nueva
+PRAGMAS_CONEXION: Dict[str, Union[int, str]] = {
+    'synchronous': 'NORMAL',        # Seguro con WAL; solo se sincroniza en checkpoints
+    'busy_timeout': 5000,           # ms de espera ante un bloqueo antes de fallar
+    'cache_size': -8000,            # Negativo = KiB (~8 MB de caché de páginas)
+    'mmap_size': 64 * 1024 * 1024,  # Lecturas por memoria mapeada (64 MB)
+    'temp_store': 'MEMORY',         # Tablas temporales de ORDER BY/GROUP BY en memoria
+}
+
+_RE_VALOR_PRAGMA = re.compile(r"-?\w+")
+
+# Archivo con las reuniones viejas (None = <base>_archivo.db junto a la base)
+ENV_ARCHIVO = 'ORDEN_DIA_ARCHIVO'
+MESES_ARCHIVO_POR_DEFECTO = 24
+
+# Sugerencias de temas: el peso de una reunión se reduce a la mitad cada
+# VIDA_MEDIA_SUGERENCIAS_DIAS. Los puntajes se guardan relativos a una fecha
+# fija (crecen con el tiempo en lugar de decaer), así guardar una reunión no
+# obliga a actualizar los demás temas y el orden relativo es el mismo.
+VIDA_MEDIA_SUGERENCIAS_DIAS = 365
+_REFERENCIA_SUGERENCIAS = datetime(2026, 1, 1)
+PESO_RECENCIA = 0.5  # Importancia de la frecuencia reciente frente a la co-ocurrencia
+
+# Filas por lectura en los iteradores (fetchmany)
+TAMAÑO_LOTE = 500
+
+# Máximo de parámetros por sentencia en las operaciones masivas (SQLite < 3.32 admite 999)
+MAXIMO_PARAMETROS = 900
+
+# Consultas compartidas entre las variantes en lista y en iterador.
+# {reuniones} y {orden_dia} se reemplazan por la tabla de la base activa o por
+# la unión con el archivo (ver _tablas_historial).
+_SQL_TEMAS = "SELECT id, descripcion, categoria, activo FROM temas"
+
+_SQL_DELEGADOS = "SELECT id, titulo, nombre, apellido, distrito, titular, activo FROM delegados"
+
+_SQL_REUNIONES = """
+    SELECT 
+        r.id,
+        r.fecha,
+        r.hora,
+        r.lugar,
+        r.tipo,
+        COUNT(od.id) as cantidad_temas
+    FROM {reuniones} r
+    LEFT JOIN {orden_dia} od ON r.id = od.reunion_id
+    GROUP BY r.id
+    ORDER BY r.fecha DESC
+"""
+
+# Buscar por fecha (YYYY-MM-DD o DD/MM/YYYY) o por descripción de tema
+_SQL_BUSCAR_REUNIONES = """
+    SELECT DISTINCT
+        r.id,
+        r.fecha,
+        r.hora,
+        r.lugar,
+        r.tipo,
+        COUNT(od.id) as cantidad_temas
+    FROM {reuniones} r
+    LEFT JOIN {orden_dia} od ON r.id = od.reunion_id
+    LEFT JOIN temas t ON od.tema_id = t.id
+    WHERE r.fecha LIKE ? OR t.descripcion LIKE ?
+    GROUP BY r.id
+    ORDER BY r.fecha DESC
+"""
+
+# Tablas de las consultas de historial: solo la base activa o unida al archivo
+_TABLAS_ACTIVAS = {'reuniones': 'reuniones', 'orden_dia': 'orden_dia'}
+_TABLAS_CON_ARCHIVO = {
+    'reuniones': ("(SELECT id, fecha, hora, lugar, sede, tipo FROM main.reuniones "
+                  "UNION ALL SELECT id, fecha, hora, lugar, sede, tipo FROM archivo.reuniones)"),
+    'orden_dia': ("(SELECT id, reunion_id, tema_id, numero_orden FROM main.orden_dia "
+                  "UNION ALL SELECT id, reunion_id, tema_id, numero_orden FROM archivo.orden_dia)"),
+}
+
+# Tablas que se mueven al archivo, en orden de copia
+_TABLAS_ARCHIVABLES = ('reuniones', 'orden_dia', 'firmas')
+
+
+def fecha_corte_archivo(meses: int = MESES_ARCHIVO_POR_DEFECTO,
+                        hoy: Optional[date] = None) -> str:
+    """Fecha (YYYY-MM-DD) de hace `meses` meses; el día se ajusta al último del mes"""
+    hoy = hoy or date.today()
+    total = hoy.year * 12 + hoy.month - 1 - meses
+    año, mes = divmod(total, 12)
+    mes += 1
+    siguiente = date(año + (mes == 12), mes % 12 + 1, 1)
+    ultimo_dia = (siguiente - date(año, mes, 1)).days
+    return date(año, mes, min(hoy.day, ultimo_dia)).isoformat()
+
+
+_MESES = ('enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto',
+          'septiembre', 'octubre', 'noviembre', 'diciembre')
+_RE_FECHA_ISO = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_RE_FECHA_NUMERICA = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+_RE_FECHA_TEXTO = re.compile(r"(\d{1,2})\s+de\s+(\w+)\s+(?:de\s+|del\s+)?(\d{4})", re.IGNORECASE)
+
+
+def fecha_reunion_iso(texto: Optional[str]) -> Optional[str]:
+    """
+    Fecha de la reunión (campo libre de la interfaz) en formato YYYY-MM-DD
+    
+    Reconoce 'viernes 23 de enero de 2026', '23/01/2026' y '2026-01-23'.
+    Devuelve None si no encuentra una fecha válida.
+    """
+    if not texto:
+        return None
+    iso = _RE_FECHA_ISO.search(texto)
+    numerica = _RE_FECHA_NUMERICA.search(texto)
+    escrita = _RE_FECHA_TEXTO.search(texto)
+    if iso:
+        año, mes, dia = (int(g) for g in iso.groups())
+    elif numerica:
+        dia, mes, año = (int(g) for g in numerica.groups())
+    elif escrita:
+        nombre = escrita.group(2).lower().replace('setiembre', 'septiembre')
+        if nombre not in _MESES:
+            return None
+        dia, mes, año = int(escrita.group(1)), _MESES.index(nombre) + 1, int(escrita.group(3))
+    else:
+        return None
+    try:
+        return date(año, mes, dia).isoformat()
+    except ValueError:
+        return None
 
 
 class Database:
     """Maneja todas las operaciones de base de datos"""
     
-    def __init__(self, db_path: str = "orden_dia.db"):
+    def __init__(self, db_path: str = "orden_dia.db", instrumentar: Optional[bool] = None,
+                 pragmas: Optional[Dict[str, Union[int, str]]] = None,
+                 modo_diario: Optional[str] = None, cache_ttl: float = 10.0,
+                 ruta_archivo: Optional[str] = None):
+        """
+        Args:
+            instrumentar: Registrar estadísticas por consulta (None = según ORDEN_DIA_INSTRUMENTAR)
+            pragmas: Pragmas que reemplazan o se suman a PRAGMAS_CONEXION
+            modo_diario: journal_mode de la base (None = ORDEN_DIA_MODO_DIARIO o WAL)
+            cache_ttl: Segundos de validez de la caché de delegados y temas (0 la desactiva)
+            ruta_archivo: Base con las reuniones archivadas (None = ORDEN_DIA_ARCHIVO
+                o <base>_archivo.db)
+        """
         self.db_path = db_path
+        base, extension = os.path.splitext(db_path)
+        self.ruta_archivo = (ruta_archivo or os.environ.get(ENV_ARCHIVO)
+                             or f"{base}_archivo{extension or '.db'}")
+        self._observadores_sql: List[Callable[[str], None]] = []
+        self.cache = CacheLectura(cache_ttl)
+        
+        self.pragmas = dict(PRAGMAS_CONEXION)
+        self.pragmas.update(pragmas or {})
+        for nombre, valor in self.pragmas.items():
+            if not _RE_VALOR_PRAGMA.fullmatch(nombre) or not _RE_VALOR_PRAGMA.fullmatch(str(valor)):
+                raise ValueError(f"Pragma inválido: {nombre} = {valor!r}")
+        
+        self.modo_diario = (modo_diario or os.environ.get(ENV_MODO_DIARIO)
+                            or MODO_DIARIO_POR_DEFECTO).upper()
+        if not _RE_VALOR_PRAGMA.fullmatch(self.modo_diario):
+            raise ValueError(f"Modo de diario inválido: {self.modo_diario!r}")
+        
+        if instrumentar is None:
+            instrumentar = os.environ.get(ENV_INSTRUMENTAR, '') not in ('', '0')
+        self.registro_consultas: Optional[RegistroConsultas] = None
+        if instrumentar:
+            self.activar_instrumentacion()
+        
+        self._configurar_modo_diario()
         self.crear_tablas()
     
-    def get_connection(self):
-        """Obtiene conexión a la base de datos"""
-        return sqlite3.connect(self.db_path)
+    def get_connection(self, adjuntar_archivo: bool = False):
+        """
+        Obtiene conexión a la base de datos con los pragmas configurados
+        
+        Con adjuntar_archivo=True la base de reuniones archivadas queda
+        disponible como el esquema `archivo` (se crea si no existe).
+        """
+        timeout = int(self.pragmas.get('busy_timeout', 5000)) / 1000
+        if self.registro_consultas is not None:
+            conn = sqlite3.connect(self.db_path, timeout=timeout, factory=ConexionInstrumentada)
+            self._aplicar_pragmas(conn)
+            conn.registro = self.registro_consultas
+        else:
+            conn = sqlite3.connect(self.db_path, timeout=timeout)
+            self._aplicar_pragmas(conn)
+        if self._observadores_sql:
+            conn.set_trace_callback(self._notificar_sql)
+        if adjuntar_archivo:
+            conn.execute("ATTACH DATABASE ? AS archivo", (self.ruta_archivo,))
+        return conn
+    
+    def _aplicar_pragmas(self, conn: sqlite3.Connection):
+        """Aplica los pragmas por conexión (antes de instrumentar, para no contarlos)"""
+        for nombre, valor in self.pragmas.items():
+            conn.execute(f"PRAGMA {nombre} = {valor}")
+    
+    def _configurar_modo_diario(self):
+        """
+        Fija el journal_mode de la base
+        
+        WAL queda guardado en el archivo, así que basta con hacerlo al abrir
+        la base y no en cada conexión.
+        """
+        conn = self.get_connection()
+        try:
+            modo = conn.execute(f"PRAGMA journal_mode = {self.modo_diario}").fetchone()[0]
+            if modo.upper() != self.modo_diario:
+                print(f"[ERROR] No se pudo activar journal_mode={self.modo_diario} (queda {modo})")
+        except sqlite3.OperationalError as e:
+            # Otro proceso tiene la base abierta en una transacción: se mantiene el modo actual
+            print(f"[ERROR] No se pudo cambiar journal_mode a {self.modo_diario}: {e}")
+        finally:
+            conn.close()
+    
+    def _consultar(self, query: str, parametros: tuple = (),
+                   registro: Optional[Type[Registro]] = None, como_tuplas: bool = False,
+                   adjuntar_archivo: bool = False) -> list:
+        """
+        Ejecuta un SELECT y devuelve todas las filas
+        
+        Las filas se construyen como instancias de `registro` directamente desde
+        el cursor; con como_tuplas=True se devuelven las tuplas de sqlite3 en el
+        orden de las columnas del SELECT, sin ningún objeto intermedio.
+        """
+        conn = self.get_connection(adjuntar_archivo)
+        try:
+            cursor = conn.cursor()
+            if registro is not None and not como_tuplas:
+                cursor.row_factory = registro.fabrica
+            cursor.execute(query, parametros)
+            return cursor.fetchall()
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _tramos(ids: List[int], tamaño: int = MAXIMO_PARAMETROS) -> Iterator[Tuple[List[int], str]]:
+        """Divide los ids en tramos y arma los marcadores "?, ?, ..." de cada IN (...)"""
+        for inicio in range(0, len(ids), tamaño):
+            tramo = ids[inicio:inicio + tamaño]
+            yield tramo, ", ".join("?" * len(tramo))
+    
+    def _iterar(self, query: str, parametros: tuple = (),
+                registro: Optional[Type[Registro]] = None, como_tuplas: bool = False,
+                tamaño_lote: int = TAMAÑO_LOTE, adjuntar_archivo: bool = False) -> Iterator:
+        """
+        Ejecuta un SELECT y entrega las filas de a lotes con fetchmany
+        
+        La conexión queda abierta mientras se consume el generador y se cierra
+        al agotarlo, si se produce una excepción o al cerrarlo (close(), fin de
+        un `with contextlib.closing(...)` o recolección del generador). Si se
+        corta el recorrido con break, usar closing() para liberarla enseguida.
+        """
+        conn = self.get_connection(adjuntar_archivo)
+        try:
+            cursor = conn.cursor()
+            if registro is not None and not como_tuplas:
+                cursor.row_factory = registro.fabrica
+            cursor.execute(query, parametros)
+            while True:
+                filas = cursor.fetchmany(tamaño_lote)
+                if not filas:
+                    break
+                yield from filas
+            cursor.close()
+        finally:
+            conn.close()
+    
+    # === INSTRUMENTACIÓN ===
+    
+    def activar_instrumentacion(self):
+        """Comienza a registrar latencia y filas de cada sentencia SQL"""
+        if self.registro_consultas is None:
+            self.registro_consultas = RegistroConsultas()
+    
+    def informe_consultas(self) -> List[Dict]:
+        """
+        Estadísticas por sentencia normalizada: llamadas, total, p50, p99 y filas
+        
+        Devuelve una lista vacía si la instrumentación no está activa.
+        """
+        if self.registro_consultas is None:
+            return []
+        return self.registro_consultas.informe()
+    
+    def formatear_informe_consultas(self) -> str:
+        """Informe de consultas en texto plano"""
+        if self.registro_consultas is None:
+            return "La instrumentación de consultas no está activa."
+        return self.registro_consultas.formatear_informe()
+    
+    def agregar_observador_sql(self, callback: Callable[[str], None]):
+        """Registra una función que recibe cada sentencia SQL ejecutada"""
+        self._observadores_sql.append(callback)
+    
+    def _notificar_sql(self, sql: str):
+        """Reenvía la sentencia ejecutada a los observadores"""
+        for callback in self._observadores_sql:
+            callback(sql)
     
     def crear_tablas(self):
         """Crea las tablas necesarias"""
@@ -56,10 +365,18 @@ class Database:
                 apellido TEXT NOT NULL,
                 distrito TEXT,
                 titular INTEGER DEFAULT 1,
-                activo INTEGER DEFAULT 1
+                activo INTEGER DEFAULT 1,
+                posicion INTEGER
             )
         """)
         
+        # Bases anteriores al orden persistido: se parte del orden por ID
+        columnas = {fila[1] for fila in cursor.execute("PRAGMA table_info(delegados)")}
+        if 'posicion' not in columnas:
+            cursor.execute("ALTER TABLE delegados ADD COLUMN posicion INTEGER")
+            cursor.execute("UPDATE delegados SET posicion = id")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_delegados_posicion ON delegados (activo, posicion)")
+        
         # Tabla orden_dia
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS orden_dia (
@@ -84,9 +401,107 @@ class Database:
                 FOREIGN KEY (delegado_id) REFERENCES delegados(id)
             )
         """)
-        
+
+        # Índices por reunión: el borrado masivo y la carga del orden del día los usan
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_orden_dia_reunion ON orden_dia (reunion_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_firmas_reunion ON firmas (reunion_id)")
+
+        # Matriz dispersa de co-ocurrencia (ambos sentidos) y frecuencia por
+        # tema, mantenidas al guardar y borrar reuniones
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS coocurrencia_temas (
+                tema_a INTEGER NOT NULL,
+                tema_b INTEGER NOT NULL,
+                cantidad INTEGER NOT NULL,
+                PRIMARY KEY (tema_a, tema_b)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS frecuencia_temas (
+                tema_id INTEGER PRIMARY KEY,
+                usos INTEGER NOT NULL,
+                puntaje REAL NOT NULL
+            )
+        """)
+
+        # Plantillas de orden del día (temas fijos de apertura y cierre, etc.)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS plantillas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                nombre TEXT NOT NULL UNIQUE,
+                fecha_creacion TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS plantilla_items (
+                plantilla_id INTEGER NOT NULL,
+                numero_orden INTEGER NOT NULL,
+                tema_id INTEGER NOT NULL,
+                PRIMARY KEY (plantilla_id, numero_orden),
+                FOREIGN KEY (plantilla_id) REFERENCES plantillas(id),
+                FOREIGN KEY (tema_id) REFERENCES temas(id)
+            ) WITHOUT ROWID
+        """)
+
+        # Instantáneas: los datos completos con que se generó cada reunión
+        # (JSON comprimido). Los logos se guardan una sola vez, por hash.
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS logos (
+                sha256 TEXT PRIMARY KEY,
+                contenido BLOB NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS instantaneas (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                reunion_id INTEGER NOT NULL,
+                version INTEGER NOT NULL,
+                datos BLOB NOT NULL,
+                logo_sha256 TEXT,
+                fecha_reunion TEXT,
+                fecha_creacion TEXT DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (reunion_id, version),
+                FOREIGN KEY (logo_sha256) REFERENCES logos(sha256)
+            )
+        """)
+        # Bases anteriores: la fecha de la reunión (YYYY-MM-DD) sale de los datos
+        # guardados; el trigger se quita solo para completarla y se vuelve a crear
+        columnas = {fila[1] for fila in cursor.execute("PRAGMA table_info(instantaneas)")}
+        if 'fecha_reunion' not in columnas:
+            cursor.execute("DROP TRIGGER IF EXISTS instantaneas_inmutables")
+            cursor.execute("ALTER TABLE instantaneas ADD COLUMN fecha_reunion TEXT")
+            cursor.executemany(
+                "UPDATE instantaneas SET fecha_reunion = ? WHERE id = ?",
+                [(fecha_reunion_iso(json.loads(zlib.decompress(datos).decode('utf-8')).get('fecha')), id_)
+                 for id_, datos in cursor.execute("SELECT id, datos FROM instantaneas").fetchall()]
+            )
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_instantaneas_fecha ON instantaneas (fecha_reunion)")
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS instantaneas_inmutables
+            BEFORE UPDATE ON instantaneas
+            BEGIN
+                SELECT RAISE(ABORT, 'Las instantáneas no se modifican: guarde una versión nueva');
+            END
+        """)
+
+        # Borrador de la reunión en preparación: un valor JSON por campo
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS borrador (
+                campo TEXT PRIMARY KEY,
+                valor TEXT NOT NULL
+            ) WITHOUT ROWID
+        """)
+
         conn.commit()
+        
+        # Bases anteriores a las sugerencias: se calculan una vez desde el historial
+        sin_frecuencias = cursor.execute(
+            "SELECT NOT EXISTS (SELECT 1 FROM frecuencia_temas) "
+            "AND EXISTS (SELECT 1 FROM orden_dia)"
+        ).fetchone()[0]
         conn.close()
+        if sin_frecuencias:
+            self.reconstruir_sugerencias()
         print("[OK] Tablas creadas correctamente")
     
     # === MÉTODOS PARA TEMAS ===
@@ -102,50 +517,57 @@ class Database:
         tema_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        self.cache.invalidar('temas', 'sugerencias')
         return tema_id
     
-    def obtener_temas(self, solo_activos: bool = True) -> List[Dict]:
+    def obtener_temas(self, solo_activos: bool = True, como_tuplas: bool = False) -> List[Tema]:
         """Obtiene lista de temas"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT id, descripcion, categoria, activo FROM temas"
+        return self.cache.obtener(
+            'temas', ('lista', solo_activos, como_tuplas),
+            lambda: self._consultar(self._sql_temas(solo_activos), registro=Tema, como_tuplas=como_tuplas)
+        )
+    
+    def iterar_temas(self, solo_activos: bool = True, como_tuplas: bool = False,
+                     tamaño_lote: int = TAMAÑO_LOTE) -> Iterator[Tema]:
+        """Como obtener_temas, pero entrega los temas de a uno sin armar la lista"""
+        return self._iterar(self._sql_temas(solo_activos), registro=Tema,
+                            como_tuplas=como_tuplas, tamaño_lote=tamaño_lote)
+    
+    @staticmethod
+    def _sql_temas(solo_activos: bool) -> str:
+        query = _SQL_TEMAS
         if solo_activos:
             query += " WHERE activo = 1"
-        query += " ORDER BY descripcion"
-        
-        cursor.execute(query)
-        temas = []
-        for row in cursor.fetchall():
-            temas.append({
-                'id': row[0],
-                'descripcion': row[1],
-                'categoria': row[2],
-                'activo': row[3]
-            })
-        
-        conn.close()
-        return temas
+        return query + " ORDER BY descripcion"
     
-    def obtener_tema(self, tema_id: int) -> Optional[Dict]:
+    def obtener_tema(self, tema_id: int) -> Optional[Tema]:
         """Obtiene un tema por ID"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT id, descripcion, categoria, activo FROM temas WHERE id = ?",
-            (tema_id,)
+        temas = self.cache.obtener(
+            'temas', ('id', tema_id),
+            lambda: self._consultar(_SQL_TEMAS + " WHERE id = ?", (tema_id,), registro=Tema)
         )
-        row = cursor.fetchone()
-        conn.close()
+        return temas[0] if temas else None
+    
+    def obtener_temas_por_ids(self, tema_ids: List[int]) -> List[Tema]:
+        """
+        Obtiene varios temas por ID con una consulta IN (...) por tramo
         
-        if row:
-            return {
-                'id': row[0],
-                'descripcion': row[1],
-                'categoria': row[2],
-                'activo': row[3]
-            }
-        return None
+        Los temas se devuelven en el orden de `tema_ids`; los ids inexistentes
+        se omiten.
+        """
+        ids = list(dict.fromkeys(tema_ids))
+        if not ids:
+            return []
+        
+        def consultar():
+            por_id = {}
+            for tramo, marcadores in self._tramos(ids):
+                for tema in self._consultar(_SQL_TEMAS + f" WHERE id IN ({marcadores})",
+                                            tuple(tramo), registro=Tema):
+                    por_id[tema['id']] = tema
+            return [por_id[tema_id] for tema_id in ids if tema_id in por_id]
+        
+        return self.cache.obtener('temas', ('ids', tuple(ids)), consultar)
     
     def modificar_tema(self, tema_id: int, descripcion: str, categoria: str = "") -> bool:
         """Modifica un tema"""
@@ -158,6 +580,7 @@ class Database:
         affected = cursor.rowcount
         conn.commit()
         conn.close()
+        self.cache.invalidar('temas', 'sugerencias')
         return affected > 0
     
     def eliminar_tema(self, tema_id: int) -> bool:
@@ -168,11 +591,43 @@ class Database:
         affected = cursor.rowcount
         conn.commit()
         conn.close()
+        self.cache.invalidar('temas', 'sugerencias')
         return affected > 0
     
-    def obtener_historial_tema(self, tema_id: int) -> List[Dict]:
-        """Obtiene el historial de un tema"""
+    def eliminar_temas(self, tema_ids: List[int]) -> Dict[int, bool]:
+        """
+        Desactiva varios temas en una sola transacción
+        
+        Returns:
+            Diccionario {tema_id: True si el tema existía}
+        """
+        ids = list(dict.fromkeys(int(i) for i in tema_ids))
+        if not ids:
+            return {}
+        
+        existentes = set()
         conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            for tramo, marcadores in self._tramos(ids):
+                cursor.execute(f"SELECT id FROM temas WHERE id IN ({marcadores})", tramo)
+                existentes.update(fila[0] for fila in cursor.fetchall())
+                cursor.execute(f"UPDATE temas SET activo = 0 WHERE id IN ({marcadores})", tramo)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Error eliminando temas: {e}")
+            return {tema_id: False for tema_id in ids}
+        finally:
+            conn.close()
+        
+        self.cache.invalidar('temas', 'sugerencias')
+        return {tema_id: tema_id in existentes for tema_id in ids}
+    
+    def obtener_historial_tema(self, tema_id: int, incluir_archivo: bool = False) -> List[Dict]:
+        """Obtiene el historial de un tema"""
+        usar_archivo = self._usar_archivo(incluir_archivo)
+        conn = self.get_connection(usar_archivo)
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -182,11 +637,11 @@ class Database:
                 r.sede,
                 r.tipo,
                 od.numero_orden
-            FROM orden_dia od
-            JOIN reuniones r ON od.reunion_id = r.id
+            FROM {orden_dia} od
+            JOIN {reuniones} r ON od.reunion_id = r.id
             WHERE od.tema_id = ?
             ORDER BY r.fecha DESC
-        """, (tema_id,))
+        """.format(**self._tablas_historial(usar_archivo)), (tema_id,))
         
         historial = []
         for row in cursor.fetchall():
@@ -201,22 +656,24 @@ class Database:
         conn.close()
         return historial
     
-    def obtener_estadisticas_tema(self, tema_id: int) -> Dict:
+    def obtener_estadisticas_tema(self, tema_id: int, incluir_archivo: bool = False) -> Dict:
         """Obtiene estadísticas de un tema"""
-        conn = self.get_connection()
+        usar_archivo = self._usar_archivo(incluir_archivo)
+        tablas = self._tablas_historial(usar_archivo)
+        conn = self.get_connection(usar_archivo)
         cursor = conn.cursor()
         
         cursor.execute("""
-            SELECT COUNT(*) FROM orden_dia WHERE tema_id = ?
-        """, (tema_id,))
+            SELECT COUNT(*) FROM {orden_dia} WHERE tema_id = ?
+        """.format(**tablas), (tema_id,))
         cantidad_usos = cursor.fetchone()[0]
         
         cursor.execute("""
             SELECT MIN(r.fecha), MAX(r.fecha)
-            FROM orden_dia od
-            JOIN reuniones r ON od.reunion_id = r.id
+            FROM {orden_dia} od
+            JOIN {reuniones} r ON od.reunion_id = r.id
             WHERE od.tema_id = ?
-        """, (tema_id,))
+        """.format(**tablas), (tema_id,))
         fechas = cursor.fetchone()
         
         conn.close()
@@ -234,42 +691,119 @@ class Database:
         """Agrega un nuevo delegado"""
         conn = self.get_connection()
         cursor = conn.cursor()
+        # Los nuevos van al final del orden
         cursor.execute(
-            "INSERT INTO delegados (titulo, nombre, apellido, distrito, titular) VALUES (?, ?, ?, ?, ?)",
+            """INSERT INTO delegados (titulo, nombre, apellido, distrito, titular, posicion)
+               VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(posicion), 0) + 1 FROM delegados))""",
             (titulo, nombre, apellido, distrito, 1 if titular else 0)
         )
         delegado_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        self.cache.invalidar('delegados')
         return delegado_id
     
-    def obtener_delegados(self, solo_activos: bool = True, solo_titulares: bool = False) -> List[Dict]:
+    def obtener_delegados(self, solo_activos: bool = True, solo_titulares: bool = False,
+                          como_tuplas: bool = False) -> List[Delegado]:
         """Obtiene lista de delegados"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT id, titulo, nombre, apellido, distrito, titular, activo FROM delegados WHERE 1=1"
+        query = _SQL_DELEGADOS + " WHERE 1=1"
         if solo_activos:
             query += " AND activo = 1"
         if solo_titulares:
             query += " AND titular = 1"
-        query += " ORDER BY id"  # Ordenar por ID para mantener orden consistente
+        query += " ORDER BY posicion, id"  # Orden elegido por el usuario (ver reordenar_delegados)
         
-        cursor.execute(query)
-        delegados = []
-        for row in cursor.fetchall():
-            delegados.append({
-                'id': row[0],
-                'titulo': row[1],
-                'nombre': row[2],
-                'apellido': row[3],
-                'distrito': row[4],
-                'titular': row[5],
-                'activo': row[6]
-            })
+        return self.cache.obtener(
+            'delegados', ('lista', solo_activos, solo_titulares, como_tuplas),
+            lambda: self._consultar(query, registro=Delegado, como_tuplas=como_tuplas)
+        )
+    
+    def reordenar_delegados(self, delegado_ids: List[int]) -> bool:
+        """
+        Guarda el orden de los delegados dados en una sola transacción
         
-        conn.close()
-        return delegados
+        Las posiciones que ocupan esos delegados se reparten en el orden de
+        `delegado_ids`, así el resto (por ejemplo, los suplentes cuando se
+        reordenan los titulares) conserva su lugar. Solo se escriben las filas
+        que cambian de posición.
+        """
+        ids = list(dict.fromkeys(delegado_ids))
+        if not ids:
+            return True
+        
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            actuales: Dict[int, int] = {}
+            for tramo, marcadores in self._tramos(ids):
+                cursor.execute(f"SELECT id, COALESCE(posicion, id) FROM delegados "
+                               f"WHERE id IN ({marcadores})", tramo)
+                actuales.update(cursor.fetchall())
+            
+            ids = [delegado_id for delegado_id in ids if delegado_id in actuales]
+            posiciones = sorted(actuales.values())
+            cambios = [(posicion, delegado_id) for delegado_id, posicion in zip(ids, posiciones)
+                       if actuales[delegado_id] != posicion]
+            cursor.executemany("UPDATE delegados SET posicion = ? WHERE id = ?", cambios)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Error reordenando delegados: {e}")
+            return False
+        finally:
+            conn.close()
+        
+        if cambios:
+            self.cache.invalidar('delegados')
+        return True
+    
+    def obtener_delegado(self, delegado_id: int) -> Optional[Delegado]:
+        """Obtiene un delegado por ID (activo o no)"""
+        delegados = self.cache.obtener(
+            'delegados', ('id', delegado_id),
+            lambda: self._consultar(_SQL_DELEGADOS + " WHERE id = ?", (delegado_id,), registro=Delegado)
+        )
+        return delegados[0] if delegados else None
+    
+    def opciones_delegados(self, solo_titulares: bool = True) -> List[Tuple[str, Delegado]]:
+        """
+        Nombres para mostrar (únicos) de los delegados activos, en orden
+        
+        Si dos delegados comparten nombre se agrega el distrito y, si aún
+        coinciden, el ID: "Dr. JUAN PEREZ (Dist. II)".
+        """
+        return self.cache.obtener(
+            'delegados', ('opciones', solo_titulares),
+            lambda: self._nombres_unicos(self.obtener_delegados(solo_titulares=solo_titulares))
+        )
+    
+    def id_delegado_por_nombre(self, nombre: str, solo_titulares: bool = False) -> Optional[int]:
+        """
+        Busca el ID de un delegado activo por su nombre para mostrar
+        
+        Un nombre compartido por varios delegados sin desambiguar no se
+        resuelve (devuelve None) en lugar de elegir uno al azar.
+        """
+        indice = self.cache.obtener(
+            'delegados', ('indice', solo_titulares),
+            lambda: {texto: d['id'] for texto, d in self.opciones_delegados(solo_titulares)}
+        )
+        return indice.get(nombre)
+    
+    @staticmethod
+    def _nombres_unicos(delegados: List[Delegado]) -> List[Tuple[str, Delegado]]:
+        repeticiones = Counter(d.nombre_completo for d in delegados)
+        con_distrito = Counter(f"{d.nombre_completo} ({d.distrito})" for d in delegados)
+        
+        opciones = []
+        for d in delegados:
+            texto = d.nombre_completo
+            if repeticiones[texto] > 1:
+                texto = f"{texto} ({d.distrito})"
+                if con_distrito[texto] > 1:
+                    texto = f"{d.nombre_completo} ({d.distrito}, #{d.id})"
+            opciones.append((texto, d))
+        return opciones
     
     def modificar_delegado(self, delegado_id: int, titulo: str, nombre: str, 
                           apellido: str, distrito: str, titular: bool) -> bool:
@@ -283,6 +817,7 @@ class Database:
         affected = cursor.rowcount
         conn.commit()
         conn.close()
+        self.cache.invalidar('delegados')
         return affected > 0
     
     def eliminar_delegado(self, delegado_id: int) -> bool:
@@ -293,6 +828,7 @@ class Database:
         affected = cursor.rowcount
         conn.commit()
         conn.close()
+        self.cache.invalidar('delegados')
         return affected > 0
     
     # === MÉTODOS PARA REUNIONES ===
@@ -374,126 +910,638 @@ class Database:
     
     # === MÉTODOS PARA REUNIONES ===
     
-    def obtener_reuniones(self) -> List[Dict]:
-        """Obtiene todas las reuniones del historial"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-            SELECT 
-                r.id,
-                r.fecha,
-                r.hora,
-                r.lugar,
-                r.tipo,
-                COUNT(od.id) as cantidad_temas
-            FROM reuniones r
-            LEFT JOIN orden_dia od ON r.id = od.reunion_id
-            GROUP BY r.id
-            ORDER BY r.fecha DESC
-        """)
-        
-        reuniones = []
-        for row in cursor.fetchall():
-            reuniones.append({
-                'id': row[0],
-                'fecha': row[1],
-                'hora': row[2],
-                'lugar': row[3],
-                'tipo': row[4],
-                'cantidad_temas': row[5]
-            })
-        
-        conn.close()
-        return reuniones
+    def obtener_reuniones(self, como_tuplas: bool = False,
+                          incluir_archivo: bool = False) -> List[Reunion]:
+        """Obtiene todas las reuniones del historial (con incluir_archivo, también las archivadas)"""
+        usar_archivo = self._usar_archivo(incluir_archivo)
+        return self._consultar(_SQL_REUNIONES.format(**self._tablas_historial(usar_archivo)),
+                               registro=Reunion, como_tuplas=como_tuplas,
+                               adjuntar_archivo=usar_archivo)
+    
+    def iterar_reuniones(self, como_tuplas: bool = False,
+                         tamaño_lote: int = TAMAÑO_LOTE,
+                         incluir_archivo: bool = False) -> Iterator[Reunion]:
+        """Como obtener_reuniones, pero entrega las reuniones de a una sin armar la lista"""
+        usar_archivo = self._usar_archivo(incluir_archivo)
+        return self._iterar(_SQL_REUNIONES.format(**self._tablas_historial(usar_archivo)),
+                            registro=Reunion, como_tuplas=como_tuplas,
+                            tamaño_lote=tamaño_lote, adjuntar_archivo=usar_archivo)
     
-    def buscar_reuniones(self, termino_busqueda: str) -> List[Dict]:
+    def buscar_reuniones(self, termino_busqueda: str, como_tuplas: bool = False,
+                         incluir_archivo: bool = False) -> List[Reunion]:
         """Busca reuniones por tema o fecha"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Buscar por fecha (YYYY-MM-DD o DD/MM/YYYY)
-        # o por descripción de tema
-        cursor.execute("""
-            SELECT DISTINCT
-                r.id,
-                r.fecha,
-                r.hora,
-                r.lugar,
-                r.tipo,
-                COUNT(od.id) as cantidad_temas
-            FROM reuniones r
-            LEFT JOIN orden_dia od ON r.id = od.reunion_id
-            LEFT JOIN temas t ON od.tema_id = t.id
-            WHERE r.fecha LIKE ? OR t.descripcion LIKE ?
-            GROUP BY r.id
-            ORDER BY r.fecha DESC
-        """, (f"%{termino_busqueda}%", f"%{termino_busqueda}%"))
-        
-        reuniones = []
-        for row in cursor.fetchall():
-            reuniones.append({
-                'id': row[0],
-                'fecha': row[1],
-                'hora': row[2],
-                'lugar': row[3],
-                'tipo': row[4],
-                'cantidad_temas': row[5]
-            })
-        
-        conn.close()
-        return reuniones
+        patron = f"%{termino_busqueda}%"
+        usar_archivo = self._usar_archivo(incluir_archivo)
+        return self._consultar(_SQL_BUSCAR_REUNIONES.format(**self._tablas_historial(usar_archivo)),
+                               (patron, patron), registro=Reunion, como_tuplas=como_tuplas,
+                               adjuntar_archivo=usar_archivo)
+    
+    def iterar_busqueda_reuniones(self, termino_busqueda: str, como_tuplas: bool = False,
+                                  tamaño_lote: int = TAMAÑO_LOTE,
+                                  incluir_archivo: bool = False) -> Iterator[Reunion]:
+        """Como buscar_reuniones, pero entrega las reuniones de a una sin armar la lista"""
+        patron = f"%{termino_busqueda}%"
+        usar_archivo = self._usar_archivo(incluir_archivo)
+        return self._iterar(_SQL_BUSCAR_REUNIONES.format(**self._tablas_historial(usar_archivo)),
+                            (patron, patron), registro=Reunion, como_tuplas=como_tuplas,
+                            tamaño_lote=tamaño_lote, adjuntar_archivo=usar_archivo)
     
-    def obtener_temas_reunion(self, reunion_id: int) -> List[Dict]:
+    def obtener_temas_reunion(self, reunion_id: int, como_tuplas: bool = False,
+                              incluir_archivo: bool = False) -> List[ItemOrden]:
         """Obtiene todos los temas de una reunión específica"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
+        usar_archivo = self._usar_archivo(incluir_archivo)
+        return self._consultar("""
             SELECT 
                 t.id,
                 t.descripcion,
                 t.categoria,
                 od.numero_orden
-            FROM orden_dia od
+            FROM {orden_dia} od
             JOIN temas t ON od.tema_id = t.id
             WHERE od.reunion_id = ?
             ORDER BY od.numero_orden
-        """, (reunion_id,))
+        """.format(**self._tablas_historial(usar_archivo)), (reunion_id,),
+            registro=ItemOrden, como_tuplas=como_tuplas, adjuntar_archivo=usar_archivo)
+
+    def obtener_temas_reuniones(self, reunion_ids: List[int],
+                                incluir_archivo: bool = False) -> Dict[int, List[ItemOrden]]:
+        """
+        Como obtener_temas_reunion para varias reuniones, con una consulta por tramo de ids
+
+        Returns:
+            Diccionario {reunion_id: temas en orden}; las reuniones sin temas no aparecen
+        """
+        usar_archivo = self._usar_archivo(incluir_archivo)
+        consulta = """
+            SELECT od.reunion_id, t.id, t.descripcion, t.categoria, od.numero_orden
+            FROM {orden_dia} od
+            JOIN temas t ON od.tema_id = t.id
+            WHERE od.reunion_id IN ({marcadores})
+            ORDER BY od.reunion_id, od.numero_orden
+        """
+        temas: Dict[int, List[ItemOrden]] = defaultdict(list)
+        for tramo, marcadores in self._tramos(list(reunion_ids)):
+            filas = self._consultar(consulta.format(marcadores=marcadores,
+                                                    **self._tablas_historial(usar_archivo)),
+                                    tuple(tramo), adjuntar_archivo=usar_archivo)
+            for reunion_id, *campos in filas:
+                temas[reunion_id].append(ItemOrden(*campos))
+        return dict(temas)
+
+    def contar_usos_temas(self, incluir_archivo: bool = False) -> Dict[int, int]:
+        """
+        Cantidad de usos de cada tema en una sola consulta
+
+        Da lo mismo que obtener_estadisticas_tema(...)['cantidad_usos'] para
+        todos los temas a la vez; los que nunca se usaron no aparecen.
+        """
+        usar_archivo = self._usar_archivo(incluir_archivo)
+        filas = self._consultar("SELECT tema_id, COUNT(*) FROM {orden_dia} GROUP BY tema_id".format(
+            **self._tablas_historial(usar_archivo)), adjuntar_archivo=usar_archivo)
+        return dict(filas)
+
+    def eliminar_reunion(self, reunion_id: int) -> bool:
+        """Elimina una reunión y su orden del día"""
+        return self.eliminar_reuniones([reunion_id])[reunion_id]
+    
+    def eliminar_reuniones(self, reunion_ids: List[int],
+                           incluir_archivo: bool = False) -> Dict[int, bool]:
+        """
+        Elimina varias reuniones con su orden del día y firmas
         
-        temas = []
-        for row in cursor.fetchall():
-            temas.append({
-                'id': row[0],
-                'descripcion': row[1],
-                'categoria': row[2],
-                'numero_orden': row[3]
-            })
+        Los DELETE se hacen por tramos de IN (...) dentro de una única
+        transacción: si algo falla no se borra ninguna. Con incluir_archivo
+        también se borran del archivo.
         
-        conn.close()
-        return temas
+        Returns:
+            Diccionario {reunion_id: True si la reunión existía y se eliminó}
+        """
+        ids = list(dict.fromkeys(int(i) for i in reunion_ids))
+        if not ids:
+            return {}
+        
+        usar_archivo = self._usar_archivo(incluir_archivo)
+        esquemas = ('main', 'archivo') if usar_archivo else ('main',)
+        existentes = set()
+        conn = self.get_connection(usar_archivo)
+        try:
+            cursor = conn.cursor()
+            # Antes de borrar: las reuniones de la base activa dejan de contar en las
+            # sugerencias (las archivadas ya no contaban; _acumular_sugerencias solo lee main)
+            self._acumular_sugerencias(cursor, ids, -1)
+            for tramo, marcadores in self._tramos(ids):
+                for esquema in esquemas:
+                    cursor.execute(f"SELECT id FROM {esquema}.reuniones WHERE id IN ({marcadores})", tramo)
+                    existentes.update(fila[0] for fila in cursor.fetchall())
+                    cursor.execute(f"DELETE FROM {esquema}.orden_dia WHERE reunion_id IN ({marcadores})", tramo)
+                    cursor.execute(f"DELETE FROM {esquema}.firmas WHERE reunion_id IN ({marcadores})", tramo)
+                    cursor.execute(f"DELETE FROM {esquema}.reuniones WHERE id IN ({marcadores})", tramo)
+                # Las instantáneas están siempre en la base activa
+                borradas = [reunion_id for reunion_id in tramo if reunion_id in existentes]
+                if borradas:
+                    cursor.execute(
+                        f"DELETE FROM main.instantaneas WHERE reunion_id IN ({', '.join('?' * len(borradas))})",
+                        borradas
+                    )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Error eliminando reuniones: {e}")
+            return {reunion_id: False for reunion_id in ids}
+        finally:
+            conn.close()
+        
+        self.cache.invalidar('sugerencias')
+        return {reunion_id: reunion_id in existentes for reunion_id in ids}
     
-    def eliminar_reunion(self, reunion_id: int) -> bool:
-        """Elimina una reunión y su orden del día"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    # === ARCHIVO DE REUNIONES ===
+    
+    def _usar_archivo(self, incluir_archivo: bool) -> bool:
+        """Solo se adjunta el archivo si se pidió y ya existe"""
+        return incluir_archivo and os.path.exists(self.ruta_archivo)
+    
+    @staticmethod
+    def _tablas_historial(usar_archivo: bool) -> Dict[str, str]:
+        return _TABLAS_CON_ARCHIVO if usar_archivo else _TABLAS_ACTIVAS
+    
+    def _crear_tablas_archivo(self, cursor: sqlite3.Cursor):
+        """Crea en el archivo las tablas que falten con la misma definición que en la base"""
+        for tabla in _TABLAS_ARCHIVABLES:
+            cursor.execute("SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = ?",
+                           (tabla,))
+            definicion = cursor.fetchone()[0]
+            cursor.execute(re.sub(r"^CREATE TABLE\s+\"?\w+\"?",
+                                  f"CREATE TABLE IF NOT EXISTS archivo.{tabla}", definicion))
+        cursor.execute("CREATE INDEX IF NOT EXISTS archivo.idx_orden_dia_reunion ON orden_dia (reunion_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS archivo.idx_firmas_reunion ON firmas (reunion_id)")
+    
+    def archivar_reuniones(self, antes_de: str) -> int:
+        """
+        Mueve al archivo las reuniones creadas antes de una fecha
+        
+        Se usa fecha_creacion (ISO) porque `fecha` es texto libre. Las reuniones
+        pasan con su orden del día y firmas, conservando los ids. Con WAL la
+        transacción es atómica en cada archivo pero no entre ambos: si se corta
+        a mitad, repetir la operación completa el movimiento.
+        
+        Args:
+            antes_de: Fecha de corte YYYY-MM-DD (ver fecha_corte_archivo)
         
+        Returns:
+            Cantidad de reuniones archivadas
+        """
+        conn = self.get_connection(adjuntar_archivo=True)
         try:
-            # Primero eliminar el orden del día
-            cursor.execute("DELETE FROM orden_dia WHERE reunion_id = ?", (reunion_id,))
+            cursor = conn.cursor()
+            self._crear_tablas_archivo(cursor)
             
-            # Luego eliminar las firmas
-            cursor.execute("DELETE FROM firmas WHERE reunion_id = ?", (reunion_id,))
+            cursor.execute("CREATE TEMP TABLE a_archivar (id INTEGER PRIMARY KEY)")
+            cursor.execute("INSERT INTO a_archivar SELECT id FROM main.reuniones WHERE fecha_creacion < ?",
+                           (antes_de,))
+            cantidad = cursor.rowcount
+            
+            # Las sugerencias cuentan solo la base activa (como reconstruir_sugerencias):
+            # se restan antes de que el orden del día salga de main
+            archivadas = [fila[0] for fila in cursor.execute("SELECT id FROM a_archivar").fetchall()]
+            self._acumular_sugerencias(cursor, archivadas, -1)
             
-            # Finalmente eliminar la reunión
-            cursor.execute("DELETE FROM reuniones WHERE id = ?", (reunion_id,))
+            for tabla in _TABLAS_ARCHIVABLES:
+                columnas = ", ".join(fila[1] for fila in
+                                     cursor.execute(f"PRAGMA archivo.table_info({tabla})").fetchall())
+                filtro = "id" if tabla == 'reuniones' else "reunion_id"
+                cursor.execute(f"INSERT OR REPLACE INTO archivo.{tabla} ({columnas}) "
+                               f"SELECT {columnas} FROM main.{tabla} "
+                               f"WHERE {filtro} IN (SELECT id FROM a_archivar)")
+            for tabla in reversed(_TABLAS_ARCHIVABLES):
+                filtro = "id" if tabla == 'reuniones' else "reunion_id"
+                cursor.execute(f"DELETE FROM main.{tabla} WHERE {filtro} IN (SELECT id FROM a_archivar)")
             
+            conn.commit()
+            print(f"[OK] {cantidad} reunión(es) archivadas en {self.ruta_archivo}")
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        self.cache.invalidar('sugerencias')
+        return cantidad
+    
+    # === PLANTILLAS DE ORDEN DEL DÍA ===
+    
+    def guardar_plantilla(self, nombre: str, tema_ids: List[int]) -> int:
+        """
+        Guarda una plantilla con los temas en el orden dado
+        
+        Si ya existe una plantilla con ese nombre se reemplazan sus temas.
+        
+        Returns:
+            ID de la plantilla
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("INSERT OR IGNORE INTO plantillas (nombre) VALUES (?)", (nombre,))
+            plantilla_id = cursor.execute("SELECT id FROM plantillas WHERE nombre = ?",
+                                          (nombre,)).fetchone()[0]
+            cursor.execute("DELETE FROM plantilla_items WHERE plantilla_id = ?", (plantilla_id,))
+            cursor.executemany(
+                "INSERT INTO plantilla_items (plantilla_id, numero_orden, tema_id) VALUES (?, ?, ?)",
+                [(plantilla_id, i, tema_id) for i, tema_id in enumerate(tema_ids, 1)]
+            )
+            conn.commit()
+            return plantilla_id
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def obtener_plantillas(self) -> List[Dict]:
+        """Plantillas con la cantidad de temas de cada una"""
+        filas = self._consultar("""
+            SELECT p.id, p.nombre, COUNT(pi.tema_id)
+            FROM plantillas p
+            LEFT JOIN plantilla_items pi ON pi.plantilla_id = p.id
+            GROUP BY p.id
+            ORDER BY p.nombre
+        """)
+        return [{'id': f[0], 'nombre': f[1], 'cantidad_temas': f[2]} for f in filas]
+    
+    def obtener_temas_plantilla(self, plantilla_id: int, como_tuplas: bool = False) -> List[ItemOrden]:
+        """Temas activos de una plantilla en su orden, en una sola consulta"""
+        return self._consultar("""
+            SELECT t.id, t.descripcion, t.categoria, pi.numero_orden
+            FROM plantilla_items pi
+            JOIN temas t ON t.id = pi.tema_id
+            WHERE pi.plantilla_id = ? AND t.activo = 1
+            ORDER BY pi.numero_orden
+        """, (plantilla_id,), registro=ItemOrden, como_tuplas=como_tuplas)
+    
+    def eliminar_plantilla(self, plantilla_id: int) -> bool:
+        """Elimina una plantilla y sus temas"""
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM plantilla_items WHERE plantilla_id = ?", (plantilla_id,))
+            cursor.execute("DELETE FROM plantillas WHERE id = ?", (plantilla_id,))
             affected = cursor.rowcount
             conn.commit()
             return affected > 0
+        finally:
+            conn.close()
+    
+    def id_ultima_reunion(self) -> Optional[int]:
+        """ID de la última reunión guardada (los ids crecen con cada alta)"""
+        return self._consultar("SELECT MAX(id) FROM reuniones")[0][0]
+    
+    # === INSTANTÁNEAS DE REUNIONES ===
+    
+    def guardar_instantanea(self, reunion_id: int, datos: Dict) -> int:
+        """
+        Guarda una versión nueva e inmutable de los datos de una reunión
+        
+        `datos` es el dict con que se generó el documento; se guarda como JSON
+        comprimido con zlib junto con el contenido del logo, así el documento
+        puede volver a generarse igual aunque después cambien los temas o el
+        archivo del logo.
+        
+        El logo es datos['logo_bytes'] (los bytes con que se generó, None si no
+        tenía); solo si esa clave falta se lee el archivo de 'imagen_logo'.
+        
+        Returns:
+            Número de versión guardada (1 para la primera)
+        """
+        datos = dict(datos)
+        if 'logo_bytes' in datos:
+            logo = datos.pop('logo_bytes')
+        else:
+            logo = None
+            if datos.get('imagen_logo') and os.path.exists(datos['imagen_logo']):
+                with open(datos['imagen_logo'], 'rb') as f:
+                    logo = f.read()
+        logo_sha256 = hashlib.sha256(logo).hexdigest() if logo else None
+        comprimido = zlib.compress(json.dumps(datos, ensure_ascii=False).encode('utf-8'))
+        
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            if logo:
+                cursor.execute("INSERT OR IGNORE INTO logos (sha256, contenido) VALUES (?, ?)",
+                               (logo_sha256, logo))
+            version = cursor.execute(
+                "SELECT COALESCE(MAX(version), 0) + 1 FROM instantaneas WHERE reunion_id = ?",
+                (reunion_id,)
+            ).fetchone()[0]
+            cursor.execute(
+                """INSERT INTO instantaneas (reunion_id, version, datos, logo_sha256, fecha_reunion)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (reunion_id, version, comprimido, logo_sha256, fecha_reunion_iso(datos.get('fecha')))
+            )
+            conn.commit()
+            return version
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def obtener_instantanea(self, reunion_id: int, version: Optional[int] = None) -> Optional[Dict]:
+        """
+        Datos guardados de una reunión (la última versión si no se indica)
+        
+        El logo vuelve en 'logo_bytes', listo para DocumentGenerator, en la
+        misma consulta.
+        
+        Returns:
+            El dict de datos, o None si no hay instantánea
+        """
+        filtro = "i.version = ?" if version is not None else \
+            "i.version = (SELECT MAX(version) FROM instantaneas WHERE reunion_id = i.reunion_id)"
+        parametros = (reunion_id, version) if version is not None else (reunion_id,)
+        filas = self._consultar(f"""
+            SELECT i.datos, l.contenido
+            FROM instantaneas i
+            LEFT JOIN logos l ON l.sha256 = i.logo_sha256
+            WHERE i.reunion_id = ? AND {filtro}
+        """, parametros)
+        if not filas:
+            return None
+        return self.descomprimir_instantanea(*filas[0])
+    
+    @staticmethod
+    def descomprimir_instantanea(datos: bytes, logo: Optional[bytes]) -> Dict:
+        """
+        Reconstruye el dict de datos desde las columnas datos y logos.contenido
+        
+        Se quita 'imagen_logo': el documento usa solo el logo guardado
+        ('logo_bytes', None si no tenía), no el archivo que haya hoy en esa ruta.
+        """
+        resultado = json.loads(zlib.decompress(datos).decode('utf-8'))
+        resultado.pop('imagen_logo', None)
+        resultado['logo_bytes'] = logo or None
+        return resultado
+    
+    def obtener_versiones_reunion(self, reunion_id: int) -> List[Dict]:
+        """Versiones guardadas de una reunión, de la más vieja a la más nueva"""
+        filas = self._consultar("""
+            SELECT version, fecha_creacion, LENGTH(datos)
+            FROM instantaneas
+            WHERE reunion_id = ?
+            ORDER BY version
+        """, (reunion_id,))
+        return [{'version': f[0], 'fecha_creacion': f[1], 'bytes': f[2]} for f in filas]
+    
+    @staticmethod
+    def _filtro_ultimas_instantaneas(desde: Optional[str], hasta: Optional[str]) -> Tuple[str, tuple]:
+        """
+        Última versión de cada reunión, filtrada por la fecha en que se realiza
+        
+        Se usa fecha_reunion de esa versión (la fecha escrita en el documento,
+        no la de su generación): si se corrigió la fecha, vale la corregida.
+        Las reuniones cuya fecha no se pudo interpretar solo salen sin filtro.
+        """
+        condiciones = []
+        parametros: tuple = ()
+        if desde:
+            condiciones.append("i.fecha_reunion >= ?")
+            parametros += (desde,)
+        if hasta:
+            condiciones.append("i.fecha_reunion < ?")
+            parametros += (hasta,)
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        return f"""
+            WITH u AS (
+                SELECT reunion_id, MAX(version) AS version
+                FROM instantaneas
+                GROUP BY reunion_id
+            )
+            SELECT {{columnas}}
+            FROM u
+            JOIN instantaneas i ON i.reunion_id = u.reunion_id AND i.version = u.version
+            {where}
+        """, parametros
+    
+    def contar_instantaneas(self, desde: Optional[str] = None, hasta: Optional[str] = None) -> int:
+        """Cantidad de reuniones con instantánea en el período [desde, hasta)"""
+        query, parametros = self._filtro_ultimas_instantaneas(desde, hasta)
+        return self._consultar(query.format(columnas="COUNT(*)"), parametros)[0][0]
+    
+    def iterar_instantaneas(self, desde: Optional[str] = None, hasta: Optional[str] = None,
+                            tamaño_lote: int = 50) -> Iterator[Tuple]:
+        """
+        Recorre la última versión de cada reunión del período [desde, hasta)
+        
+        Entrega tuplas (reunion_id, version, fecha_reunion, datos comprimidos,
+        logo_sha256) en orden de reunión, sin descomprimir ni traer el logo:
+        el contenido de los logos se pide una sola vez con obtener_logos.
+        """
+        query, parametros = self._filtro_ultimas_instantaneas(desde, hasta)
+        query = query.format(columnas="u.reunion_id, u.version, i.fecha_reunion, i.datos, i.logo_sha256")
+        return self._iterar(query + " ORDER BY u.reunion_id", parametros, tamaño_lote=tamaño_lote)
+    
+    def obtener_logos(self, desde: Optional[str] = None, hasta: Optional[str] = None) -> Dict[str, bytes]:
+        """Contenido de los logos que usan las instantáneas del período, por sha256"""
+        query, parametros = self._filtro_ultimas_instantaneas(desde, hasta)
+        query = query.format(columnas="DISTINCT i.logo_sha256")
+        return dict(self._consultar(f"""
+            SELECT sha256, contenido FROM logos WHERE sha256 IN ({query})
+        """, parametros))
+    
+    # === BORRADOR DE LA REUNIÓN ===
+    
+    def guardar_borrador(self, cambios: Dict[str, object]) -> bool:
+        """
+        Guarda los campos del borrador que cambiaron (valores serializables a JSON)
+        
+        Se escriben solo las claves recibidas; el resto del borrador queda igual.
+        """
+        if not cambios:
+            return True
+        conn = self.get_connection()
+        try:
+            conn.executemany("""
+                INSERT INTO borrador (campo, valor) VALUES (?, ?)
+                ON CONFLICT (campo) DO UPDATE SET valor = excluded.valor
+            """, [(campo, json.dumps(valor, ensure_ascii=False)) for campo, valor in cambios.items()])
+            conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            print(f"Error guardando borrador: {e}")
+            return False
+        finally:
+            conn.close()
+    
+    def limpiar_borrador(self) -> bool:
+        """Borra el borrador (la reunión ya se guardó)"""
+        conn = self.get_connection()
+        try:
+            conn.execute("DELETE FROM borrador")
+            conn.commit()
+            return True
         except Exception as e:
             conn.rollback()
-            print(f"Error eliminando reunión: {e}")
+            print(f"Error limpiando borrador: {e}")
             return False
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
+    
+    def obtener_borrador(self) -> Dict[str, object]:
+        """Campos guardados del borrador (vacío si no hay)"""
+        return {campo: json.loads(valor)
+                for campo, valor in self._consultar("SELECT campo, valor FROM borrador")}
+    
+    # === SUGERENCIAS DE TEMAS ===
+    
+    @staticmethod
+    def _peso_reciente(fecha_creacion: Optional[str]) -> float:
+        """Peso de una reunión según su antigüedad (ver VIDA_MEDIA_SUGERENCIAS_DIAS)"""
+        try:
+            fecha = datetime.fromisoformat(fecha_creacion) if fecha_creacion else datetime.now()
+        except ValueError:
+            fecha = datetime.now()
+        dias = (fecha - _REFERENCIA_SUGERENCIAS).total_seconds() / 86400
+        return 2.0 ** (dias / VIDA_MEDIA_SUGERENCIAS_DIAS)
+    
+    def _acumular_sugerencias(self, cursor: sqlite3.Cursor, reunion_ids: List[int], signo: int):
+        """
+        Suma (signo=1) o resta (signo=-1) las reuniones a la co-ocurrencia y a
+        las frecuencias, dentro de la transacción del llamador
+        
+        Solo cuentan las reuniones de la base activa: se archivan restándolas
+        (archivar_reuniones) y las ids que ya están en el archivo se ignoran.
+        """
+        temas_por_reunion: Dict[int, set] = defaultdict(set)
+        fechas: Dict[int, str] = {}
+        for tramo, marcadores in self._tramos(list(reunion_ids)):
+            cursor.execute(f"""
+                SELECT od.reunion_id, od.tema_id, r.fecha_creacion
+                FROM main.orden_dia od
+                JOIN main.reuniones r ON r.id = od.reunion_id
+                WHERE od.reunion_id IN ({marcadores})
+            """, tramo)
+            for reunion_id, tema_id, fecha_creacion in cursor.fetchall():
+                temas_por_reunion[reunion_id].add(tema_id)
+                fechas[reunion_id] = fecha_creacion
+        
+        pares: Counter = Counter()
+        usos: Counter = Counter()
+        puntajes: Dict[int, float] = defaultdict(float)
+        for reunion_id, temas in temas_por_reunion.items():
+            peso = self._peso_reciente(fechas[reunion_id])
+            for a in temas:
+                usos[a] += 1
+                puntajes[a] += peso
+                pares.update((a, b) for b in temas if b != a)
+        
+        cursor.executemany("""
+            INSERT INTO main.coocurrencia_temas (tema_a, tema_b, cantidad) VALUES (?, ?, ?)
+            ON CONFLICT (tema_a, tema_b) DO UPDATE SET cantidad = cantidad + excluded.cantidad
+        """, ((a, b, signo * n) for (a, b), n in pares.items()))
+        cursor.executemany("""
+            INSERT INTO main.frecuencia_temas (tema_id, usos, puntaje) VALUES (?, ?, ?)
+            ON CONFLICT (tema_id) DO UPDATE SET
+                usos = usos + excluded.usos, puntaje = puntaje + excluded.puntaje
+        """, ((t, signo * n, signo * puntajes[t]) for t, n in usos.items()))
+        if signo < 0:
+            cursor.execute("DELETE FROM main.coocurrencia_temas WHERE cantidad <= 0")
+            cursor.execute("DELETE FROM main.frecuencia_temas WHERE usos <= 0")
+    
+    def registrar_reunion_en_sugerencias(self, reunion_id: int):
+        """Suma a las sugerencias el orden del día de una reunión recién guardada"""
+        conn = self.get_connection()
+        try:
+            self._acumular_sugerencias(conn.cursor(), [reunion_id], 1)
+            conn.commit()
+        finally:
+            conn.close()
+        self.cache.invalidar('sugerencias')
+    
+    def reconstruir_sugerencias(self) -> int:
+        """
+        Recalcula co-ocurrencias y frecuencias desde todo el historial activo
+        
+        Las reuniones archivadas no cuentan, igual que en las actualizaciones
+        incrementales.
+        
+        Returns:
+            Cantidad de reuniones procesadas
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM coocurrencia_temas")
+            cursor.execute("DELETE FROM frecuencia_temas")
+            ids = [fila[0] for fila in cursor.execute("SELECT id FROM reuniones").fetchall()]
+            self._acumular_sugerencias(cursor, ids, 1)
+            conn.commit()
+        finally:
+            conn.close()
+        self.cache.invalidar('sugerencias')
+        return len(ids)
+    
+    def sugerir_temas(self, tema_ids: List[int], limite: int = 10) -> List[Tuple[Tema, float]]:
+        """
+        Temas activos que suelen tratarse junto con los del orden actual
+        
+        El puntaje suma, para cada tema del orden, la fracción de sus reuniones
+        en las que también apareció el candidato, más PESO_RECENCIA por la
+        frecuencia reciente del candidato (0 a 1). Sin temas en el orden, se
+        ordena solo por frecuencia reciente.
+        
+        Returns:
+            Lista de (tema, puntaje) de mayor a menor puntaje
+        """
+        actuales = tuple(sorted(set(int(i) for i in tema_ids)))
+        return self.cache.obtener('sugerencias', (actuales, limite),
+                                  lambda: self._calcular_sugerencias(actuales, limite))
+    
+    def _calcular_sugerencias(self, actuales: Tuple[int, ...], limite: int) -> List[Tuple[Tema, float]]:
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            puntajes: Dict[int, float] = defaultdict(float)
+            
+            for tramo, marcadores in self._tramos(list(actuales)):
+                cursor.execute(f"""
+                    SELECT c.tema_b, SUM(CAST(c.cantidad AS REAL) / f.usos)
+                    FROM coocurrencia_temas c
+                    JOIN frecuencia_temas f ON f.tema_id = c.tema_a
+                    WHERE c.tema_a IN ({marcadores})
+                    GROUP BY c.tema_b
+                """, tramo)
+                for tema_id, puntaje in cursor.fetchall():
+                    puntajes[tema_id] += puntaje
+            
+            maximo = cursor.execute("SELECT MAX(puntaje) FROM frecuencia_temas").fetchone()[0]
+            if maximo:
+                # Con temas en el orden solo se ordenan los candidatos co-ocurrentes;
+                # sin temas, se toma la frecuencia reciente de los más usados
+                if actuales:
+                    candidatos = [t for t in puntajes if t not in actuales]
+                    filas = []
+                    for tramo, marcadores in self._tramos(candidatos):
+                        filas += cursor.execute(
+                            f"SELECT tema_id, puntaje FROM frecuencia_temas WHERE tema_id IN ({marcadores})",
+                            tramo).fetchall()
+                else:
+                    filas = cursor.execute(
+                        "SELECT tema_id, puntaje FROM frecuencia_temas ORDER BY puntaje DESC LIMIT ?",
+                        (limite * 2,)).fetchall()
+                for tema_id, puntaje in filas:
+                    puntajes[tema_id] += PESO_RECENCIA * puntaje / maximo
+            
+            for tema_id in actuales:
+                puntajes.pop(tema_id, None)
+            
+            # Se piden algunos de más por si hay temas desactivados entre los primeros
+            ranking = sorted(puntajes.items(), key=lambda item: item[1], reverse=True)[:limite * 2]
+            temas = {}
+            for tramo, marcadores in self._tramos([tema_id for tema_id, _ in ranking]):
+                cursor.row_factory = Tema.fabrica
+                cursor.execute(f"{_SQL_TEMAS} WHERE activo = 1 AND id IN ({marcadores})", tramo)
+                temas.update((tema['id'], tema) for tema in cursor.fetchall())
+            return [(temas[tema_id], puntaje) for tema_id, puntaje in ranking
+                    if tema_id in temas][:limite]
+        finally:
+            conn.close()
@@ -0,0 +1,76 @@
+"""
+Acceso a la base fuera del hilo de la interfaz
+
+Un único hilo ejecuta en orden los pedidos de una cola y entrega el resultado
+en un Future. La interfaz nunca espera al hilo: revisa los futures con
+`after` (ver MainController._en_segundo_plano).
+
+La misma clase da un hilo propio a trabajos que no deben esperar detrás de
+las consultas (por ejemplo, la vista previa del PDF).
+"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Callable
+
+
+class DatabaseAsincrona:
+    """
+    Fachada de Database que devuelve Futures
+
+    `asincrona.obtener_reuniones(...)` encola la llamada y devuelve un Future;
+    `enviar(funcion, ...)` encola cualquier función (por ejemplo, una que arme
+    las filas de una tabla con varias consultas).
+
+    Con `perfilador` asignado, cada pedido se perfila como parte de la acción
+    de la interfaz que lo envió (ver Perfilador.continuar).
+    """
+
+    def __init__(self, db, nombre: str = "base-de-datos"):
+        self.db = db
+        self.perfilador = None
+        self._cola: "queue.Queue" = queue.Queue()
+        self._hilo = threading.Thread(target=self._procesar, name=nombre, daemon=True)
+        self._hilo.start()
+
+    def enviar(self, funcion: Callable, *args, **kwargs) -> Future:
+        """Encola funcion(*args, **kwargs) para el hilo de la base"""
+        futuro = Future()
+        if self.perfilador is not None:
+            funcion = self.perfilador.continuar(self.perfilador.capturar(), funcion,
+                                                f"[{self._hilo.name}]")
+        self._cola.put((futuro, funcion, args, kwargs))
+        return futuro
+
+    def __getattr__(self, nombre: str):
+        metodo = getattr(self.db, nombre)
+        if not callable(metodo):
+            return metodo
+
+        def encolar(*args, **kwargs) -> Future:
+            return self.enviar(metodo, *args, **kwargs)
+        return encolar
+
+    def pendientes(self) -> int:
+        """Pedidos en la cola sin empezar"""
+        return self._cola.qsize()
+
+    def cerrar(self, timeout: float = 5.0):
+        """Termina el hilo después de los pedidos ya encolados"""
+        self._cola.put(None)
+        self._hilo.join(timeout)
+
+    def _procesar(self):
+        while True:
+            pedido = self._cola.get()
+            if pedido is None:
+                break
+            futuro, funcion, args, kwargs = pedido
+            # Un pedido reemplazado por otro más nuevo se cancela antes de empezar
+            if not futuro.set_running_or_notify_cancel():
+                continue
+            try:
+                futuro.set_result(funcion(*args, **kwargs))
+            except BaseException as e:
+                futuro.set_exception(e)
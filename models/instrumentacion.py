@@ -0,0 +1,246 @@
+"""
+Instrumentación de consultas SQL
+Registra cada sentencia normalizada con cantidad de llamadas, latencias y filas
+"""
+
+import math
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional
+
+
+_RE_CADENAS = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMEROS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_LISTAS_IN = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_RE_ESPACIOS = re.compile(r"\s+")
+
+
+def normalizar_sql(sql: str) -> str:
+    """
+    Normaliza una sentencia para agrupar ejecuciones equivalentes
+
+    Colapsa espacios, reemplaza literales por '?' y listas IN por '(...)'.
+    """
+    sql = _RE_CADENAS.sub('?', sql)
+    sql = _RE_NUMEROS.sub('?', sql)
+    sql = _RE_ESPACIOS.sub(' ', sql).strip()
+    sql = _RE_LISTAS_IN.sub('(...)', sql)
+    return sql
+
+
+class HistogramaLatencia:
+    """Histograma logarítmico de latencias (memoria acotada)"""
+
+    # Cada cubeta cubre un 20% más que la anterior: error relativo < 10%
+    FACTOR = 1.2
+
+    def __init__(self):
+        self.cubetas: Dict[int, int] = {}
+        self.cantidad = 0
+        self.minimo = math.inf
+        self.maximo = 0.0
+
+    def registrar(self, segundos: float):
+        microsegundos = max(segundos * 1_000_000, 1.0)
+        indice = int(math.log(microsegundos, self.FACTOR))
+        self.cubetas[indice] = self.cubetas.get(indice, 0) + 1
+        self.cantidad += 1
+        self.minimo = min(self.minimo, segundos)
+        self.maximo = max(self.maximo, segundos)
+
+    def percentil(self, p: float) -> float:
+        """Devuelve el percentil p (0-100) en segundos"""
+        if not self.cantidad:
+            return 0.0
+
+        objetivo = math.ceil(self.cantidad * p / 100)
+        acumulado = 0
+        for indice in sorted(self.cubetas):
+            acumulado += self.cubetas[indice]
+            if acumulado >= objetivo:
+                # Punto medio geométrico de la cubeta, acotado al rango observado
+                valor = self.FACTOR ** (indice + 0.5) / 1_000_000
+                return min(max(valor, self.minimo), self.maximo)
+        return self.maximo
+
+
+class EstadisticaConsulta:
+    """Acumulado de una sentencia normalizada"""
+
+    __slots__ = ('sql', 'llamadas', 'total', 'filas', 'histograma')
+
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.llamadas = 0
+        self.total = 0.0
+        self.filas = 0
+        self.histograma = HistogramaLatencia()
+
+
+class RegistroConsultas:
+    """Agrega las estadísticas de todas las sentencias ejecutadas"""
+
+    def __init__(self):
+        self._estadisticas: Dict[str, EstadisticaConsulta] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, sql: str, segundos: float, filas: int):
+        """Registra una ejecución completa de la sentencia"""
+        clave = normalizar_sql(sql)
+        with self._lock:
+            estadistica = self._estadisticas.get(clave)
+            if estadistica is None:
+                estadistica = self._estadisticas[clave] = EstadisticaConsulta(clave)
+            estadistica.llamadas += 1
+            estadistica.total += segundos
+            estadistica.filas += filas
+            estadistica.histograma.registrar(segundos)
+
+    def reiniciar(self):
+        """Descarta todas las estadísticas acumuladas"""
+        with self._lock:
+            self._estadisticas.clear()
+
+    def informe(self, orden: str = 'total_ms') -> List[Dict]:
+        """
+        Devuelve una fila por sentencia normalizada
+
+        Args:
+            orden: Campo por el que ordenar de mayor a menor
+                   ('total_ms', 'llamadas', 'p99_ms', 'filas')
+        """
+        with self._lock:
+            filas = [{
+                'sql': e.sql,
+                'llamadas': e.llamadas,
+                'total_ms': e.total * 1000,
+                'p50_ms': e.histograma.percentil(50) * 1000,
+                'p99_ms': e.histograma.percentil(99) * 1000,
+                'max_ms': e.histograma.maximo * 1000,
+                'filas': e.filas,
+            } for e in self._estadisticas.values()]
+        filas.sort(key=lambda f: f[orden], reverse=True)
+        return filas
+
+    def formatear_informe(self, limite: Optional[int] = 20, ancho_sql: int = 70) -> str:
+        """Informe en texto plano con columnas alineadas"""
+        filas = self.informe()
+        if not filas:
+            return "No se registraron consultas."
+
+        total_llamadas = sum(f['llamadas'] for f in filas)
+        total_ms = sum(f['total_ms'] for f in filas)
+
+        lineas = [
+            f"{len(filas)} sentencias distintas, {total_llamadas} ejecuciones, {total_ms:.1f} ms en total",
+            "",
+            f"{'Llamadas':>8} {'Total ms':>10} {'p50 ms':>8} {'p99 ms':>8} {'Filas':>8}  Sentencia",
+            "-" * (48 + ancho_sql),
+        ]
+        for f in filas[:limite]:
+            sql = f['sql'] if len(f['sql']) <= ancho_sql else f['sql'][:ancho_sql - 3] + "..."
+            lineas.append(
+                f"{f['llamadas']:>8} {f['total_ms']:>10.2f} {f['p50_ms']:>8.2f} "
+                f"{f['p99_ms']:>8.2f} {f['filas']:>8}  {sql}"
+            )
+        return "\n".join(lineas)
+
+
+class CursorInstrumentado(sqlite3.Cursor):
+    """
+    Cursor que mide cada sentencia
+
+    El tiempo de una sentencia incluye su ejecución y la lectura de sus filas,
+    y se registra al ejecutar la siguiente sentencia o al cerrar la conexión.
+    """
+
+    def _iniciar_medicion(self, sql: str):
+        self._cerrar_medicion()
+        self._sql_actual = sql
+        self._tiempo_actual = 0.0
+        self._filas_actuales = 0
+
+    def _cerrar_medicion(self):
+        sql = getattr(self, '_sql_actual', None)
+        if sql is None:
+            return
+        self._sql_actual = None
+        registro = self.connection.registro
+        if registro is not None:
+            filas = self._filas_actuales
+            if not filas and self.rowcount > 0:
+                filas = self.rowcount
+            registro.registrar(sql, self._tiempo_actual, filas)
+
+    def _medir(self, funcion, *args):
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args)
+        finally:
+            if getattr(self, '_sql_actual', None) is not None:
+                self._tiempo_actual += time.perf_counter() - inicio
+
+    def execute(self, sql, parameters=()):
+        self._iniciar_medicion(sql)
+        return self._medir(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._iniciar_medicion(sql)
+        return self._medir(super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        fila = self._medir(super().fetchone)
+        if fila is not None and getattr(self, '_sql_actual', None) is not None:
+            self._filas_actuales += 1
+        return fila
+
+    def fetchmany(self, size=None):
+        filas = self._medir(super().fetchmany, size if size is not None else self.arraysize)
+        if getattr(self, '_sql_actual', None) is not None:
+            self._filas_actuales += len(filas)
+        return filas
+
+    def fetchall(self):
+        filas = self._medir(super().fetchall)
+        if getattr(self, '_sql_actual', None) is not None:
+            self._filas_actuales += len(filas)
+        return filas
+
+    def __next__(self):
+        fila = self._medir(super().__next__)
+        if getattr(self, '_sql_actual', None) is not None:
+            self._filas_actuales += 1
+        return fila
+
+    def close(self):
+        self._cerrar_medicion()
+        super().close()
+
+
+class ConexionInstrumentada(sqlite3.Connection):
+    """Conexión cuyos cursores registran sus sentencias en un RegistroConsultas"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.registro: Optional[RegistroConsultas] = None
+        self._cursores = weakref.WeakSet()
+
+    def cursor(self, factory=CursorInstrumentado):
+        cursor = super().cursor(factory)
+        if isinstance(cursor, CursorInstrumentado):
+            self._cursores.add(cursor)
+        return cursor
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def close(self):
+        for cursor in list(self._cursores):
+            cursor._cerrar_medicion()
+        super().close()
@@ -0,0 +1,174 @@
+"""
+Modelo del orden del día que se arma en la pestaña de reunión
+
+La lista avisa a sus suscriptores qué tramo cambió en lugar de pedir que se
+redibuje todo: subir o bajar un tema toca dos líneas, mover un bloque solo
+las líneas entre el origen y el destino. El número de orden no se guarda en
+los ítems, sale de la posición (ver como_lista).
+"""
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Eventos que reciben los suscriptores: funcion(evento, inicio, cantidad)
+#   'insertar'  -> se agregaron `cantidad` ítems a partir de `inicio`
+#   'eliminar'  -> se quitaron `cantidad` ítems a partir de `inicio`
+#   'cambiar'   -> cambió el contenido de las posiciones [inicio, inicio + cantidad),
+#                  sin cambiar el largo (reordenamientos)
+#   'reemplazar' -> cambió toda la lista
+INSERTAR = 'insertar'
+ELIMINAR = 'eliminar'
+CAMBIAR = 'cambiar'
+REEMPLAZAR = 'reemplazar'
+
+
+class OrdenDelDia:
+    """Lista ordenada de temas ({'tema_id', 'descripcion'}) con eventos de cambio"""
+
+    def __init__(self, items: Iterable[Dict] = ()):
+        self._items: List[Dict] = [self._item(i) for i in items]
+        self._suscriptores: List[Callable[[str, int, int], None]] = []
+
+    @staticmethod
+    def _item(tema: Dict) -> Dict:
+        # Acepta temas de la base ('id') o ítems ya armados ('tema_id')
+        tema_id = tema['tema_id'] if 'tema_id' in tema.keys() else tema['id']
+        return {'tema_id': tema_id, 'descripcion': tema['descripcion']}
+
+    # --- suscripción ---
+
+    def suscribir(self, funcion: Callable[[str, int, int], None]):
+        self._suscriptores.append(funcion)
+
+    def desuscribir(self, funcion: Callable[[str, int, int], None]):
+        self._suscriptores.remove(funcion)
+
+    def _avisar(self, evento: str, inicio: int = 0, cantidad: int = 0):
+        for funcion in list(self._suscriptores):
+            funcion(evento, inicio, cantidad)
+
+    # --- lectura ---
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i, item in enumerate(self._items, 1):
+            yield dict(item, numero_orden=i)
+
+    def __getitem__(self, indice: int) -> Dict:
+        if indice < 0:
+            indice += len(self._items)
+        return dict(self._items[indice], numero_orden=indice + 1)
+
+    def texto(self, indice: int) -> str:
+        """Línea tal como se muestra en la lista: 'N.- descripción'"""
+        return f"{indice + 1}.- {self._items[indice]['descripcion']}"
+
+    def tema_ids(self) -> List[int]:
+        return [item['tema_id'] for item in self._items]
+
+    def como_lista(self) -> List[Dict]:
+        """Ítems con 'tema_id', 'numero_orden' y 'descripcion' (forma de datos['orden_dia'])"""
+        return list(self)
+
+    # --- altas y bajas ---
+
+    def agregar(self, temas: Iterable[Dict]):
+        self.insertar(len(self._items), temas)
+
+    def insertar(self, indice: int, temas: Iterable[Dict]):
+        nuevos = [self._item(t) for t in temas]
+        if not nuevos:
+            return
+        indice = max(0, min(indice, len(self._items)))
+        self._items[indice:indice] = nuevos
+        self._avisar(INSERTAR, indice, len(nuevos))
+
+    def eliminar(self, indices: Iterable[int]):
+        """Quita los ítems de las posiciones dadas (un aviso por tramo contiguo)"""
+        for inicio, cantidad in reversed(_tramos_contiguos(indices, len(self._items))):
+            del self._items[inicio:inicio + cantidad]
+            self._avisar(ELIMINAR, inicio, cantidad)
+
+    def reemplazar(self, temas: Iterable[Dict]):
+        self._items = [self._item(t) for t in temas]
+        self._avisar(REEMPLAZAR)
+
+    def limpiar(self):
+        self.reemplazar(())
+
+    # --- reordenamiento ---
+
+    def mover(self, indices: Iterable[int], destino: int) -> List[int]:
+        """
+        Mueve los ítems elegidos juntos, como un bloque, a la posición `destino`
+
+        `destino` es la posición final del primer ítem del bloque. Solo se
+        reescribe el tramo entre el origen y el destino.
+
+        Returns:
+            Posiciones nuevas de los ítems movidos
+        """
+        indices = sorted(set(i for i in indices if 0 <= i < len(self._items)))
+        if not indices:
+            return []
+        cantidad = len(indices)
+        destino = max(0, min(destino, len(self._items) - cantidad))
+
+        inicio = min(indices[0], destino)
+        fin = max(indices[-1] + 1, destino + cantidad)
+        tramo = self._items[inicio:fin]
+        elegidos = set(i - inicio for i in indices)
+        bloque = [item for i, item in enumerate(tramo) if i in elegidos]
+        resto = [item for i, item in enumerate(tramo) if i not in elegidos]
+        desde = destino - inicio
+        nuevo = resto[:desde] + bloque + resto[desde:]
+
+        if nuevo != tramo:
+            self._items[inicio:fin] = nuevo
+            self._avisar(CAMBIAR, inicio, fin - inicio)
+        return list(range(destino, destino + cantidad))
+
+    def subir(self, indices: Iterable[int]) -> List[int]:
+        """Sube cada ítem elegido una posición (los que ya están arriba quedan)"""
+        return self._desplazar(sorted(set(indices)), -1)
+
+    def bajar(self, indices: Iterable[int]) -> List[int]:
+        """Baja cada ítem elegido una posición (los que ya están abajo quedan)"""
+        return self._desplazar(sorted(set(indices), reverse=True), 1)
+
+    def _desplazar(self, indices: List[int], paso: int) -> List[int]:
+        indices = [i for i in indices if 0 <= i < len(self._items)]
+        # Posiciones elegidas que ya no pueden moverse (pegadas al extremo)
+        bloqueadas = set()
+        limite = 0 if paso < 0 else len(self._items) - 1
+        nuevas = []
+        cambiados = []
+        for i in indices:
+            vecino = i + paso
+            if i == limite or vecino in bloqueadas:
+                bloqueadas.add(i)
+                nuevas.append(i)
+                continue
+            self._items[i], self._items[vecino] = self._items[vecino], self._items[i]
+            nuevas.append(vecino)
+            cambiados.extend((i, vecino))
+
+        if cambiados:
+            inicio = min(cambiados)
+            self._avisar(CAMBIAR, inicio, max(cambiados) - inicio + 1)
+        return sorted(nuevas)
+
+
+def _tramos_contiguos(indices: Iterable[int], largo: int) -> List[Tuple[int, int]]:
+    """Agrupa posiciones en tramos (inicio, cantidad) de posiciones consecutivas"""
+    tramos: List[Tuple[int, int]] = []
+    anterior: Optional[int] = None
+    for i in sorted(set(i for i in indices if 0 <= i < largo)):
+        if anterior is not None and i == anterior + 1:
+            inicio, cantidad = tramos[-1]
+            tramos[-1] = (inicio, cantidad + 1)
+        else:
+            tramos.append((i, 1))
+        anterior = i
+    return tramos
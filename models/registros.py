@@ -0,0 +1,129 @@
+"""
+Registros livianos para las filas de la base de datos
+
+Cada clase usa __slots__ (sin __dict__ por fila) y se construye directamente
+desde el cursor con row_factory. Admiten acceso tipo diccionario
+(registro['campo'], .get(), .keys()) para que el código existente que
+trabaja con dicts siga funcionando sin cambios.
+
+Los registros que entrega la caché de lectura están congelados (ver
+Registro.congelar): se comparten entre llamadas y no se pueden modificar.
+"""
+
+from typing import Any, Iterator, Tuple
+
+
+class Registro:
+    """Base de los registros: acceso por atributo y por clave"""
+
+    __slots__ = ()
+
+    # Los fija __init_subclass__ en cada clase de registro (no en sus versiones congeladas)
+    _campos: Tuple[str, ...] = ()
+    _clase: type
+    _congelada: type
+
+    def __init_subclass__(cls, congelada: bool = False, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if congelada:
+            return
+        cls._campos = cls.__slots__
+        cls._clase = cls
+        # __init__ con una asignación directa por campo (como hace dataclasses):
+        # construir un registro cuesta lo mismo que el dict que reemplaza
+        campos = ", ".join(cls.__slots__)
+        cuerpo = "".join(f"\n    self.{campo} = {campo}" for campo in cls.__slots__)
+        espacio: dict = {}
+        exec(f"def __init__(self, {campos}):{cuerpo or ' pass'}", espacio)
+        cls.__init__ = espacio['__init__']
+        # Misma disposición en memoria: un registro pasa a esta clase con __class__
+        cls._congelada = type(cls.__name__, (_SoloLectura, cls), {'__slots__': ()}, congelada=True)
+
+    def congelar(self) -> 'Registro':
+        """Pasa el registro a solo lectura (para compartirlo desde la caché)"""
+        self.__class__ = self._congelada
+        return self
+
+    @classmethod
+    def fabrica(cls, cursor, fila: tuple) -> 'Registro':
+        """row_factory de sqlite3: el orden del SELECT debe coincidir con __slots__"""
+        return cls(*fila)
+
+    def __getitem__(self, campo: str) -> Any:
+        if campo not in self._campos:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def __setitem__(self, campo: str, valor: Any):
+        if campo not in self._campos:
+            raise KeyError(campo)
+        setattr(self, campo, valor)
+
+    def __contains__(self, campo: str) -> bool:
+        return campo in self._campos
+
+    def get(self, campo: str, defecto: Any = None) -> Any:
+        return getattr(self, campo) if campo in self._campos else defecto
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._campos
+
+    def values(self) -> Tuple[Any, ...]:
+        return self.como_tupla()
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self._campos, self.como_tupla())
+
+    def como_tupla(self) -> tuple:
+        return tuple(getattr(self, campo) for campo in self._campos)
+
+    def __eq__(self, otro) -> bool:
+        if isinstance(otro, Registro):
+            return self._clase is otro._clase and self.como_tupla() == otro.como_tupla()
+        if isinstance(otro, dict):
+            return dict(self.items()) == otro
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        campos = ", ".join(f"{c}={getattr(self, c)!r}" for c in self._campos)
+        return f"{type(self).__name__}({campos})"
+
+
+class _SoloLectura:
+    """Mezcla de los registros congelados: asignar un campo es un error"""
+
+    __slots__ = ()
+
+    def __setattr__(self, campo: str, valor: Any):
+        raise TypeError(f"{type(self).__name__} es de solo lectura (compartido por la caché)")
+
+    def __setitem__(self, campo: str, valor: Any):
+        raise TypeError(f"{type(self).__name__} es de solo lectura (compartido por la caché)")
+
+
+class Tema(Registro):
+    """Fila de temas"""
+
+    __slots__ = ('id', 'descripcion', 'categoria', 'activo')
+
+
+class Delegado(Registro):
+    """Fila de delegados"""
+
+    __slots__ = ('id', 'titulo', 'nombre', 'apellido', 'distrito', 'titular', 'activo')
+
+    @property
+    def nombre_completo(self) -> str:
+        return f"{self.titulo} {self.nombre} {self.apellido}"
+
+
+class Reunion(Registro):
+    """Fila del historial de reuniones con la cantidad de temas"""
+
+    __slots__ = ('id', 'fecha', 'hora', 'lugar', 'tipo', 'cantidad_temas')
+
+
+class ItemOrden(Registro):
+    """Tema dentro del orden del día de una reunión"""
+
+    __slots__ = ('id', 'descripcion', 'categoria', 'numero_orden')
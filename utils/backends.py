@@ -0,0 +1,111 @@
+"""
+Registro de backends de documentos y planillas
+Las librerías pesadas (reportlab, python-docx, openpyxl) se importan
+recién la primera vez que se usan, y no al iniciar la aplicación
+"""
+
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+
+_CARGADORES: Dict[str, Callable[[], SimpleNamespace]] = {}
+_PAQUETES: Dict[str, str] = {}
+_CARGADOS: Dict[str, SimpleNamespace] = {}
+_TIEMPOS_CARGA: Dict[str, float] = {}
+
+
+def registrar_backend(nombre: str, paquete: str):
+    """
+    Decorador para registrar la función que importa un backend
+
+    Args:
+        nombre: Nombre lógico del backend ('pdf', 'docx', 'excel')
+        paquete: Paquete de pip a instalar si falta la librería
+    """
+    def decorador(cargador: Callable[[], SimpleNamespace]):
+        _CARGADORES[nombre] = cargador
+        _PAQUETES[nombre] = paquete
+        return cargador
+    return decorador
+
+
+def obtener_backend(nombre: str) -> SimpleNamespace:
+    """
+    Devuelve los símbolos del backend, importándolo la primera vez
+
+    Raises:
+        KeyError: Si el backend no está registrado
+        ImportError: Si la librería no está instalada
+    """
+    backend = _CARGADOS.get(nombre)
+    if backend is not None:
+        return backend
+
+    cargador = _CARGADORES[nombre]
+    inicio = time.perf_counter()
+    try:
+        backend = cargador()
+    except ImportError as e:
+        raise ImportError(
+            f"El backend '{nombre}' no está disponible: {e}. "
+            f"Instálelo con: pip install {_PAQUETES[nombre]}"
+        ) from e
+
+    _TIEMPOS_CARGA[nombre] = time.perf_counter() - inicio
+    _CARGADOS[nombre] = backend
+    return backend
+
+
+def backend_disponible(nombre: str) -> bool:
+    """Indica si el backend puede cargarse"""
+    try:
+        obtener_backend(nombre)
+        return True
+    except ImportError:
+        return False
+
+
+def backends_cargados() -> List[str]:
+    """Lista de backends ya importados en este proceso"""
+    return list(_CARGADOS)
+
+
+def tiempos_carga() -> Dict[str, float]:
+    """Segundos que tardó la importación de cada backend cargado"""
+    return dict(_TIEMPOS_CARGA)
+
+
+# === BACKENDS REGISTRADOS ===
+
+@registrar_backend('pdf', 'reportlab')
+def _cargar_pdf() -> SimpleNamespace:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer, Table,
+                                    TableStyle, HRFlowable, PageBreak, Image)
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+    from reportlab.lib import colors
+    return SimpleNamespace(**locals())
+
+
+@registrar_backend('docx', 'python-docx')
+def _cargar_docx() -> SimpleNamespace:
+    from docx import Document
+    from docx.shared import Inches, Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    return SimpleNamespace(**locals())
+
+
+@registrar_backend('excel', 'openpyxl')
+def _cargar_excel() -> SimpleNamespace:
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.styles import Font, PatternFill, Alignment
+    return SimpleNamespace(**locals())
+
+
+@registrar_backend('rasterizador', 'pypdfium2')
+def _cargar_rasterizador() -> SimpleNamespace:
+    import pypdfium2 as pdfium
+    return SimpleNamespace(**locals())
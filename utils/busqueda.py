@@ -0,0 +1,40 @@
+"""
+Filtrado en memoria equivalente al LIKE '%término%' de SQLite
+
+La búsqueda en vivo del historial reutiliza el último resultado de la base
+cuando el término nuevo contiene al anterior: toda reunión que coincide con
+el término nuevo ya estaba en ese resultado.
+"""
+
+import string
+
+# LIKE de SQLite no distingue mayúsculas solo en ASCII ('Á' y 'á' son distintas)
+_MINUSCULAS_ASCII = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+# Separa los campos para que un término no coincida "a caballo" entre dos
+_SEPARADOR = "\x00"
+
+
+def minusculas_ascii(texto: str) -> str:
+    return texto.translate(_MINUSCULAS_ASCII)
+
+
+def texto_buscable(*campos) -> str:
+    """Une los campos en los que busca el LIKE, ya normalizados"""
+    return _SEPARADOR.join(minusculas_ascii(c) for c in campos if c)
+
+
+def coincide(termino: str, texto: str) -> bool:
+    """True si LIKE '%termino%' coincide con alguno de los campos de `texto`"""
+    return minusculas_ascii(termino) in texto
+
+
+def refina(anterior: str, nuevo: str) -> bool:
+    """
+    True si el resultado de `nuevo` se puede obtener filtrando el de `anterior`
+
+    Los comodines de LIKE (% y _) no se emulan: con ellos siempre se consulta.
+    """
+    if '%' in nuevo or '_' in nuevo or _SEPARADOR in nuevo:
+        return False
+    return minusculas_ascii(anterior) in minusculas_ascii(nuevo)
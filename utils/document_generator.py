@@ -2,26 +2,22 @@
 Generador de Documentos PDF y DOCX
 """
 
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable, PageBreak, Image
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-from reportlab.lib import colors
-from docx import Document
-from docx.shared import Inches, Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 from datetime import datetime
+import io
 import os
-from typing import Dict
+from typing import Dict, Optional
+
+from utils.backends import obtener_backend
 
 
 class DocumentGenerator:
     """Generador de documentos PDF y DOCX"""
     
-    def __init__(self):
-        self.output_dir = "outputs"
-        os.makedirs(self.output_dir, exist_ok=True)
+    def __init__(self, output_dir: Optional[str] = "outputs"):
+        # Sin output_dir solo se generan documentos en memoria (generar_bytes)
+        self.output_dir = output_dir
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
     
     def generar_texto_vista_previa(self, datos: Dict) -> str:
         """Genera texto plano para vista previa"""
@@ -70,18 +66,31 @@ class DocumentGenerator:
         filename = f"ORDEN_DEL_DIA_{fecha_archivo}.pdf"
         filepath = os.path.join(self.output_dir, filename)
         
+        self._construir_pdf(datos, filepath)
+        return filepath
+    
+    def generar_pdf_bytes(self, datos: Dict) -> bytes:
+        """Genera el mismo PDF que generar_pdf, en memoria y sin escribir archivos"""
+        buffer = io.BytesIO()
+        self._construir_pdf(datos, buffer)
+        return buffer.getvalue()
+    
+    def _construir_pdf(self, datos: Dict, destino):
+        """Arma el PDF en `destino` (ruta de archivo u objeto tipo archivo)"""
+        pdf = obtener_backend('pdf')
+        
         # Crear documento
-        doc = SimpleDocTemplate(
-            filepath,
-            pagesize=A4,
-            rightMargin=1.5*cm,
-            leftMargin=1.5*cm,
-            topMargin=1.5*cm,
-            bottomMargin=1.5*cm
+        doc = pdf.SimpleDocTemplate(
+            destino,
+            pagesize=pdf.A4,
+            rightMargin=1.5*pdf.cm,
+            leftMargin=1.5*pdf.cm,
+            topMargin=1.5*pdf.cm,
+            bottomMargin=1.5*pdf.cm
         )
         
         # Estilos
-        styles = getSampleStyleSheet()
+        styles = pdf.getSampleStyleSheet()
         
         # Obtener tamaño y fuente del título desde datos
         tamaño_titulo = datos.get('tamaño_titulo', 12)
@@ -109,59 +118,59 @@ class DocumentGenerator:
         fuente_titulo_final = font_map_reportlab.get(fuente_titulo, 'Helvetica-Bold') if negrita_titulo else font_normal_map.get(fuente_titulo, 'Helvetica')
         fuente_subtitulo_final = font_map_reportlab.get(fuente_titulo, 'Helvetica-Bold') if negrita_subtitulo else font_normal_map.get(fuente_titulo, 'Helvetica')
         
-        style_organismo = ParagraphStyle(
+        style_organismo = pdf.ParagraphStyle(
             'Organismo',
             parent=styles['Heading1'],
             fontSize=9,
-            textColor=colors.HexColor('#2E7D32'),
+            textColor=pdf.colors.HexColor('#2E7D32'),
             spaceAfter=2,
-            alignment=TA_CENTER,
+            alignment=pdf.TA_CENTER,
             fontName='Helvetica-Bold'
         )
         
-        style_sede = ParagraphStyle(
+        style_sede = pdf.ParagraphStyle(
             'Sede',
             parent=styles['Heading1'],
             fontSize=8,
-            textColor=colors.HexColor('#2E7D32'),
+            textColor=pdf.colors.HexColor('#2E7D32'),
             spaceAfter=8,
-            alignment=TA_CENTER,
+            alignment=pdf.TA_CENTER,
             fontName='Helvetica'
         )
         
-        style_title = ParagraphStyle(
+        style_title = pdf.ParagraphStyle(
             'CustomTitle',
             parent=styles['Heading1'],
             fontSize=tamaño_titulo,
-            textColor=colors.black,
+            textColor=pdf.colors.black,
             spaceAfter=2,
-            alignment=TA_CENTER,
+            alignment=pdf.TA_CENTER,
             fontName=fuente_titulo_final
         )
         
-        style_subtitle = ParagraphStyle(
+        style_subtitle = pdf.ParagraphStyle(
             'CustomSubtitle',
             parent=styles['Heading2'],
             fontSize=tamaño_titulo,
-            textColor=colors.black,
+            textColor=pdf.colors.black,
             spaceAfter=10,
-            alignment=TA_CENTER,
+            alignment=pdf.TA_CENTER,
             fontName=fuente_subtitulo_final
         )
         
-        style_heading = ParagraphStyle(
+        style_heading = pdf.ParagraphStyle(
             'CustomHeading',
             parent=styles['Heading3'],
             fontSize=10,
-            textColor=colors.black,
+            textColor=pdf.colors.black,
             spaceAfter=6,
             spaceBefore=10,
-            alignment=TA_CENTER,
+            alignment=pdf.TA_CENTER,
             fontName='Helvetica-Bold',
             underline=True
         )
         
-        style_normal = ParagraphStyle(
+        style_normal = pdf.ParagraphStyle(
             'CustomNormal',
             parent=styles['Normal'],
             fontSize=9,
@@ -169,12 +178,12 @@ class DocumentGenerator:
             fontName='Helvetica'
         )
         
-        style_tema = ParagraphStyle(
+        style_tema = pdf.ParagraphStyle(
             'CustomTema',
             parent=styles['Normal'],
             fontSize=9,
             spaceAfter=8,
-            leftIndent=0.2*cm,
+            leftIndent=0.2*pdf.cm,
             fontName='Helvetica'
         )
         
@@ -182,33 +191,33 @@ class DocumentGenerator:
         story = []
         
         # Línea decorativa superior
-        story.append(Spacer(1, 0.2*cm))
+        story.append(pdf.Spacer(1, 0.2*pdf.cm))
         
         # Agregar logo si existe
-        if datos.get('imagen_logo') and os.path.exists(datos['imagen_logo']):
+        origen_logo = self._origen_logo(datos)
+        if origen_logo:
             try:
-                from reportlab.platypus import Image as RLImage
                 # Obtener tamaño personalizado del logo o usar default
                 ancho_logo = datos.get('ancho_logo', 3.5)  # cm
                 alto_logo = datos.get('alto_logo', 2)  # cm
-                logo = RLImage(datos['imagen_logo'], width=ancho_logo*cm, height=alto_logo*cm)
-                logo_table = Table([[logo]], colWidths=[ancho_logo*cm])
-                logo_table.setStyle(TableStyle([('ALIGN', (0, 0), (0, 0), 'CENTER')]))
+                logo = pdf.Image(origen_logo, width=ancho_logo*pdf.cm, height=alto_logo*pdf.cm)
+                logo_table = pdf.Table([[logo]], colWidths=[ancho_logo*pdf.cm])
+                logo_table.setStyle(pdf.TableStyle([('ALIGN', (0, 0), (0, 0), 'CENTER')]))
                 story.append(logo_table)
-                story.append(Spacer(1, 0.3*cm))
+                story.append(pdf.Spacer(1, 0.3*pdf.cm))
             except Exception as e:
                 print(f"Error cargando logo en PDF: {e}")
         
         # Título documento (usar texto personalizado)
         texto_encabezado = datos.get('texto_encabezado', 'ORDEN DEL DÍA')
-        story.append(Paragraph(texto_encabezado, style_title))
+        story.append(pdf.Paragraph(texto_encabezado, style_title))
         
         # Subtítulo si existe
         subtitulo = datos.get('subtitulo_encabezado', '').strip()
         if subtitulo:
-            story.append(Paragraph(subtitulo, style_subtitle))
+            story.append(pdf.Paragraph(subtitulo, style_subtitle))
         
-        story.append(Spacer(1, 0.3*cm))
+        story.append(pdf.Spacer(1, 0.3*pdf.cm))
         
         # Datos de la reunión
         datos_tabla = [
@@ -225,8 +234,8 @@ class DocumentGenerator:
         if datos.get('tipo') == 'virtual' and datos.get('plataforma') and datos['plataforma'].strip():
             datos_tabla.append(['PLATAFORMA:', datos['plataforma']])
         
-        table_datos = Table(datos_tabla, colWidths=[2*cm, 11*cm])
-        table_datos.setStyle(TableStyle([
+        table_datos = pdf.Table(datos_tabla, colWidths=[2*pdf.cm, 11*pdf.cm])
+        table_datos.setStyle(pdf.TableStyle([
             ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
             ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
             ('FONTSIZE', (0, 0), (-1, -1), 9),
@@ -237,10 +246,10 @@ class DocumentGenerator:
         ]))
         
         story.append(table_datos)
-        story.append(Spacer(1, 0.4*cm))
+        story.append(pdf.Spacer(1, 0.4*pdf.cm))
         
         # Delegados titulares
-        story.append(Paragraph("DELEGADOS TITULARES:", style_heading))
+        story.append(pdf.Paragraph("DELEGADOS TITULARES:", style_heading))
         
         # Tabla de delegados
         delegados_data = [['Nombre y Apellido', 'Distrito']]
@@ -250,8 +259,8 @@ class DocumentGenerator:
                 d['distrito']
             ])
         
-        table_delegados = Table(delegados_data, colWidths=[9.5*cm, 3.5*cm])
-        table_delegados.setStyle(TableStyle([
+        table_delegados = pdf.Table(delegados_data, colWidths=[9.5*pdf.cm, 3.5*pdf.cm])
+        table_delegados.setStyle(pdf.TableStyle([
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
             ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
             ('FONTSIZE', (0, 0), (-1, -1), 9),
@@ -259,38 +268,39 @@ class DocumentGenerator:
             ('ALIGN', (1, 0), (1, -1), 'CENTER'),
             ('TOPPADDING', (0, 0), (-1, -1), 2),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-            ('LINEBELOW', (0, 0), (-1, 0), 1, colors.black),
+            ('LINEBELOW', (0, 0), (-1, 0), 1, pdf.colors.black),
         ]))
         
         story.append(table_delegados)
-        story.append(Spacer(1, 0.4*cm))
+        story.append(pdf.Spacer(1, 0.4*pdf.cm))
         
         # Salto de página
-        story.append(PageBreak())
+        story.append(pdf.PageBreak())
         
         # Agregar logo en la segunda página si existe
-        if datos.get('imagen_logo') and os.path.exists(datos['imagen_logo']):
+        origen_logo = self._origen_logo(datos)
+        if origen_logo:
             try:
                 ancho_logo = datos.get('ancho_logo', 3.5)  # cm
                 alto_logo = datos.get('alto_logo', 2.0)    # cm
-                img = Image(datos['imagen_logo'], width=ancho_logo*cm, height=alto_logo*cm)
+                img = pdf.Image(origen_logo, width=ancho_logo*pdf.cm, height=alto_logo*pdf.cm)
                 story.append(img)
-                story.append(Spacer(1, 0.3*cm))
+                story.append(pdf.Spacer(1, 0.3*pdf.cm))
             except Exception as e:
                 print(f"Error cargando logo en PDF: {e}")
         
         # Orden del día
-        story.append(Paragraph("ORDEN DEL DÍA", style_heading))
+        story.append(pdf.Paragraph("ORDEN DEL DÍA", style_heading))
         
         for tema in datos['orden_dia']:
             texto_tema = f"<b>{tema['numero_orden']}.-</b> {tema['descripcion']}"
-            story.append(Paragraph(texto_tema, style_tema))
+            story.append(pdf.Paragraph(texto_tema, style_tema))
         
-        story.append(Spacer(1, 0.6*cm))
+        story.append(pdf.Spacer(1, 0.6*pdf.cm))
         
         # Saludo
-        story.append(Paragraph("Saludamos a Ud. atentamente.", style_normal))
-        story.append(Spacer(1, 1.5*cm))
+        story.append(pdf.Paragraph("Saludamos a Ud. atentamente.", style_normal))
+        story.append(pdf.Spacer(1, 1.5*pdf.cm))
         
         # Firmas
         firmas_data = [
@@ -298,14 +308,14 @@ class DocumentGenerator:
             ['Secretario General', 'Presidente']
         ]
         
-        table_firmas = Table(firmas_data, colWidths=[6.5*cm, 6.5*cm])
-        table_firmas.setStyle(TableStyle([
+        table_firmas = pdf.Table(firmas_data, colWidths=[6.5*pdf.cm, 6.5*pdf.cm])
+        table_firmas.setStyle(pdf.TableStyle([
             ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
             ('FONTSIZE', (0, 0), (-1, 0), 9),
             ('FONTSIZE', (0, 1), (-1, 1), 8),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('VALIGN', (0, 0), (-1, -1), 'BOTTOM'),
-            ('LINEABOVE', (0, 0), (-1, 0), 1, colors.black),
+            ('LINEABOVE', (0, 0), (-1, 0), 1, pdf.colors.black),
             ('TOPPADDING', (0, 0), (-1, 0), 30),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 2),
         ]))
@@ -314,8 +324,6 @@ class DocumentGenerator:
         
         # Generar PDF
         doc.build(story)
-        
-        return filepath
     
     def generar_docx(self, datos: Dict) -> str:
         """Genera documento DOCX con diseño profesional"""
@@ -324,26 +332,83 @@ class DocumentGenerator:
         filename = f"ORDEN_DEL_DIA_{fecha_archivo}.docx"
         filepath = os.path.join(self.output_dir, filename)
         
+        self._construir_docx(datos).save(filepath)
+        return filepath
+    
+    def generar_docx_bytes(self, datos: Dict) -> bytes:
+        """Genera el mismo DOCX que generar_docx, en memoria y sin escribir archivos"""
+        buffer = io.BytesIO()
+        self._construir_docx(datos).save(buffer)
+        return buffer.getvalue()
+    
+    def generar_bytes(self, datos: Dict, formato: str) -> bytes:
+        """Documento en memoria en el formato pedido ('pdf' o 'docx')"""
+        if formato == 'pdf':
+            return self.generar_pdf_bytes(datos)
+        if formato == 'docx':
+            return self.generar_docx_bytes(datos)
+        raise ValueError(f"Formato no soportado: {formato}")
+    
+    def regenerar(self, db, reunion_id: int, formato: str = 'pdf',
+                  version: Optional[int] = None) -> bytes:
+        """
+        Vuelve a generar el documento de una reunión desde su instantánea
+        
+        Usa solo los datos guardados al generarla (textos de los temas,
+        encabezado, fuentes y logo de ese momento): una única consulta.
+        
+        Raises:
+            LookupError: Si la reunión (o la versión) no tiene instantánea
+        """
+        datos = db.obtener_instantanea(reunion_id, version)
+        if datos is None:
+            raise LookupError(f"La reunión {reunion_id} no tiene instantánea"
+                              + (f" versión {version}" if version is not None else ""))
+        return self.generar_bytes(datos, formato)
+    
+    @staticmethod
+    def _origen_logo(datos: Dict):
+        """
+        Logo a insertar: los bytes ya leídos ('logo_bytes') o el archivo de
+        'imagen_logo'; None si no hay
+        
+        Con la clave 'logo_bytes' presente (instantáneas, o el logo leído al
+        guardar) no se mira el archivo, aunque valga None.
+        
+        Se devuelve un objeto nuevo en cada llamada porque el logo se inserta
+        una vez por página.
+        """
+        if 'logo_bytes' in datos:
+            return io.BytesIO(datos['logo_bytes']) if datos['logo_bytes'] else None
+        if datos.get('imagen_logo') and os.path.exists(datos['imagen_logo']):
+            return datos['imagen_logo']
+        return None
+    
+    def _construir_docx(self, datos: Dict):
+        """Arma el documento DOCX en memoria"""
+        docx = obtener_backend('docx')
+        
         # Crear documento
-        doc = Document()
+        doc = docx.Document()
         
         # Configurar márgenes
         sections = doc.sections
         for section in sections:
-            section.top_margin = Inches(0.6)
-            section.bottom_margin = Inches(0.6)
-            section.left_margin = Inches(0.6)
-            section.right_margin = Inches(0.6)
+            section.top_margin = docx.Inches(0.6)
+            section.bottom_margin = docx.Inches(0.6)
+            section.left_margin = docx.Inches(0.6)
+            section.right_margin = docx.Inches(0.6)
         
         # Agregar logo si existe
-        if datos.get('imagen_logo') and os.path.exists(datos['imagen_logo']):
+        origen_logo = self._origen_logo(datos)
+        if origen_logo:
             try:
                 logo_para = doc.add_paragraph()
-                logo_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                logo_para.alignment = docx.WD_ALIGN_PARAGRAPH.CENTER
                 logo_run = logo_para.add_run()
                 # Obtener tamaño personalizado del logo o usar default
                 ancho_logo = datos.get('ancho_logo_docx', 1.2)  # pulgadas
-                logo_run.add_picture(datos['imagen_logo'], width=Inches(ancho_logo))
+                logo_run.add_picture(origen_logo, width=docx.Inches(ancho_logo))
                 doc.add_paragraph()  # Espacio
             except Exception as e:
                 print(f"Error cargando logo en DOCX: {e}")
@@ -367,20 +432,20 @@ class DocumentGenerator:
         # Título documento (usar texto personalizado)
         texto_encabezado = datos.get('texto_encabezado', 'ORDEN DEL DÍA')
         order_title = doc.add_paragraph(texto_encabezado)
-        order_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        order_title.alignment = docx.WD_ALIGN_PARAGRAPH.CENTER
         for run in order_title.runs:
             run.font.bold = negrita_titulo
-            run.font.size = Pt(tamaño_titulo)
+            run.font.size = docx.Pt(tamaño_titulo)
             run.font.name = fuente_word
         
         # Subtítulo si existe
         subtitulo = datos.get('subtitulo_encabezado', '').strip()
         if subtitulo:
             subtitle = doc.add_paragraph(subtitulo)
-            subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            subtitle.alignment = docx.WD_ALIGN_PARAGRAPH.CENTER
             for run in subtitle.runs:
                 run.font.bold = negrita_subtitulo
-                run.font.size = Pt(tamaño_titulo)
+                run.font.size = docx.Pt(tamaño_titulo)
                 run.font.name = fuente_word
         
         doc.add_paragraph()  # Espacio
@@ -390,19 +455,19 @@ class DocumentGenerator:
         p_fecha.add_run('FECHA: ').bold = True
         p_fecha.add_run(datos['fecha'])
         for run in p_fecha.runs:
-            run.font.size = Pt(9)
+            run.font.size = docx.Pt(9)
         
         p_hora = doc.add_paragraph()
         p_hora.add_run('HORA: ').bold = True
         p_hora.add_run(datos['hora'])
         for run in p_hora.runs:
-            run.font.size = Pt(9)
+            run.font.size = docx.Pt(9)
         
         p_lugar = doc.add_paragraph()
         p_lugar.add_run('LUGAR: ').bold = True
         p_lugar.add_run(datos['lugar'])
         for run in p_lugar.runs:
-            run.font.size = Pt(9)
+            run.font.size = docx.Pt(9)
         
         # Agregar SEDE solo si no está vacío
         if datos.get('sede') and datos['sede'].strip():
@@ -410,7 +475,7 @@ class DocumentGenerator:
             p_sede.add_run('SEDE: ').bold = True
             p_sede.add_run(datos['sede'])
             for run in p_sede.runs:
-                run.font.size = Pt(9)
+                run.font.size = docx.Pt(9)
         
         # Agregar PLATAFORMA si es reunión virtual
         if datos.get('tipo') == 'virtual' and datos.get('plataforma') and datos['plataforma'].strip():
@@ -418,14 +483,14 @@ class DocumentGenerator:
             p_plataforma.add_run('PLATAFORMA: ').bold = True
             p_plataforma.add_run(datos['plataforma'])
             for run in p_plataforma.runs:
-                run.font.size = Pt(9)
+                run.font.size = docx.Pt(9)
         
         doc.add_paragraph()  # Espacio
         
         # Delegados titulares
         heading_del = doc.add_heading('DELEGADOS TITULARES:', 2)
         for run in heading_del.runs:
-            run.font.size = Pt(10)
+            run.font.size = docx.Pt(10)
         
         # Tabla de delegados
         table = doc.add_table(rows=len(datos['delegados']) + 1, cols=2)
@@ -440,7 +505,7 @@ class DocumentGenerator:
             for paragraph in cell.paragraphs:
                 for run in paragraph.runs:
                     run.font.bold = True
-                    run.font.size = Pt(9)
+                    run.font.size = docx.Pt(9)
         
         # Datos delegados
         for i, d in enumerate(datos['delegados'], 1):
@@ -451,7 +516,7 @@ class DocumentGenerator:
             for cell in table.rows[i].cells:
                 for paragraph in cell.paragraphs:
                     for run in paragraph.runs:
-                        run.font.size = Pt(9)
+                        run.font.size = docx.Pt(9)
         
         doc.add_paragraph()  # Espacio
         
@@ -459,38 +524,39 @@ class DocumentGenerator:
         doc.add_page_break()
         
         # Agregar logo en la segunda página si existe
-        if datos.get('imagen_logo') and os.path.exists(datos['imagen_logo']):
+        origen_logo = self._origen_logo(datos)
+        if origen_logo:
             try:
                 logo_para = doc.add_paragraph()
-                logo_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+                logo_para.alignment = docx.WD_ALIGN_PARAGRAPH.CENTER
                 logo_run = logo_para.add_run()
                 ancho_logo = datos.get('ancho_logo_docx', 1.2)  # pulgadas
-                logo_run.add_picture(datos['imagen_logo'], width=Inches(ancho_logo))
+                logo_run.add_picture(origen_logo, width=docx.Inches(ancho_logo))
                 doc.add_paragraph()  # Espacio
             except Exception as e:
                 print(f"Error cargando logo en DOCX página 2: {e}")
         
         # Orden del día
         heading_orden = doc.add_heading('ORDEN DEL DÍA', 2)
-        heading_orden.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        heading_orden.alignment = docx.WD_ALIGN_PARAGRAPH.CENTER
         for run in heading_orden.runs:
-            run.font.size = Pt(10)
+            run.font.size = docx.Pt(10)
             run.underline = True
         
         doc.add_paragraph()  # Espacio pequeño
         
         for tema in datos['orden_dia']:
             p = doc.add_paragraph(f"{tema['numero_orden']}.- {tema['descripcion']}")
-            p.paragraph_format.space_after = Pt(8)
+            p.paragraph_format.space_after = docx.Pt(8)
             for run in p.runs:
-                run.font.size = Pt(9)
+                run.font.size = docx.Pt(9)
         
         doc.add_paragraph()  # Espacio
         
         # Saludo
         saludo = doc.add_paragraph('Saludamos a Ud. atentamente.')
         for run in saludo.runs:
-            run.font.size = Pt(9)
+            run.font.size = docx.Pt(9)
         
         doc.add_paragraph()  # Espacio
         doc.add_paragraph()  # Espacio
@@ -511,13 +577,10 @@ class DocumentGenerator:
         # Centrar, formatear y agregar línea a firmas
         for row_idx, row in enumerate(table_firmas.rows):
             for cell in row.cells:
-                cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+                cell.paragraphs[0].alignment = docx.WD_ALIGN_PARAGRAPH.CENTER
                 for run in cell.paragraphs[0].runs:
-                    run.font.size = Pt(9)
+                    run.font.size = docx.Pt(9)
                     if row_idx == 1:  # Cargos en tamaño menor
-                        run.font.size = Pt(8)
-        
-        # Guardar
-        doc.save(filepath)
+                        run.font.size = docx.Pt(8)
         
-        return filepath
\ No newline at end of file
+        return doc
\ No newline at end of file
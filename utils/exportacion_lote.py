@@ -0,0 +1,167 @@
+"""
+Regeneración masiva del archivo de reuniones en un zip
+
+Para auditorías: se recorre la última instantánea de cada reunión del período,
+los documentos se generan en varios procesos y se escriben en el zip a medida
+que terminan. En memoria hay como mucho `en_vuelo` documentos a la vez, sin
+importar cuántas reuniones tenga el período.
+
+El zip se cierra siempre (también con Ctrl+C o si un proceso muere), así que
+un nuevo intento con el mismo destino saltea las reuniones que ya están
+adentro y sigue desde donde quedó.
+"""
+
+import os
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from typing import Callable, Dict, Optional
+
+from models.database import Database
+from utils.document_generator import DocumentGenerator
+
+# Los PDF de reportlab se achican casi a la mitad; los DOCX ya son un zip
+COMPRESION = {'pdf': zipfile.ZIP_DEFLATED, 'docx': zipfile.ZIP_STORED}
+
+# Estado de cada proceso de trabajo (lo arma _inicializar_proceso)
+_generador: Optional[DocumentGenerator] = None
+_logos: Dict[str, bytes] = {}
+
+
+def nombre_en_zip(reunion_id: int, version: int, fecha: Optional[str], formato: str) -> str:
+    """'2025/reunion_00125_v2.pdf': una carpeta por año en que se realizó la reunión"""
+    anio = (fecha or "")[:4] or "sin_fecha"
+    return f"{anio}/reunion_{reunion_id:05d}_v{version}.{formato}"
+
+
+def _inicializar_proceso(logos: Dict[str, bytes]):
+    # Los logos se envían una vez por proceso, no con cada reunión
+    global _generador, _logos
+    _generador = DocumentGenerator(output_dir=None)
+    _logos = logos
+
+
+def _generar(reunion_id: int, version: int, datos: bytes,
+             logo_sha256: Optional[str], formato: str):
+    inicio = time.perf_counter()
+    contenido = _generador.generar_bytes(
+        Database.descomprimir_instantanea(datos, _logos.get(logo_sha256)), formato
+    )
+    return reunion_id, contenido, time.perf_counter() - inicio
+
+
+def _abrir_zip(destino: str) -> zipfile.ZipFile:
+    """Abre el zip para agregar; uno dañado (proceso matado) se aparta y se empieza de nuevo"""
+    if os.path.exists(destino):
+        # Con 'a' sobre algo que no es un zip, zipfile agregaría uno nuevo al final
+        if zipfile.is_zipfile(destino):
+            return zipfile.ZipFile(destino, 'a')
+        danado = destino + ".danado"
+        os.replace(destino, danado)
+        print(f"[ERROR] {destino} estaba dañado (quedó en {danado}); se exporta de nuevo")
+    return zipfile.ZipFile(destino, 'w')
+
+
+def exportar_archivo(db: Database, destino: str, formato: str = 'pdf',
+                     desde: Optional[str] = None, hasta: Optional[str] = None,
+                     procesos: Optional[int] = None, en_vuelo: Optional[int] = None,
+                     progreso: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """
+    Regenera los documentos de las reuniones del período [desde, hasta) en un zip
+
+    Args:
+        db: Base con las instantáneas
+        destino: Archivo zip (si existe, se completa)
+        formato: 'pdf' o 'docx'
+        desde, hasta: Fechas 'AAAA-MM-DD' de realización de las reuniones
+        procesos: Procesos de trabajo (por defecto, uno por núcleo)
+        en_vuelo: Documentos pendientes como máximo (por defecto, 2 por proceso)
+        progreso: Función (procesadas, total) que se llama con cada reunión
+
+    Returns:
+        Dict con 'total', 'generados', 'salteados', 'errores' ({reunion_id: mensaje}),
+        'bytes', 'segundos', 'documentos_por_segundo', 'mb_por_segundo',
+        'ms_por_documento' (tiempo de generación dentro de los procesos) y
+        'completo' (False si se interrumpió)
+    """
+    procesos = procesos or os.cpu_count() or 1
+    en_vuelo = max(1, en_vuelo or 2 * procesos)
+    total = db.contar_instantaneas(desde, hasta)
+    informe = {'total': total, 'generados': 0, 'salteados': 0, 'errores': {},
+               'bytes': 0, 'completo': False}
+    segundos_generacion = 0.0
+    inicio = time.perf_counter()
+
+    zip_salida = _abrir_zip(destino)
+    try:
+        existentes = set(zip_salida.namelist())
+        nombres: Dict[int, str] = {}
+        pendientes = set()
+
+        def recibir(terminados):
+            nonlocal segundos_generacion
+            for futuro in terminados:
+                pendientes.discard(futuro)
+                try:
+                    reunion_id, contenido, segundos = futuro.result()
+                except Exception as e:
+                    reunion_id = futuro.reunion_id
+                    nombres.pop(reunion_id, None)
+                    informe['errores'][reunion_id] = str(e) or type(e).__name__
+                    print(f"[ERROR] Reunión {reunion_id}: {informe['errores'][reunion_id]}")
+                else:
+                    zip_salida.writestr(nombres.pop(reunion_id), contenido,
+                                        compress_type=COMPRESION[formato])
+                    informe['generados'] += 1
+                    informe['bytes'] += len(contenido)
+                    segundos_generacion += segundos
+                if progreso:
+                    progreso(informe['generados'] + informe['salteados'] + len(informe['errores']), total)
+
+        with ProcessPoolExecutor(procesos, initializer=_inicializar_proceso,
+                                 initargs=(db.obtener_logos(desde, hasta),)) as ejecutor:
+            try:
+                with closing(db.iterar_instantaneas(desde, hasta)) as filas:
+                    for reunion_id, version, fecha, datos, logo_sha256 in filas:
+                        nombre = nombre_en_zip(reunion_id, version, fecha, formato)
+                        if nombre in existentes:
+                            informe['salteados'] += 1
+                            continue
+                        # Se espera a que haya lugar antes de leer más de la base
+                        if len(pendientes) >= en_vuelo:
+                            recibir(wait(pendientes, return_when=FIRST_COMPLETED).done)
+                        nombres[reunion_id] = nombre
+                        futuro = ejecutor.submit(_generar, reunion_id, version, datos, logo_sha256, formato)
+                        futuro.reunion_id = reunion_id
+                        pendientes.add(futuro)
+                while pendientes:
+                    recibir(wait(pendientes, return_when=FIRST_COMPLETED).done)
+                informe['completo'] = not informe['errores']
+            except BrokenProcessPool:
+                # Un proceso murió (por ejemplo, sin memoria): lo ya escrito queda en el zip
+                recibir(list(pendientes))
+                print("[ERROR] Se interrumpió un proceso de trabajo; vuelva a ejecutar para continuar")
+    finally:
+        zip_salida.close()
+
+    segundos = time.perf_counter() - inicio
+    informe.update({
+        'segundos': segundos,
+        'documentos_por_segundo': informe['generados'] / segundos if segundos else 0.0,
+        'mb_por_segundo': informe['bytes'] / 1e6 / segundos if segundos else 0.0,
+        'ms_por_documento': 1000 * segundos_generacion / informe['generados'] if informe['generados'] else 0.0,
+    })
+    return informe
+
+
+def formatear_informe(informe: Dict) -> str:
+    lineas = [
+        f"Reuniones: {informe['total']} (generadas {informe['generados']}, "
+        f"ya exportadas {informe['salteados']}, con error {len(informe['errores'])})",
+        f"Tiempo: {informe['segundos']:.2f} s | {informe['documentos_por_segundo']:.1f} documentos/s | "
+        f"{informe['mb_por_segundo']:.2f} MB/s ({informe['bytes'] / 1e6:.1f} MB)",
+        f"Generación: {informe['ms_por_documento']:.1f} ms por documento en cada proceso",
+    ]
+    return "\n".join(lineas)
@@ -0,0 +1,188 @@
+"""
+Exportación de temas e historial a Excel y CSV
+Separado del controlador para poder usarse sin interfaz (benchmarks, CLI)
+"""
+
+import csv
+from contextlib import closing
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+from models.database import TAMAÑO_LOTE
+from utils.backends import obtener_backend
+
+
+def texto_temas_reunion(db, reunion_id: int, incluir_archivo: bool = False,
+                        temas=None, usos: Optional[Dict[int, int]] = None) -> str:
+    """
+    Construye el texto de temas de una reunión con sus contadores de uso
+
+    Formato: "1. Tema A (3), 2. Tema B (1)" o "Sin temas"
+
+    Args:
+        temas: Temas de la reunión ya leídos (None = consultarlos)
+        usos: Contadores ya calculados por tema; se completa con los que falten.
+            Al armar muchas reuniones evita repetir la consulta por cada tema.
+    """
+    if temas is None:
+        temas = db.obtener_temas_reunion(reunion_id, incluir_archivo=incluir_archivo)
+
+    temas_con_usos = []
+    for t in temas:
+        if usos is not None and t['id'] in usos:
+            cantidad = usos[t['id']]
+        else:
+            cantidad = db.obtener_estadisticas_tema(t['id'], incluir_archivo=incluir_archivo)['cantidad_usos']
+            if usos is not None:
+                usos[t['id']] = cantidad
+        temas_con_usos.append(f"{t['numero_orden']}. {t['descripcion']} ({cantidad})")
+
+    temas_texto = ", ".join(temas_con_usos)
+    return temas_texto if temas_texto else "Sin temas"
+
+
+def iterar_historial(db, incluir_archivo: bool = False) -> Iterator[tuple]:
+    """
+    Recorre el historial como filas (id, fecha, hora, lugar, tipo, texto de temas)
+
+    Para exportaciones: los contadores de uso se leen una sola vez y los temas
+    con una consulta por lote de reuniones, no con varias por cada reunión.
+    """
+    usos = db.contar_usos_temas(incluir_archivo=incluir_archivo)
+    with closing(db.iterar_reuniones(como_tuplas=True, incluir_archivo=incluir_archivo)) as reuniones:
+        while True:
+            lote = list(islice(reuniones, TAMAÑO_LOTE))
+            if not lote:
+                break
+            temas = db.obtener_temas_reuniones([r[0] for r in lote], incluir_archivo=incluir_archivo)
+            for reunion_id, fecha, hora, lugar, tipo, _ in lote:
+                yield (reunion_id, fecha, hora, lugar, tipo,
+                       texto_temas_reunion(db, reunion_id, incluir_archivo,
+                                           temas.get(reunion_id, []), usos))
+
+
+def _hoja_con_encabezados(titulo: str, encabezados: List[str], anchos: Dict[str, int]):
+    """Crea un workbook con una hoja y la fila de encabezados formateada"""
+    xl = obtener_backend('excel')
+
+    wb = xl.Workbook()
+    ws = wb.active
+    ws.title = titulo
+    ws.append(encabezados)
+
+    header_fill = xl.PatternFill(start_color="2E7D32", end_color="2E7D32", fill_type="solid")
+    header_font = xl.Font(bold=True, color="FFFFFF")
+
+    for cell in ws[1]:
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = xl.Alignment(horizontal="center", vertical="center")
+
+    for columna, ancho in anchos.items():
+        ws.column_dimensions[columna].width = ancho
+
+    return wb, ws
+
+
+def exportar_temas_excel(db, archivo: str) -> int:
+    """
+    Exporta los temas activos a un archivo Excel
+
+    Returns:
+        Cantidad de temas exportados
+    """
+    wb, ws = _hoja_con_encabezados(
+        "Temas",
+        ["Descripción", "Categoría", "Veces Usado", "Estado"],
+        {'A': 50, 'B': 20, 'C': 15, 'D': 15}
+    )
+
+    usos = db.contar_usos_temas()
+    cantidad = 0
+    for tema_id, descripcion, categoria, activo in db.iterar_temas(como_tuplas=True):
+        ws.append([
+            descripcion,
+            categoria or "",
+            usos.get(tema_id, 0),
+            "Activo" if activo else "Inactivo"
+        ])
+        cantidad += 1
+
+    wb.save(archivo)
+    return cantidad
+
+
+def exportar_historial_excel(db, archivo: str) -> int:
+    """
+    Exporta el historial de reuniones a un archivo Excel
+
+    Returns:
+        Cantidad de reuniones exportadas
+    """
+    wb, ws = _hoja_con_encabezados(
+        "Historial",
+        ["ID", "Fecha", "Hora", "Lugar", "Tipo", "Temas"],
+        {'A': 8, 'B': 15, 'C': 12, 'D': 30, 'E': 15, 'F': 50}
+    )
+
+    # Recorrido masivo: las reuniones y sus temas se leen de a lotes
+    cantidad = 0
+    for fila in iterar_historial(db):
+        ws.append(list(fila))
+        cantidad += 1
+
+    wb.save(archivo)
+    return cantidad
+
+
+def exportar_historial_csv(db, archivo: str) -> int:
+    """
+    Exporta el historial a CSV escribiendo cada reunión a medida que se lee
+
+    A diferencia de Excel (openpyxl arma el libro completo en memoria), el uso
+    de memoria no depende de la cantidad de reuniones.
+
+    Returns:
+        Cantidad de reuniones exportadas
+    """
+    cantidad = 0
+    with open(archivo, 'w', newline='', encoding='utf-8-sig') as f:
+        escritor = csv.writer(f, delimiter=';')
+        escritor.writerow(["ID", "Fecha", "Hora", "Lugar", "Tipo", "Temas"])
+        for fila in iterar_historial(db):
+            escritor.writerow(fila)
+            cantidad += 1
+    return cantidad
+
+
+def importar_temas_excel(db, archivo: str):
+    """
+    Importa temas desde un Excel (columna A descripción, B categoría)
+
+    La primera fila se toma como encabezado.
+
+    Returns:
+        Tupla (cantidad importada, lista de errores)
+    """
+    wb = obtener_backend('excel').load_workbook(archivo)
+    ws = wb.active
+
+    contador = 0
+    errores = []
+
+    for fila in ws.iter_rows(min_row=2, values_only=True):
+        if not fila[0]:  # Si la primera columna está vacía, saltar
+            continue
+
+        descripcion = str(fila[0]).strip()
+        categoria = str(fila[1]).strip() if len(fila) > 1 and fila[1] else ""
+
+        if descripcion:
+            try:
+                db.agregar_tema(descripcion, categoria)
+                contador += 1
+            except Exception as e:
+                errores.append(f"Error en fila: {descripcion} - {str(e)}")
+
+    wb.close()
+    return contador, errores
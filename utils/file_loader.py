@@ -3,10 +3,10 @@ Módulo para cargar datos desde archivos Excel y Word
 """
 
 import os
-from openpyxl import load_workbook
-from docx import Document
 from typing import List, Tuple
 
+from utils.backends import obtener_backend
+
 
 class FileLoader:
     """Maneja la carga de datos desde archivos"""
@@ -29,7 +29,7 @@ class FileLoader:
         temas = []
         
         try:
-            libro = load_workbook(ruta_archivo)
+            libro = obtener_backend('excel').load_workbook(ruta_archivo)
             hoja = libro.active
             
             for fila in hoja.iter_rows(min_row=2, values_only=True):
@@ -69,7 +69,7 @@ class FileLoader:
         temas = []
         
         try:
-            doc = Document(ruta_archivo)
+            doc = obtener_backend('docx').Document(ruta_archivo)
             
             for parrafo in doc.paragraphs:
                 texto = parrafo.text.strip()
@@ -0,0 +1,80 @@
+"""
+Caché de iconos redimensionados
+Evita decodificar y redimensionar los PNG originales en cada inicio
+"""
+
+import hashlib
+import os
+from typing import Optional, Tuple
+
+from PIL import Image
+
+
+class IconCache:
+    """Guarda versiones pequeñas de los iconos en un directorio de caché"""
+
+    def __init__(self, directorio: str = os.path.join(".cache", "iconos")):
+        self.directorio = directorio
+
+    def _prefijo(self, ruta: str, tamaño: Tuple[int, int]) -> str:
+        """Prefijo común a todas las versiones de un icono y tamaño"""
+        ruta_abs = os.path.abspath(ruta)
+        hash_ruta = hashlib.sha1(ruta_abs.encode('utf-8')).hexdigest()[:16]
+        return f"{hash_ruta}_{tamaño[0]}x{tamaño[1]}_"
+
+    def _ruta_cache(self, ruta: str, tamaño: Tuple[int, int]) -> str:
+        """Ruta del archivo en caché según ruta, fecha de modificación y tamaño del original"""
+        info = os.stat(ruta)
+        firma = f"{info.st_mtime_ns}:{info.st_size}"
+        hash_firma = hashlib.sha1(firma.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.directorio, f"{self._prefijo(ruta, tamaño)}{hash_firma}.png")
+
+    def obtener_imagen(self, ruta: str, tamaño: Tuple[int, int]) -> Optional[Image.Image]:
+        """
+        Obtiene la imagen redimensionada, usando la caché si está vigente
+
+        Returns:
+            Imagen PIL del tamaño pedido, o None si el original no existe
+        """
+        if not os.path.exists(ruta):
+            return None
+
+        ruta_cache = self._ruta_cache(ruta, tamaño)
+
+        if os.path.exists(ruta_cache):
+            try:
+                img = Image.open(ruta_cache)
+                img.load()
+                return img
+            except Exception as e:
+                print(f"[ERROR] Caché de icono inválida {ruta_cache}: {e}")
+
+        # Generar la versión pequeña y guardarla
+        img = Image.open(ruta)
+        img = img.resize(tamaño, Image.Resampling.LANCZOS)
+        self._guardar(img, ruta, tamaño, ruta_cache)
+        return img
+
+    def _guardar(self, img: Image.Image, ruta: str, tamaño: Tuple[int, int], ruta_cache: str):
+        """Guarda la imagen en caché y borra las versiones anteriores del mismo icono"""
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+
+            prefijo = self._prefijo(ruta, tamaño)
+            for nombre in os.listdir(self.directorio):
+                if nombre.startswith(prefijo):
+                    os.remove(os.path.join(self.directorio, nombre))
+
+            # Escribir en un temporal y renombrar para no dejar archivos a medias
+            temporal = ruta_cache + ".tmp"
+            img.save(temporal, format='PNG')
+            os.replace(temporal, ruta_cache)
+        except OSError as e:
+            print(f"[ERROR] No se pudo guardar el icono en caché: {e}")
+
+    def limpiar(self):
+        """Elimina todos los iconos en caché"""
+        if not os.path.isdir(self.directorio):
+            return
+        for nombre in os.listdir(self.directorio):
+            os.remove(os.path.join(self.directorio, nombre))
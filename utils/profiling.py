@@ -0,0 +1,333 @@
+"""
+Perfilado opcional de la aplicación
+Mide el inicio y cada acción de la interfaz, con cantidad de consultas SQL
+
+El trabajo que una acción deja en el hilo de la base (ver
+DatabaseAsincrona.enviar) se cuenta dentro de esa acción: sus spans cuelgan
+de ella en las pilas plegadas y su tiempo y consultas entran en su resumen.
+
+Se activa con la variable de entorno ORDEN_DIA_PERFIL=1 (o main.py --perfil).
+Con ORDEN_DIA_PERFIL_OVERLAY=1 (o --perfil-overlay) además se muestra en la
+ventana la latencia y las consultas de la última acción.
+"""
+
+import cProfile
+import functools
+import inspect
+import json
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+ENV_PERFIL = 'ORDEN_DIA_PERFIL'
+ENV_OVERLAY = 'ORDEN_DIA_PERFIL_OVERLAY'
+
+# Sentencias de control de transacciones que no cuentan como consultas
+_SENTENCIAS_CONTROL = ('BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE')
+
+
+def _activado(valor: Optional[str]) -> bool:
+    return bool(valor) and valor.strip().lower() not in ('0', 'false', 'no', '')
+
+
+class _Accion:
+    """Totales de una acción de la interfaz, incluido lo que corrió en otros hilos"""
+
+    __slots__ = ('inicio', 'fin', 'consultas', 'segundo_plano', 'resumen')
+
+    def __init__(self, inicio: float):
+        self.inicio = inicio
+        self.fin = inicio
+        self.consultas = 0
+        self.segundo_plano = 0.0
+        self.resumen: Optional[Dict] = None
+
+
+class _Span:
+    """Intervalo de tiempo abierto en la pila del perfilador"""
+
+    __slots__ = ('nombre', 'inicio', 'tiempo_hijos', 'consultas', 'accion', 'prefijo')
+
+    def __init__(self, nombre: str, accion: Optional[_Accion] = None, prefijo: Tuple[str, ...] = ()):
+        self.nombre = nombre
+        self.inicio = time.perf_counter()
+        self.tiempo_hijos = 0.0
+        self.consultas = 0
+        # Solo en el primer span de la pila: la acción a la que pertenece y,
+        # si continúa una acción en otro hilo, la ruta desde la que se envió
+        self.accion = accion
+        self.prefijo = prefijo
+
+
+# Acción y ruta de spans capturadas al enviar trabajo a otro hilo
+Contexto = Tuple[_Accion, Tuple[str, ...]]
+
+
+class Perfilador:
+    """Registra spans anidados de acciones y métodos de la base de datos"""
+
+    def __init__(self, directorio: str = "perfil", mostrar_overlay: bool = False):
+        self.directorio = directorio
+        self.mostrar_overlay = mostrar_overlay
+        self.perfil = cProfile.Profile()
+        self.acciones: List[Dict] = []
+        self.al_terminar_accion: Optional[Callable[[Dict], None]] = None
+
+        # Cada hilo tiene su pila; el trabajo enviado desde una acción abre
+        # en el otro hilo una continuación que suma a esa acción
+        self._local = threading.local()
+        self._hilo_interfaz = threading.get_ident()
+        self._lock = threading.Lock()
+        self._activo = False
+        self._perfiles_hilos: List[cProfile.Profile] = []
+        self._pilas_plegadas: Dict[str, float] = defaultdict(float)
+        self._consultas_fuera_de_accion = 0
+
+    @classmethod
+    def desde_entorno(cls) -> Optional['Perfilador']:
+        """Crea un perfilador si está activado por variable de entorno"""
+        if not _activado(os.environ.get(ENV_PERFIL)):
+            return None
+        return cls(mostrar_overlay=_activado(os.environ.get(ENV_OVERLAY)))
+
+    # === SPANS ===
+
+    @property
+    def _pila(self) -> List[_Span]:
+        """Pila de spans del hilo actual"""
+        pila = getattr(self._local, 'pila', None)
+        if pila is None:
+            pila = self._local.pila = []
+        return pila
+
+    def iniciar(self):
+        """Comienza la captura de cProfile"""
+        self._activo = True
+        self.perfil.enable()
+
+    def detener(self):
+        """Detiene la captura de cProfile"""
+        self._activo = False
+        self.perfil.disable()
+
+    def _perfil_del_hilo(self) -> Optional[cProfile.Profile]:
+        """
+        Perfil de cProfile propio del hilo actual (None en el de la interfaz)
+
+        Hasta Python 3.11 cProfile solo mide el hilo que lo activó, así que
+        cada hilo de trabajo tiene el suyo y volcar() los junta. Desde 3.12 el
+        perfil principal ya mide todos los hilos y no admite un segundo activo.
+        """
+        if not self._activo or threading.get_ident() == self._hilo_interfaz:
+            return None
+        if not hasattr(self._local, 'perfil'):
+            perfil = cProfile.Profile()
+            try:
+                perfil.enable()
+                perfil.disable()
+            except ValueError:
+                perfil = None
+            else:
+                with self._lock:
+                    self._perfiles_hilos.append(perfil)
+            self._local.perfil = perfil
+        return self._local.perfil
+
+    def abrir_span(self, nombre: str):
+        """Abre un span anidado dentro del actual"""
+        if self._pila:
+            self._pila.append(_Span(nombre))
+        else:
+            self._pila.append(_Span(nombre, accion=_Accion(time.perf_counter())))
+
+    def cerrar_span(self):
+        """Cierra el último span abierto y acumula sus tiempos"""
+        span = self._pila.pop()
+        fin = time.perf_counter()
+        duracion = fin - span.inicio
+
+        raiz = self._pila[0] if self._pila else span
+        ruta = ";".join(raiz.prefijo + tuple(s.nombre for s in self._pila) + (span.nombre,))
+        with self._lock:
+            self._pilas_plegadas[ruta] += max(duracion - span.tiempo_hijos, 0.0)
+
+        if self._pila:
+            padre = self._pila[-1]
+            padre.tiempo_hijos += duracion
+            padre.consultas += span.consultas
+            return
+
+        # Primer span de la pila: una acción de la interfaz o una continuación
+        en_interfaz = threading.get_ident() == self._hilo_interfaz
+        accion = span.accion
+        with self._lock:
+            accion.consultas += span.consultas
+            accion.fin = max(accion.fin, fin)
+            if not en_interfaz:
+                accion.segundo_plano += duracion
+            if accion.resumen is None and not span.prefijo:
+                accion.resumen = {'accion': span.nombre, 'inicio': accion.inicio}
+                self.acciones.append(accion.resumen)
+            # La continuación puede terminar antes que la acción que la envió
+            resumen = accion.resumen
+            if resumen is not None:
+                resumen.update({
+                    'duracion_ms': (accion.fin - accion.inicio) * 1000,
+                    'segundo_plano_ms': accion.segundo_plano * 1000,
+                    'consultas': accion.consultas,
+                })
+                resumen = dict(resumen)
+        # El overlay es de Tk: solo se notifica desde el hilo de la interfaz
+        if resumen is not None and self.al_terminar_accion and en_interfaz:
+            try:
+                self.al_terminar_accion(resumen)
+            except Exception as e:
+                print(f"[ERROR] Error notificando acción perfilada: {e}")
+
+    def capturar(self) -> Optional[Contexto]:
+        """Acción y ruta de spans actuales, para continuarlas desde otro hilo"""
+        pila = self._pila
+        if not pila:
+            return None
+        return pila[0].accion, pila[0].prefijo + tuple(s.nombre for s in pila)
+
+    def continuar(self, contexto: Optional[Contexto], funcion: Callable, nombre: str) -> Callable:
+        """
+        Devuelve la función envuelta para correr como parte de otra acción
+
+        La envoltura abre un span `nombre` que cuelga de la ruta capturada y
+        suma su tiempo y consultas a la acción. En un hilo de trabajo, además,
+        activa el perfil de cProfile de ese hilo. Sin contexto (no había
+        ninguna acción abierta) solo se perfila.
+        """
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            perfil = self._perfil_del_hilo()
+            if perfil is not None:
+                perfil.enable()
+            if contexto is not None:
+                accion, prefijo = contexto
+                if self._pila:
+                    self.abrir_span(nombre)
+                else:
+                    self._pila.append(_Span(nombre, accion=accion, prefijo=prefijo))
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                if contexto is not None:
+                    self.cerrar_span()
+                if perfil is not None:
+                    perfil.disable()
+        return envoltura
+
+    def envolver(self, funcion: Callable, nombre: str) -> Callable:
+        """Devuelve la función envuelta en un span con el nombre dado"""
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            self.abrir_span(nombre)
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                self.cerrar_span()
+        return envoltura
+
+    def instrumentar(self, objeto, prefijo: str, solo_publicos: bool = False,
+                     excluir: Iterable[str] = ()):
+        """
+        Reemplaza los métodos de la instancia por versiones con span
+
+        Debe llamarse antes de conectar los métodos a botones o eventos.
+        """
+        excluir = set(excluir)
+        for nombre, metodo in inspect.getmembers(objeto, inspect.ismethod):
+            if nombre.startswith('__') or nombre in excluir:
+                continue
+            if solo_publicos and nombre.startswith('_'):
+                continue
+            setattr(objeto, nombre, self.envolver(metodo, f"{prefijo}.{nombre}"))
+
+    # === CONSULTAS ===
+
+    def registrar_consulta(self, sql: str):
+        """Callback de traza SQL: cuenta la consulta en el span actual"""
+        if sql.lstrip().upper().startswith(_SENTENCIAS_CONTROL):
+            return
+        if self._pila:
+            self._pila[-1].consultas += 1
+        else:
+            self._consultas_fuera_de_accion += 1
+
+    # === RESULTADOS ===
+
+    def resumen_por_accion(self) -> List[Dict]:
+        """Agrupa las acciones por nombre: cantidad, tiempos y consultas"""
+        grupos: Dict[str, List[Dict]] = defaultdict(list)
+        for accion in self.acciones:
+            grupos[accion['accion']].append(accion)
+
+        resumen = []
+        for nombre, lista in grupos.items():
+            duraciones = [a['duracion_ms'] for a in lista]
+            resumen.append({
+                'accion': nombre,
+                'veces': len(lista),
+                'total_ms': sum(duraciones),
+                'max_ms': max(duraciones),
+                'consultas_promedio': sum(a['consultas'] for a in lista) / len(lista),
+            })
+        resumen.sort(key=lambda r: r['total_ms'], reverse=True)
+        return resumen
+
+    def volcar(self, extra: Optional[Dict] = None) -> Dict[str, str]:
+        """
+        Escribe los resultados en el directorio de perfil
+
+        Args:
+            extra: Datos adicionales a incluir en el JSON (p. ej. estadísticas SQL)
+
+        Returns:
+            Diccionario con las rutas de los archivos generados:
+            - 'prof': estadísticas de cProfile (pstats, snakeviz, flameprof)
+            - 'folded': pilas plegadas en microsegundos (flamegraph.pl, speedscope)
+            - 'json': acciones registradas y resumen por acción
+        """
+        self.detener()
+        os.makedirs(self.directorio, exist_ok=True)
+        base = os.path.join(self.directorio, f"perfil_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+        archivos = {
+            'prof': base + ".prof",
+            'folded': base + ".folded",
+            'json': base + ".json",
+        }
+
+        # El perfil de la interfaz más los de los hilos de trabajo
+        estadisticas = pstats.Stats(self.perfil)
+        with self._lock:
+            perfiles_hilos = list(self._perfiles_hilos)
+        for perfil in perfiles_hilos:
+            perfil.create_stats()
+            if perfil.stats:
+                estadisticas.add(perfil)
+        estadisticas.dump_stats(archivos['prof'])
+
+        with open(archivos['folded'], 'w', encoding='utf-8') as f:
+            for ruta, segundos in sorted(self._pilas_plegadas.items()):
+                microsegundos = int(segundos * 1_000_000)
+                if microsegundos > 0:
+                    f.write(f"{ruta} {microsegundos}\n")
+
+        with open(archivos['json'], 'w', encoding='utf-8') as f:
+            json.dump({
+                'acciones': self.acciones,
+                'resumen': self.resumen_por_accion(),
+                'consultas_fuera_de_accion': self._consultas_fuera_de_accion,
+                **(extra or {}),
+            }, f, indent=2, ensure_ascii=False)
+
+        return archivos
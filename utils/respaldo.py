@@ -0,0 +1,195 @@
+"""
+Respaldos en caliente de la base con la API de backup de sqlite3
+
+La copia se hace de a tramos de páginas: entre tramos la base queda libre, así
+la aplicación puede seguir leyendo y guardando mientras se respalda. Cada copia
+se verifica con PRAGMA integrity_check antes de darla por buena y se conservan
+solo los últimos respaldos.
+"""
+
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Intervalo del respaldo automático de la interfaz (0 lo desactiva)
+ENV_RESPALDO_HORAS = 'ORDEN_DIA_RESPALDO_HORAS'
+HORAS_ENTRE_RESPALDOS = 24
+
+# Carpeta de respaldos, al lado de la base: en una carpeta compartida todas
+# las terminales usan el mismo juego de respaldos y la misma rotación
+DIRECTORIO_RESPALDOS = "respaldos"
+RESPALDOS_A_CONSERVAR = 10
+
+# Páginas copiadas por paso y pausa entre pasos (segundos)
+PAGINAS_POR_PASO = 256
+PAUSA_ENTRE_PASOS = 0.005
+
+# Con microsegundos: dos respaldos en el mismo segundo no se pisan
+_FORMATO_MARCA = "%Y%m%d_%H%M%S_%f"
+_LARGO_SEGUNDOS = len("20260101_120000")
+
+
+def _patron_respaldos(base: str) -> "re.Pattern":
+    # Los respaldos anteriores no tienen microsegundos en la marca
+    return re.compile(re.escape(base) + r"_(\d{8}_\d{6}(?:_\d{6})?)(_archivo)?\.db$")
+
+
+def directorio_respaldos(db) -> str:
+    """Carpeta de respaldos por defecto: 'respaldos' junto al archivo de la base"""
+    return os.path.join(os.path.dirname(os.path.abspath(db.db_path)), DIRECTORIO_RESPALDOS)
+
+
+def copiar_base(origen: str, destino: str, paginas_por_paso: int = PAGINAS_POR_PASO,
+                pausa: float = PAUSA_ENTRE_PASOS,
+                progreso: Optional[Callable[[int, int], None]] = None,
+                timeout: float = 5.0) -> Dict:
+    """
+    Copia una base abierta por otros procesos sin bloquearlos
+
+    Si otra conexión escribe entre dos pasos, sqlite3 reinicia la copia desde
+    el principio, así el resultado siempre es un estado consistente.
+
+    Args:
+        progreso: Función (restantes, total) llamada después de cada paso
+
+    Returns:
+        Dict con 'archivo', 'paginas', 'segundos' e 'integridad'
+    """
+    inicio = time.perf_counter()
+    total = {'paginas': 0}
+
+    def _progreso(estado, restantes, paginas):
+        total['paginas'] = paginas
+        if progreso:
+            progreso(restantes, paginas)
+
+    temporal = destino + ".parcial"
+    if os.path.exists(temporal):
+        os.remove(temporal)
+
+    conn_origen = sqlite3.connect(origen, timeout=timeout)
+    conn_destino = sqlite3.connect(temporal)
+    try:
+        conn_origen.backup(conn_destino, pages=paginas_por_paso, progress=_progreso, sleep=pausa)
+        # La copia hereda el modo WAL de la base; un respaldo debe ser un único archivo
+        conn_destino.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        conn_destino.close()
+        conn_origen.close()
+
+    errores = verificar_respaldo(temporal)
+    if errores:
+        os.remove(temporal)
+        raise RuntimeError(f"El respaldo de {origen} no pasó la verificación: {'; '.join(errores)}")
+
+    os.replace(temporal, destino)
+    return {
+        'archivo': destino,
+        'paginas': total['paginas'],
+        'segundos': time.perf_counter() - inicio,
+        'integridad': 'ok',
+    }
+
+
+def verificar_respaldo(archivo: str) -> List[str]:
+    """
+    Ejecuta PRAGMA integrity_check sobre un respaldo
+
+    Returns:
+        Lista de problemas encontrados (vacía si el archivo está sano)
+    """
+    try:
+        conn = sqlite3.connect(f"file:{archivo}?mode=ro", uri=True)
+        try:
+            filas = [fila[0] for fila in conn.execute("PRAGMA integrity_check").fetchall()]
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError as e:
+        return [str(e)]
+    return [] if filas == ['ok'] else filas
+
+
+def crear_respaldo(db, directorio: Optional[str] = None,
+                   conservar: int = RESPALDOS_A_CONSERVAR,
+                   paginas_por_paso: int = PAGINAS_POR_PASO,
+                   progreso: Optional[Callable[[int, int], None]] = None) -> List[Dict]:
+    """
+    Respalda la base (y el archivo de reuniones, si existe) y rota los respaldos viejos
+
+    Args:
+        directorio: Carpeta de respaldos (por defecto, directorio_respaldos(db))
+
+    Returns:
+        Un Dict por archivo copiado (ver copiar_base)
+    """
+    directorio = directorio or directorio_respaldos(db)
+    os.makedirs(directorio, exist_ok=True)
+    base = os.path.splitext(os.path.basename(db.db_path))[0]
+    marca = datetime.now().strftime(_FORMATO_MARCA)
+    # Otra terminal pudo respaldar en el mismo microsegundo
+    while os.path.exists(os.path.join(directorio, f"{base}_{marca}.db")):
+        time.sleep(0.001)
+        marca = datetime.now().strftime(_FORMATO_MARCA)
+    timeout = int(db.pragmas.get('busy_timeout', 5000)) / 1000
+
+    resultados = [copiar_base(db.db_path, os.path.join(directorio, f"{base}_{marca}.db"),
+                              paginas_por_paso, progreso=progreso, timeout=timeout)]
+    if os.path.exists(db.ruta_archivo):
+        resultados.append(copiar_base(db.ruta_archivo,
+                                      os.path.join(directorio, f"{base}_{marca}_archivo.db"),
+                                      paginas_por_paso, progreso=progreso, timeout=timeout))
+
+    rotar_respaldos(directorio, base, conservar)
+    return resultados
+
+
+def listar_respaldos(directorio: str, base: str) -> List[str]:
+    """Marcas de tiempo de los respaldos de `base`, del más nuevo al más viejo"""
+    if not os.path.isdir(directorio):
+        return []
+    patron = _patron_respaldos(base)
+    marcas = {m.group(1) for m in map(patron.match, os.listdir(directorio)) if m}
+    return sorted(marcas, reverse=True)
+
+
+def rotar_respaldos(directorio: str, base: str, conservar: int = RESPALDOS_A_CONSERVAR) -> List[str]:
+    """
+    Borra los respaldos más viejos dejando los últimos `conservar`
+
+    Returns:
+        Archivos borrados
+    """
+    viejas = set(listar_respaldos(directorio, base)[max(conservar, 1):])
+    patron = _patron_respaldos(base)
+    borrados = []
+    for nombre in os.listdir(directorio):
+        m = patron.match(nombre)
+        if m and m.group(1) in viejas:
+            os.remove(os.path.join(directorio, nombre))
+            borrados.append(nombre)
+    return borrados
+
+
+def horas_desde_ultimo_respaldo(db, directorio: Optional[str] = None) -> Optional[float]:
+    """Antigüedad del último respaldo en horas (None si no hay ninguno)"""
+    base = os.path.splitext(os.path.basename(db.db_path))[0]
+    marcas = listar_respaldos(directorio or directorio_respaldos(db), base)
+    if not marcas:
+        return None
+    ultimo = datetime.strptime(marcas[0][:_LARGO_SEGUNDOS], "%Y%m%d_%H%M%S")
+    return (datetime.now() - ultimo).total_seconds() / 3600
+
+
+def respaldo_pendiente(db, directorio: Optional[str] = None) -> bool:
+    """True si el respaldo automático está activo y ya pasó el intervalo"""
+    try:
+        intervalo = float(os.environ.get(ENV_RESPALDO_HORAS, HORAS_ENTRE_RESPALDOS))
+    except ValueError:
+        intervalo = HORAS_ENTRE_RESPALDOS
+    if intervalo <= 0:
+        return False
+    horas = horas_desde_ultimo_respaldo(db, directorio)
+    return horas is None or horas >= intervalo
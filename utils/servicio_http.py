@@ -0,0 +1,382 @@
+"""
+Servicio HTTP local para consultar reuniones y generar órdenes del día
+
+Pensado para otras herramientas internas: escucha por defecto solo en
+127.0.0.1 y responde JSON, salvo los documentos, que se envían como bytes.
+
+    GET  /reuniones?q=&limite=&desde=&archivo=1   Historial o búsqueda
+    GET  /reuniones/<id>/temas                    Orden del día de una reunión
+    GET  /reuniones/<id>/documento?formato=pdf&version=N
+                                                  Documento regenerado desde su instantánea
+    GET  /temas/<id>/historial?archivo=1          Uso de un tema en las reuniones
+    POST /documentos?formato=docx                 Documento a partir de datos JSON
+    GET  /metricas                                Latencia por ruta
+
+Las consultas a SQLite corren en un pool de hilos y los documentos en un pool
+de procesos, así el bucle de asyncio solo reparte trabajo. Con más de
+`limite_solicitudes` en curso se responde 503 en lugar de encolar.
+"""
+
+import asyncio
+import itertools
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import closing
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from models.database import Database
+from models.instrumentacion import HistogramaLatencia
+from utils.document_generator import DocumentGenerator
+
+HOST_POR_DEFECTO = "127.0.0.1"
+PUERTO_POR_DEFECTO = 8765
+LIMITE_SOLICITUDES = 32
+HILOS_CONSULTAS = 4
+
+# Reuniones por respuesta de /reuniones
+LIMITE_LISTADO = 100
+MAXIMO_LISTADO = 1000
+
+MAXIMO_CUERPO = 1024 * 1024
+MAXIMO_CABECERAS = 64 * 1024
+# Conexiones keep-alive sin actividad se cierran pasado este tiempo
+ESPERA_INACTIVA = 15
+# Los documentos se escriben en el socket de a trozos
+TAMAÑO_TROZO = 64 * 1024
+
+_TIPOS = {
+    'json': "application/json; charset=utf-8",
+    'pdf': "application/pdf",
+    'docx': "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+_MOTIVOS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+# Generador de cada proceso del pool (se crea la primera vez que se usa)
+_generador: Optional[DocumentGenerator] = None
+
+
+def _generar_documento(datos: Dict, formato: str) -> bytes:
+    global _generador
+    if _generador is None:
+        _generador = DocumentGenerator(output_dir=None)
+    return _generador.generar_bytes(datos, formato)
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class Respuesta(NamedTuple):
+    estado: int
+    tipo: str
+    cuerpo: bytes
+    cabeceras: Tuple[Tuple[str, str], ...] = ()
+
+
+def _json(estado: int, datos) -> Respuesta:
+    return Respuesta(estado, _TIPOS['json'], json.dumps(datos, ensure_ascii=False).encode('utf-8'))
+
+
+def _entero(parametros: Dict[str, List[str]], nombre: str, defecto: Optional[int] = None) -> Optional[int]:
+    valores = parametros.get(nombre)
+    if not valores:
+        return defecto
+    try:
+        return int(valores[0])
+    except ValueError:
+        raise ErrorHTTP(400, f"'{nombre}' debe ser un número entero")
+
+
+def _formato(parametros: Dict[str, List[str]]) -> str:
+    formato = parametros.get('formato', ['pdf'])[0]
+    if formato not in ('pdf', 'docx'):
+        raise ErrorHTTP(400, "'formato' debe ser pdf o docx")
+    return formato
+
+
+class MetricaRuta:
+    """Acumulado de una ruta: llamadas, errores y latencia"""
+
+    __slots__ = ('llamadas', 'errores', 'histograma')
+
+    def __init__(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.histograma = HistogramaLatencia()
+
+
+class ServicioHTTP:
+    """Servidor HTTP/1.1 mínimo sobre asyncio, con Database y DocumentGenerator detrás"""
+
+    def __init__(self, db: Database, procesos: Optional[int] = None,
+                 limite_solicitudes: int = LIMITE_SOLICITUDES,
+                 hilos_consultas: int = HILOS_CONSULTAS):
+        self.db = db
+        self.procesos = procesos
+        self.limite_solicitudes = limite_solicitudes
+        self.puerto: Optional[int] = None
+        self.en_curso = 0
+        self.rechazadas = 0
+        self.metricas: Dict[str, MetricaRuta] = {}
+        self._hilos = ThreadPoolExecutor(hilos_consultas, thread_name_prefix="consultas-http")
+        self._pool_documentos: Optional[ProcessPoolExecutor] = None
+
+        # (método, patrón, nombre en /metricas, manejador)
+        self._rutas = [
+            ('GET', re.compile(r"/reuniones"), "GET /reuniones", self._listar_reuniones),
+            ('GET', re.compile(r"/reuniones/(\d+)/temas"), "GET /reuniones/{id}/temas",
+             self._temas_reunion),
+            ('GET', re.compile(r"/reuniones/(\d+)/documento"), "GET /reuniones/{id}/documento",
+             self._documento_reunion),
+            ('GET', re.compile(r"/temas/(\d+)/historial"), "GET /temas/{id}/historial",
+             self._historial_tema),
+            ('POST', re.compile(r"/documentos"), "POST /documentos", self._generar),
+            ('GET', re.compile(r"/metricas"), "GET /metricas", self._metricas),
+        ]
+
+    # === CICLO DE VIDA ===
+
+    async def iniciar(self, host: str = HOST_POR_DEFECTO, puerto: int = PUERTO_POR_DEFECTO):
+        """Empieza a escuchar (puerto 0 elige uno libre, queda en self.puerto)"""
+        servidor = await asyncio.start_server(self._atender_conexion, host, puerto,
+                                              limit=MAXIMO_CABECERAS)
+        self.puerto = servidor.sockets[0].getsockname()[1]
+        return servidor
+
+    def servir(self, host: str = HOST_POR_DEFECTO, puerto: int = PUERTO_POR_DEFECTO):
+        """Atiende hasta Ctrl+C"""
+        async def principal():
+            servidor = await self.iniciar(host, puerto)
+            print(f"[OK] Servicio escuchando en http://{host}:{self.puerto}")
+            async with servidor:
+                await servidor.serve_forever()
+
+        try:
+            asyncio.run(principal())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.cerrar()
+
+    def cerrar(self):
+        self._hilos.shutdown(wait=False)
+        if self._pool_documentos is not None:
+            self._pool_documentos.shutdown(wait=True)
+            self._pool_documentos = None
+
+    # === HTTP ===
+
+    async def _atender_conexion(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    cabecera = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), ESPERA_INACTIVA)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._escribir(writer, _json(400, {'error': "Cabeceras demasiado largas"}), False)
+                    break
+
+                try:
+                    metodo, destino, cabeceras = self._leer_cabecera(cabecera)
+                    largo = self._largo_cuerpo(cabeceras)
+                except ErrorHTTP as e:
+                    # Sin saber dónde termina la solicitud no se puede seguir con la conexión
+                    await self._escribir(writer, _json(e.estado, {'error': str(e)}), False)
+                    break
+                cuerpo = await reader.readexactly(largo) if largo else b""
+
+                respuesta = await self.atender(metodo, destino, cuerpo)
+                seguir = cabeceras.get('connection', '').lower() != 'close'
+                await self._escribir(writer, respuesta, seguir)
+                if not seguir:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _leer_cabecera(cabecera: bytes) -> Tuple[str, str, Dict[str, str]]:
+        lineas = cabecera.decode('latin-1').split("\r\n")
+        partes = lineas[0].split(" ")
+        if len(partes) != 3 or not partes[1].startswith("/") or not partes[2].startswith("HTTP/"):
+            raise ErrorHTTP(400, "Línea de solicitud inválida")
+        metodo, destino, _ = partes
+        cabeceras = {}
+        for linea in lineas[1:]:
+            if ":" in linea:
+                nombre, valor = linea.split(":", 1)
+                cabeceras[nombre.strip().lower()] = valor.strip()
+        return metodo.upper(), destino, cabeceras
+
+    @staticmethod
+    def _largo_cuerpo(cabeceras: Dict[str, str]) -> int:
+        valor = cabeceras.get('content-length', "0") or "0"
+        # int() aceptaría '-5' o ' +5'; solo se admiten dígitos
+        if not (valor.isascii() and valor.isdigit()):
+            raise ErrorHTTP(400, "Content-Length inválido")
+        largo = int(valor)
+        if largo > MAXIMO_CUERPO:
+            raise ErrorHTTP(413, "Cuerpo demasiado grande")
+        return largo
+
+    @staticmethod
+    async def _escribir(writer: asyncio.StreamWriter, respuesta: Respuesta, seguir: bool):
+        estado = respuesta.estado
+        lineas = [
+            f"HTTP/1.1 {estado} {_MOTIVOS.get(estado, '')}",
+            f"Content-Type: {respuesta.tipo}",
+            f"Content-Length: {len(respuesta.cuerpo)}",
+            f"Connection: {'keep-alive' if seguir else 'close'}",
+        ]
+        lineas.extend(f"{nombre}: {valor}" for nombre, valor in respuesta.cabeceras)
+        writer.write(("\r\n".join(lineas) + "\r\n\r\n").encode('latin-1'))
+        # Trozo a trozo, esperando al cliente: un PDF grande no se copia entero al buffer
+        vista = memoryview(respuesta.cuerpo)
+        for inicio in range(0, len(vista), TAMAÑO_TROZO):
+            writer.write(vista[inicio:inicio + TAMAÑO_TROZO])
+            await writer.drain()
+        await writer.drain()
+
+    async def atender(self, metodo: str, destino: str, cuerpo: bytes = b"") -> Respuesta:
+        """
+        Resuelve una solicitud sin pasar por el socket (lo usan las pruebas)
+
+        Registra la latencia en la métrica de la ruta, incluidas las que fallan.
+        """
+        url = urlsplit(destino)
+        ruta = url.path.rstrip("/") or "/"
+        parametros = parse_qs(url.query)
+
+        encontrada = None
+        otro_metodo = False
+        for metodo_ruta, patron, nombre, manejador in self._rutas:
+            coincidencia = patron.fullmatch(ruta)
+            if coincidencia:
+                if metodo_ruta == metodo:
+                    encontrada = (nombre, manejador, coincidencia.groups())
+                    break
+                otro_metodo = True
+        if encontrada is None:
+            if otro_metodo:
+                return _json(405, {'error': f"Método {metodo} no permitido en {ruta}"})
+            return _json(404, {'error': f"No existe {ruta}"})
+
+        nombre, manejador, argumentos = encontrada
+        if self.en_curso >= self.limite_solicitudes:
+            self.rechazadas += 1
+            return _json(503, {'error': "Servicio ocupado, reintente"})._replace(
+                cabeceras=(("Retry-After", "1"),))
+
+        metrica = self.metricas.get(nombre)
+        if metrica is None:
+            metrica = self.metricas[nombre] = MetricaRuta()
+        self.en_curso += 1
+        inicio = time.perf_counter()
+        try:
+            respuesta = await manejador(parametros, cuerpo, *(int(a) for a in argumentos))
+        except ErrorHTTP as e:
+            respuesta = _json(e.estado, {'error': str(e)})
+        except Exception as e:
+            print(f"[ERROR] {metodo} {destino}: {e}")
+            respuesta = _json(500, {'error': str(e) or type(e).__name__})
+        finally:
+            self.en_curso -= 1
+        metrica.llamadas += 1
+        if respuesta.estado >= 400:
+            metrica.errores += 1
+        metrica.histograma.registrar(time.perf_counter() - inicio)
+        return respuesta
+
+    async def _en_hilo(self, funcion, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._hilos, funcion, *args)
+
+    async def _renderizar(self, datos: Dict, formato: str) -> Respuesta:
+        if self._pool_documentos is None:
+            self._pool_documentos = ProcessPoolExecutor(self.procesos)
+        contenido = await asyncio.get_running_loop().run_in_executor(
+            self._pool_documentos, _generar_documento, datos, formato
+        )
+        return Respuesta(200, _TIPOS[formato], contenido)
+
+    # === RUTAS ===
+
+    async def _listar_reuniones(self, parametros, cuerpo) -> Respuesta:
+        termino = parametros.get('q', [""])[0].strip()
+        limite = min(max(_entero(parametros, 'limite', LIMITE_LISTADO), 1), MAXIMO_LISTADO)
+        desde = max(_entero(parametros, 'desde', 0), 0)
+        archivo = parametros.get('archivo', ["0"])[0] == "1"
+
+        def consultar():
+            if termino:
+                filas = self.db.iterar_busqueda_reuniones(termino, incluir_archivo=archivo)
+            else:
+                filas = self.db.iterar_reuniones(incluir_archivo=archivo)
+            # Se leen solo las filas de la página pedida
+            with closing(filas):
+                return [dict(r.items()) for r in itertools.islice(filas, desde, desde + limite)]
+
+        reuniones = await self._en_hilo(consultar)
+        return _json(200, {'reuniones': reuniones, 'desde': desde, 'limite': limite})
+
+    async def _temas_reunion(self, parametros, cuerpo, reunion_id: int) -> Respuesta:
+        archivo = parametros.get('archivo', ["0"])[0] == "1"
+        temas = await self._en_hilo(self.db.obtener_temas_reunion, reunion_id, False, archivo)
+        return _json(200, {'reunion_id': reunion_id, 'temas': [dict(t.items()) for t in temas]})
+
+    async def _historial_tema(self, parametros, cuerpo, tema_id: int) -> Respuesta:
+        archivo = parametros.get('archivo', ["0"])[0] == "1"
+        tema = await self._en_hilo(self.db.obtener_tema, tema_id)
+        if tema is None:
+            raise ErrorHTTP(404, f"No existe el tema {tema_id}")
+        historial = await self._en_hilo(self.db.obtener_historial_tema, tema_id, archivo)
+        estadisticas = await self._en_hilo(self.db.obtener_estadisticas_tema, tema_id, archivo)
+        return _json(200, {'tema': dict(tema.items()), 'estadisticas': estadisticas,
+                           'historial': historial})
+
+    async def _documento_reunion(self, parametros, cuerpo, reunion_id: int) -> Respuesta:
+        formato = _formato(parametros)
+        version = _entero(parametros, 'version')
+        datos = await self._en_hilo(self.db.obtener_instantanea, reunion_id, version)
+        if datos is None:
+            detalle = f" versión {version}" if version is not None else ""
+            raise ErrorHTTP(404, f"La reunión {reunion_id}{detalle} no tiene datos guardados")
+        return await self._renderizar(datos, formato)
+
+    async def _generar(self, parametros, cuerpo) -> Respuesta:
+        formato = _formato(parametros)
+        try:
+            datos = json.loads(cuerpo.decode('utf-8'))
+        except ValueError:
+            raise ErrorHTTP(400, "El cuerpo debe ser JSON (UTF-8)")
+        if not isinstance(datos, dict):
+            raise ErrorHTTP(400, "El cuerpo debe ser un objeto JSON con los datos de la reunión")
+        faltantes = [c for c in ('fecha', 'hora', 'lugar', 'orden_dia') if c not in datos]
+        if faltantes:
+            raise ErrorHTTP(400, f"Faltan campos: {', '.join(faltantes)}")
+        # Los clientes no eligen archivos del disco del servidor
+        datos['imagen_logo'] = None
+        datos.pop('logo_bytes', None)
+        datos.setdefault('delegados', [])
+        datos.setdefault('presidente', "")
+        datos.setdefault('secretario', "")
+        return await self._renderizar(datos, formato)
+
+    async def _metricas(self, parametros, cuerpo) -> Respuesta:
+        rutas = {nombre: {
+            'llamadas': m.llamadas,
+            'errores': m.errores,
+            'p50_ms': m.histograma.percentil(50) * 1000,
+            'p99_ms': m.histograma.percentil(99) * 1000,
+            'max_ms': m.histograma.maximo * 1000,
+        } for nombre, m in self.metricas.items()}
+        return _json(200, {'rutas': rutas, 'en_curso': self.en_curso,
+                           'rechazadas': self.rechazadas,
+                           'limite_solicitudes': self.limite_solicitudes})
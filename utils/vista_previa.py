@@ -0,0 +1,113 @@
+"""
+Vista previa con las páginas reales del PDF
+
+El PDF se arma en memoria con DocumentGenerator y se rasteriza con pdfium
+(backend 'rasterizador', opcional). Cada página se identifica por una huella
+de su contenido: al cambiar un tema de la segunda página, la primera sale de
+la caché y no se vuelve a rasterizar.
+
+Pensado para correr en un único hilo de trabajo (pdfium no admite llamadas
+concurrentes).
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from utils.backends import obtener_backend
+
+# Resolución por defecto si no se conoce la de la pantalla
+DPI_PANTALLA = 96
+
+# Imágenes de página que se conservan (cada página A4 a 96 dpi ocupa ~2 MB)
+PAGINAS_EN_CACHE = 32
+
+
+def _firma_archivo(ruta: Optional[str]) -> bytes:
+    """Tamaño y fecha de modificación: cambian si se reemplaza el logo"""
+    try:
+        info = os.stat(ruta)
+    except (OSError, TypeError):
+        return b""
+    return f"{info.st_size}:{info.st_mtime_ns}".encode()
+
+
+class RenderizadorPaginas:
+    """Convierte los datos de una reunión en imágenes de página, con caché por contenido"""
+
+    def __init__(self, generador, dpi: float = DPI_PANTALLA,
+                 paginas_en_cache: int = PAGINAS_EN_CACHE):
+        self.generador = generador
+        self.escala = dpi / 72  # pdfium trabaja en puntos (72 por pulgada)
+        self.paginas_en_cache = paginas_en_cache
+        self._cache: "OrderedDict[str, object]" = OrderedDict()
+
+    def renderizar(self, datos: Dict) -> Dict:
+        """
+        Arma el PDF y devuelve sus páginas como imágenes PIL
+
+        Returns:
+            Dict con 'paginas' (lista de (huella, imagen)), 'rasterizadas'
+            (páginas que no estaban en caché) y 'segundos'
+        """
+        pdfium = obtener_backend('rasterizador').pdfium
+        inicio = time.perf_counter()
+        contenido = self.generador.generar_pdf_bytes(datos)
+        firma_logo = _firma_archivo(datos.get('imagen_logo'))
+
+        paginas = []
+        rasterizadas = 0
+        documento = pdfium.PdfDocument(contenido)
+        try:
+            for numero in range(len(documento)):
+                pagina = documento[numero]
+                try:
+                    huella = self._huella(pdfium, pagina, firma_logo)
+                    imagen = self._cache.get(huella)
+                    if imagen is None:
+                        imagen = pagina.render(scale=self.escala).to_pil()
+                        rasterizadas += 1
+                    self._guardar(huella, imagen)
+                    paginas.append((huella, imagen))
+                finally:
+                    pagina.close()
+        finally:
+            documento.close()
+
+        return {
+            'paginas': paginas,
+            'rasterizadas': rasterizadas,
+            'segundos': time.perf_counter() - inicio,
+        }
+
+    @staticmethod
+    def _huella(pdfium, pagina, firma_logo: bytes) -> str:
+        """
+        Huella del contenido visible de la página
+
+        Se usan el texto y la posición de cada objeto: un cambio de fuente,
+        tamaño o negrita mueve los objetos aunque el texto sea el mismo. Para
+        las imágenes se agrega la firma del archivo del logo.
+        """
+        h = hashlib.sha1()
+        h.update(repr(pagina.get_size()).encode())
+        texto = pagina.get_textpage()
+        try:
+            h.update(texto.get_text_range().encode('utf-8', 'surrogatepass'))
+        finally:
+            texto.close()
+        for objeto in pagina.get_objects():
+            # get_pos en pypdfium2 4.x, get_bounds desde la 5
+            limites = getattr(objeto, 'get_bounds', None) or objeto.get_pos
+            h.update(repr((objeto.type, limites())).encode())
+            if isinstance(objeto, pdfium.PdfImage):
+                h.update(firma_logo)
+        return h.hexdigest()
+
+    def _guardar(self, huella: str, imagen):
+        self._cache[huella] = imagen
+        self._cache.move_to_end(huella)
+        while len(self._cache) > self.paginas_en_cache:
+            self._cache.popitem(last=False)
@@ -4,6 +4,7 @@ Diálogos para agregar/modificar temas y delegados
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
+from PIL import ImageTk
 
 
 class DialogoTema(tk.Toplevel):
@@ -248,7 +249,11 @@ class DialogoDelegado(tk.Toplevel):
 
 
 class DialogoSeleccionTema(tk.Toplevel):
-    """Diálogo para seleccionar un tema de la lista"""
+    """
+    Diálogo para seleccionar uno o más temas de la lista
+    
+    `resultado` queda con la lista de IDs elegidos, en el orden de la tabla.
+    """
     
     def __init__(self, parent, temas):
         super().__init__(parent)
@@ -267,18 +272,26 @@ class DialogoSeleccionTema(tk.Toplevel):
         
         tk.Label(
             frame,
-            text="Seleccione un tema para agregar al orden del día:",
+            text="Seleccione los temas para agregar al orden del día:",
             bg='#F5F5F5',
             font=('Arial', 12, 'bold')
         ).pack(pady=10)
         
+        tk.Label(
+            frame,
+            text="(Ctrl+click o Shift+click para elegir varios)",
+            bg='#F5F5F5',
+            font=('Arial', 9)
+        ).pack()
+        
         # Tabla de temas
         columns = ('ID', 'Descripción', 'Categoría')
         self.tree = ttk.Treeview(
             frame,
             columns=columns,
             show='headings',
-            height=15
+            height=15,
+            selectmode='extended'
         )
         
         self.tree.heading('ID', text='ID')
@@ -338,21 +351,125 @@ class DialogoSeleccionTema(tk.Toplevel):
         seleccion = self.tree.selection()
         
         if not seleccion:
-            messagebox.showwarning("Advertencia", "Seleccione un tema")
+            messagebox.showwarning("Advertencia", "Seleccione al menos un tema")
+            return
+        
+        self.resultado = [int(self.tree.item(item, 'tags')[0]) for item in seleccion]
+        self.destroy()
+
+
+class DialogoSeleccionPlantilla(tk.Toplevel):
+    """Diálogo para elegir una plantilla de orden del día"""
+    
+    def __init__(self, parent, plantillas):
+        super().__init__(parent)
+        
+        self.title("Cargar Plantilla")
+        self.geometry("500x400")
+        self.transient(parent)
+        self.grab_set()
+        
+        # resultado: ID de la plantilla; accion: 'cargar' o 'eliminar'
+        self.resultado = None
+        self.accion = None
+        
+        frame = tk.Frame(self, bg='#F5F5F5', padx=20, pady=20)
+        frame.pack(fill='both', expand=True)
+        
+        tk.Label(
+            frame,
+            text="Seleccione una plantilla:",
+            bg='#F5F5F5',
+            font=('Arial', 12, 'bold')
+        ).pack(pady=10)
+        
+        columns = ('Nombre', 'Temas')
+        self.tree = ttk.Treeview(
+            frame,
+            columns=columns,
+            show='headings',
+            height=12
+        )
+        
+        self.tree.heading('Nombre', text='Nombre')
+        self.tree.heading('Temas', text='Temas')
+        
+        self.tree.column('Nombre', width=350)
+        self.tree.column('Temas', width=80)
+        
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        
+        for plantilla in plantillas:
+            self.tree.insert('', 'end', values=(
+                plantilla['nombre'],
+                plantilla['cantidad_temas']
+            ), tags=(plantilla['id'],))
+        
+        # Botones
+        frame_botones = tk.Frame(self, bg='#F5F5F5')
+        frame_botones.pack(fill='x', pady=10)
+        
+        tk.Button(
+            frame_botones,
+            text="Cargar",
+            command=lambda: self._elegir('cargar'),
+            bg='#2E7D32',
+            fg='white',
+            font=('Arial', 10, 'bold'),
+            padx=20,
+            pady=8,
+            cursor='hand2'
+        ).pack(side='left', padx=10)
+        
+        tk.Button(
+            frame_botones,
+            text="Eliminar",
+            command=lambda: self._elegir('eliminar'),
+            bg='#D32F2F',
+            fg='white',
+            font=('Arial', 10),
+            padx=20,
+            pady=8,
+            cursor='hand2'
+        ).pack(side='left', padx=10)
+        
+        tk.Button(
+            frame_botones,
+            text="Cancelar",
+            command=self.destroy,
+            bg='#757575',
+            fg='white',
+            font=('Arial', 10),
+            padx=20,
+            pady=8,
+            cursor='hand2'
+        ).pack(side='left', padx=10)
+        
+        self.tree.bind('<Double-1>', lambda e: self._elegir('cargar'))
+    
+    def _elegir(self, accion):
+        seleccion = self.tree.selection()
+        
+        if not seleccion:
+            messagebox.showwarning("Advertencia", "Seleccione una plantilla")
             return
         
-        item = seleccion[0]
-        self.resultado = self.tree.item(item, 'tags')[0]
+        self.resultado = int(self.tree.item(seleccion[0], 'tags')[0])
+        self.accion = accion
         self.destroy()
 
 
 class VentanaVistaPrevia(tk.Toplevel):
     """Ventana de vista previa del documento"""
     
-    def __init__(self, parent, contenido):
+    def __init__(self, parent, contenido, titulo="Vista Previa - Orden del Día"):
         super().__init__(parent)
         
-        self.title("Vista Previa - Orden del Día")
+        self.title(titulo)
         self.geometry("900x700")
         self.transient(parent)
         
@@ -387,6 +504,95 @@ class VentanaVistaPrevia(tk.Toplevel):
         ).pack(pady=10)
 
 
+class VentanaVistaPreviaPDF(tk.Toplevel):
+    """Vista previa con las imágenes de las páginas del PDF"""
+    
+    MARGEN = 12
+    
+    def __init__(self, parent, titulo="Vista Previa - Orden del Día"):
+        super().__init__(parent)
+        
+        self.title(titulo)
+        self.geometry("900x700")
+        self.transient(parent)
+        
+        # Tk no conserva las PhotoImage: se guardan aquí, una por página
+        self._imagenes = []
+        self._huellas = []
+        self._items = []
+        
+        frame = tk.Frame(self, bg='#9E9E9E')
+        frame.pack(fill='both', expand=True, padx=10, pady=10)
+        
+        self.canvas = tk.Canvas(frame, bg='#9E9E9E', highlightthickness=0)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self.canvas.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        self.canvas.bind('<MouseWheel>',
+                         lambda e: self.canvas.yview_scroll(int(-e.delta / 120), 'units'))
+        
+        frame_inferior = tk.Frame(self)
+        frame_inferior.pack(fill='x', pady=(0, 10))
+        
+        self.label_estado = tk.Label(frame_inferior, text="Generando vista previa...",
+                                     font=('Arial', 9), fg='#616161')
+        self.label_estado.pack(side='left', padx=10)
+        
+        tk.Button(
+            frame_inferior,
+            text="Cerrar",
+            command=self.destroy,
+            bg='#757575',
+            fg='white',
+            font=('Arial', 10),
+            padx=20,
+            pady=8,
+            cursor='hand2'
+        ).pack(side='right', padx=10)
+    
+    def mostrar_estado(self, texto):
+        self.label_estado.config(text=texto)
+    
+    def mostrar_paginas(self, paginas):
+        """
+        Muestra las páginas (lista de (huella, imagen PIL)) una debajo de otra
+        
+        Solo se crean imágenes nuevas para las páginas cuya huella cambió.
+        
+        Returns:
+            Cantidad de páginas redibujadas
+        """
+        redibujadas = 0
+        y = self.MARGEN
+        ancho = 0
+        for i, (huella, imagen) in enumerate(paginas):
+            if i < len(self._huellas) and self._huellas[i] == huella:
+                self.canvas.coords(self._items[i], self.MARGEN, y)
+            else:
+                foto = ImageTk.PhotoImage(imagen)
+                if i < len(self._items):
+                    self.canvas.itemconfigure(self._items[i], image=foto)
+                    self.canvas.coords(self._items[i], self.MARGEN, y)
+                    self._imagenes[i] = foto
+                    self._huellas[i] = huella
+                else:
+                    self._items.append(self.canvas.create_image(self.MARGEN, y, image=foto, anchor='nw'))
+                    self._imagenes.append(foto)
+                    self._huellas.append(huella)
+                redibujadas += 1
+            y += imagen.height + self.MARGEN
+            ancho = max(ancho, imagen.width)
+        
+        # Páginas que sobran si el documento se acortó
+        for item in self._items[len(paginas):]:
+            self.canvas.delete(item)
+        del self._items[len(paginas):], self._imagenes[len(paginas):], self._huellas[len(paginas):]
+        
+        self.canvas.configure(scrollregion=(0, 0, ancho + 2 * self.MARGEN, y))
+        return redibujadas
+
+
 class VentanaHistorialTema(tk.Toplevel):
     """Ventana para mostrar el historial de un tema"""
     
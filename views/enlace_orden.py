@@ -0,0 +1,108 @@
+"""
+Enlace entre un OrdenDelDia y el Listbox que lo muestra
+
+El listbox se actualiza con los eventos del modelo tocando solo las líneas
+afectadas, y permite reordenar arrastrando con el mouse: se arrastra el ítem
+bajo el puntero o, si estaba elegido, todos los elegidos como un bloque.
+"""
+
+import tkinter as tk
+
+from models.orden_del_dia import OrdenDelDia, INSERTAR, ELIMINAR, CAMBIAR
+
+# Shift y Control: con ellos el click amplía la selección en lugar de arrastrar
+_MODIFICADORES = 0x0001 | 0x0004
+
+
+class EnlaceListboxOrden:
+    """Mantiene un tk.Listbox sincronizado con un OrdenDelDia"""
+
+    def __init__(self, listbox: tk.Listbox, orden: OrdenDelDia):
+        self.listbox = listbox
+        self.orden = orden
+        # (posiciones arrastradas, índice bajo el puntero, índice del click, ¿se movió?)
+        self._arrastre = None
+
+        listbox.configure(selectmode='extended')
+        orden.suscribir(self._al_cambiar)
+        self._redibujar()
+
+        listbox.bind('<ButtonPress-1>', self._al_presionar)
+        listbox.bind('<B1-Motion>', self._al_arrastrar)
+        listbox.bind('<ButtonRelease-1>', self._al_soltar)
+
+    def seleccion(self):
+        return list(self.listbox.curselection())
+
+    def seleccionar(self, indices):
+        self.listbox.selection_clear(0, 'end')
+        for i in indices:
+            self.listbox.selection_set(i)
+        if indices:
+            self.listbox.see(indices[0])
+
+    # --- eventos del modelo ---
+
+    def _al_cambiar(self, evento: str, inicio: int, cantidad: int):
+        if evento == INSERTAR:
+            self.listbox.insert(inicio, *(self.orden.texto(i) for i in range(inicio, inicio + cantidad)))
+            # Los que quedaron después cambian de número
+            self._reescribir(inicio + cantidad, len(self.orden))
+        elif evento == ELIMINAR:
+            self.listbox.delete(inicio, inicio + cantidad - 1)
+            self._reescribir(inicio, len(self.orden))
+        elif evento == CAMBIAR:
+            self._reescribir(inicio, inicio + cantidad)
+        else:
+            self._redibujar()
+
+    def _reescribir(self, desde: int, hasta: int):
+        """Reemplaza las líneas [desde, hasta) conservando cuáles estaban elegidas"""
+        if desde >= hasta:
+            return
+        elegidas = [i for i in self.listbox.curselection() if desde <= i < hasta]
+        self.listbox.delete(desde, hasta - 1)
+        self.listbox.insert(desde, *(self.orden.texto(i) for i in range(desde, hasta)))
+        for i in elegidas:
+            self.listbox.selection_set(i)
+
+    def _redibujar(self):
+        self.listbox.delete(0, 'end')
+        if len(self.orden):
+            self.listbox.insert('end', *(self.orden.texto(i) for i in range(len(self.orden))))
+
+    # --- arrastrar y soltar ---
+
+    def _al_presionar(self, event):
+        self._arrastre = None
+        if not len(self.orden) or event.state & _MODIFICADORES:
+            return None
+        indice = self.listbox.nearest(event.y)
+        elegidos = self.seleccion()
+        if indice in elegidos and len(elegidos) > 1:
+            # Click sobre una selección múltiple: se arrastra el bloque y se
+            # evita que la clase Listbox la reduzca a un solo ítem
+            self._arrastre = (elegidos, indice, indice, False)
+            return 'break'
+        self._arrastre = ([indice], indice, indice, False)
+        return None
+
+    def _al_arrastrar(self, event):
+        if self._arrastre is None:
+            return None
+        posiciones, anterior, clickeado, _ = self._arrastre
+        actual = self.listbox.nearest(event.y)
+        if actual != anterior:
+            destino = min(posiciones) + actual - anterior
+            nuevas = self.orden.mover(posiciones, destino)
+            self.seleccionar(nuevas)
+            self._arrastre = (nuevas, anterior + nuevas[0] - min(posiciones), clickeado, True)
+        # Sin 'break' la clase Listbox extendería la selección con el movimiento
+        return 'break'
+
+    def _al_soltar(self, event):
+        arrastre, self._arrastre = self._arrastre, None
+        if arrastre is not None and not arrastre[3] and len(arrastre[0]) > 1:
+            # Click sin arrastrar sobre una selección múltiple: queda elegido solo ese
+            self.seleccionar([arrastre[2]])
+        return None
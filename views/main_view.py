@@ -8,6 +8,8 @@ from tkinter import ttk, messagebox, scrolledtext, filedialog
 from PIL import Image, ImageTk
 import os
 
+from utils.icon_cache import IconCache
+
 
 class VentanaPrincipal(tk.Tk):
     """Ventana principal de la aplicación"""
@@ -84,39 +86,20 @@ class VentanaPrincipal(tk.Tk):
             # Tamaño más grande para los iconos de las pestañas (40x40 píxeles)
             tamaño_icono = (40, 40)
             ruta_base = "assets"
-            
-            # Icono Nueva Reunión
-            if os.path.exists(os.path.join(ruta_base, "icono_nueva_reunion.png")):
-                img = Image.open(os.path.join(ruta_base, "icono_nueva_reunion.png"))
-                img = img.resize(tamaño_icono, Image.Resampling.LANCZOS)
-                self.icono_pestaña_reunion = ImageTk.PhotoImage(img)
-            else:
-                self.icono_pestaña_reunion = None
-            
-            # Icono Gestión de Temas
-            if os.path.exists(os.path.join(ruta_base, "icono_gestion_temas.png")):
-                img = Image.open(os.path.join(ruta_base, "icono_gestion_temas.png"))
-                img = img.resize(tamaño_icono, Image.Resampling.LANCZOS)
-                self.icono_pestaña_temas = ImageTk.PhotoImage(img)
-            else:
-                self.icono_pestaña_temas = None
-            
-            # Icono Gestión de Delegados
-            if os.path.exists(os.path.join(ruta_base, "icono_gestion_delegados.png")):
-                img = Image.open(os.path.join(ruta_base, "icono_gestion_delegados.png"))
-                img = img.resize(tamaño_icono, Image.Resampling.LANCZOS)
-                self.icono_pestaña_delegados = ImageTk.PhotoImage(img)
-            else:
-                self.icono_pestaña_delegados = None
-            
-            # Icono Historial
-            if os.path.exists(os.path.join(ruta_base, "icono_historial.png")):
-                img = Image.open(os.path.join(ruta_base, "icono_historial.png"))
-                img = img.resize(tamaño_icono, Image.Resampling.LANCZOS)
-                self.icono_pestaña_historial = ImageTk.PhotoImage(img)
-            else:
-                self.icono_pestaña_historial = None
-                
+
+            # Las versiones de 40x40 se guardan en caché para no decodificar
+            # los PNG originales (varios MB) en cada inicio
+            cache = IconCache()
+
+            def cargar(nombre_archivo):
+                img = cache.obtener_imagen(os.path.join(ruta_base, nombre_archivo), tamaño_icono)
+                return ImageTk.PhotoImage(img) if img else None
+
+            self.icono_pestaña_reunion = cargar("icono_nueva_reunion.png")
+            self.icono_pestaña_temas = cargar("icono_gestion_temas.png")
+            self.icono_pestaña_delegados = cargar("icono_gestion_delegados.png")
+            self.icono_pestaña_historial = cargar("icono_historial.png")
+
         except Exception as e:
             print(f"[ERROR] Error al cargar iconos de pestañas: {e}")
             self.icono_pestaña_reunion = None
@@ -527,6 +510,46 @@ class VentanaPrincipal(tk.Tk):
         )
         self.btn_eliminar.pack(side='left', padx=5)
         
+        # Plantillas y clonado de la reunión anterior
+        frame_plantillas = tk.Frame(frame_orden, bg=self.color_fondo)
+        frame_plantillas.pack(fill='x', pady=(0, 5))
+        
+        self.btn_cargar_plantilla = tk.Button(
+            frame_plantillas,
+            text="📋 Cargar Plantilla",
+            bg='#1976D2',
+            fg='white',
+            font=('Arial', 10),
+            padx=10,
+            pady=5,
+            cursor='hand2'
+        )
+        self.btn_cargar_plantilla.pack(side='left', padx=5)
+        
+        self.btn_guardar_plantilla = tk.Button(
+            frame_plantillas,
+            text="💾 Guardar como Plantilla",
+            bg='#1976D2',
+            fg='white',
+            font=('Arial', 10),
+            padx=10,
+            pady=5,
+            cursor='hand2'
+        )
+        self.btn_guardar_plantilla.pack(side='left', padx=5)
+        
+        self.btn_clonar_anterior = tk.Button(
+            frame_plantillas,
+            text="🔁 Clonar Anterior",
+            bg='#757575',
+            fg='white',
+            font=('Arial', 10),
+            padx=10,
+            pady=5,
+            cursor='hand2'
+        )
+        self.btn_clonar_anterior.pack(side='left', padx=5)
+        
         # Listbox para orden del día
         frame_listbox = tk.Frame(frame_orden, bg=self.color_fondo)
         frame_listbox.pack(fill='both', expand=True)
@@ -543,6 +566,38 @@ class VentanaPrincipal(tk.Tk):
         self.listbox_orden.pack(side='left', fill='both', expand=True)
         scrollbar_orden.config(command=self.listbox_orden.yview)
         
+        # Temas sugeridos según el orden actual (doble click para agregar)
+        frame_sugerencias = tk.LabelFrame(
+            frame_orden,
+            text="💡 Temas sugeridos",
+            font=('Arial', 10, 'bold'),
+            bg=self.color_fondo,
+            fg=self.color_verde,
+            padx=10,
+            pady=5
+        )
+        frame_sugerencias.pack(fill='x', pady=(10, 0))
+        
+        self.listbox_sugerencias = tk.Listbox(
+            frame_sugerencias,
+            font=('Arial', 9),
+            height=5,
+            fg='#424242'
+        )
+        self.listbox_sugerencias.pack(side='left', fill='x', expand=True)
+        
+        self.btn_agregar_sugerido = tk.Button(
+            frame_sugerencias,
+            text="➕ Agregar",
+            bg=self.color_verde_claro,
+            fg='white',
+            font=('Arial', 9),
+            padx=10,
+            pady=3,
+            cursor='hand2'
+        )
+        self.btn_agregar_sugerido.pack(side='left', padx=5)
+        
         # Frame para firmas
         frame_firmas = tk.LabelFrame(
             scrollable_frame,
@@ -977,6 +1032,27 @@ class VentanaPrincipal(tk.Tk):
         )
         self.btn_limpiar_busqueda.pack(side='left', padx=2)
         
+        # Las reuniones archivadas solo se consultan si se marca esta opción
+        self.var_incluir_archivo = tk.BooleanVar(value=False)
+        self.check_incluir_archivo = tk.Checkbutton(
+            frame_busqueda,
+            text="Incluir archivo",
+            variable=self.var_incluir_archivo,
+            bg=self.color_fondo,
+            font=('Arial', 9)
+        )
+        self.check_incluir_archivo.pack(side='left', padx=10)
+        
+        # Cantidad de resultados y tiempo de la última búsqueda
+        self.label_resultados_historial = tk.Label(
+            frame_busqueda,
+            text="",
+            bg=self.color_fondo,
+            fg='#616161',
+            font=('Arial', 9, 'italic')
+        )
+        self.label_resultados_historial.pack(side='left', padx=10)
+        
         # Frame de botones de acción
         frame_top = tk.Frame(frame, bg=self.color_fondo)
         frame_top.pack(fill='x', padx=20, pady=10)
@@ -1029,6 +1105,30 @@ class VentanaPrincipal(tk.Tk):
         )
         self.btn_borrar_historial.pack(side='right', padx=5)
         
+        self.btn_archivar_historial = tk.Button(
+            frame_top,
+            text="🗄️ Archivar Antiguas",
+            bg='#5D4037',
+            fg='white',
+            font=('Arial', 10),
+            padx=15,
+            pady=8,
+            cursor='hand2'
+        )
+        self.btn_archivar_historial.pack(side='right', padx=5)
+        
+        self.btn_respaldo = tk.Button(
+            frame_top,
+            text="💾 Respaldo",
+            bg='#1565C0',
+            fg='white',
+            font=('Arial', 10),
+            padx=15,
+            pady=8,
+            cursor='hand2'
+        )
+        self.btn_respaldo.pack(side='right', padx=5)
+        
         # Tabla de reuniones
         frame_tabla = tk.Frame(frame, bg=self.color_fondo)
         frame_tabla.pack(fill='both', expand=True, padx=20, pady=10)
@@ -1095,10 +1195,16 @@ class VentanaPrincipal(tk.Tk):
                 
                 # Mostrar en canvas
                 self._mostrar_logo()
+                self.event_generate('<<LogoCambiado>>')
                 messagebox.showinfo("Éxito", "Logo cargado correctamente")
             except Exception as e:
                 messagebox.showerror("Error", f"Error al cargar logo: {str(e)}")
     
+    def usar_logo(self, ruta):
+        """Usa como logo una imagen ya guardada (por ejemplo, al restaurar el borrador)"""
+        self.imagen_path = ruta
+        self._mostrar_logo()
+    
     def _cargar_logo_inicial(self):
         """Carga el logo si existe en la ruta por defecto"""
         if os.path.exists(self.imagen_path):
@@ -1155,4 +1261,23 @@ class VentanaPrincipal(tk.Tk):
             if hasattr(self, 'titulo_canvas') and self.titulo_canvas.winfo_exists():
                 self.titulo_canvas.event_generate("<Configure>")
         except Exception as e:
-            print(f"Error en _on_texto_encabezado_cambio: {e}")
\ No newline at end of file
+            print(f"Error en _on_texto_encabezado_cambio: {e}")
+    
+    def mostrar_overlay_perfil(self):
+        """Muestra una etiqueta flotante con la latencia de la última acción"""
+        self.label_overlay_perfil = tk.Label(
+            self,
+            text="⏱ Perfil activo",
+            bg='#263238',
+            fg='#B2FF59',
+            font=('Courier', 9),
+            padx=8,
+            pady=3
+        )
+        self.label_overlay_perfil.place(relx=1.0, rely=1.0, x=-12, y=-12, anchor='se')
+    
+    def actualizar_overlay_perfil(self, texto):
+        """Actualiza el texto de la etiqueta de perfil si está visible"""
+        if hasattr(self, 'label_overlay_perfil'):
+            self.label_overlay_perfil.config(text=texto)
+            self.label_overlay_perfil.lift()